@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""Rebuild the recipe_labels table from every recipe's JSON label fields.
+
+Startup fills the table when it's first created; this rebuilds it after
+recipes were changed without going through RecipeService.
+"""
+
+import asyncio
+import sys
+
+from meal_planner.db.database import database, init_database
+from meal_planner.db.services import RecipeService
+
+
+async def backfill():
+    """Create any missing tables and rebuild every recipe's labels."""
+    await init_database()
+    try:
+        async with await database.get_session() as session, session.begin():
+            count = await RecipeService(session).rebuild_labels()
+        print(f"Rebuilt labels for {count} recipes")
+    finally:
+        await database.close()
+
+
+def main():
+    """Run the backfill."""
+    asyncio.run(backfill())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+"""Build the persisted OpenAPI schema loaded by the API on startup."""
+
+import sys
+
+import orjson
+
+from meal_planner.api.main import OPENAPI_CACHE_PATH, app, openapi_fingerprint
+
+
+def main():
+    """Generate the OpenAPI schema and write it to the cache file."""
+    OPENAPI_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    OPENAPI_CACHE_PATH.write_bytes(
+        orjson.dumps({"fingerprint": openapi_fingerprint(), "schema": app.openapi()})
+    )
+    print(f"Wrote OpenAPI schema to {OPENAPI_CACHE_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,7 @@ import shutil
 import subprocess
 import sys
 from pathlib import Path
+from urllib.request import urlopen
 
 # Define colors for terminal output
 GREEN = "\033[92m"
@@ -55,15 +56,13 @@ def create_directories():
     # Get project root directory
     project_root = Path(__file__).parent.parent
     
-    # Create data directories
+    # Create data directories; parents=True creates data/ along the way
     data_dir = project_root / "data"
-    data_dir.mkdir(exist_ok=True)
-    
     uploads_dir = data_dir / "uploads"
-    uploads_dir.mkdir(exist_ok=True)
-    
     recipes_dir = data_dir / "recipes"
-    recipes_dir.mkdir(exist_ok=True)
+    
+    uploads_dir.mkdir(parents=True, exist_ok=True)
+    recipes_dir.mkdir(parents=True, exist_ok=True)
     
     print(f"Created directories: {data_dir}, {uploads_dir}, {recipes_dir}")
 
@@ -116,10 +115,14 @@ def install_dependencies():
     # Get project root directory
     project_root = Path(__file__).parent.parent
     
-    # Install dependencies
+    # Install the project and pre-commit in a single pip run
     try:
         subprocess.run(
-            [sys.executable, "-m", "pip", "install", "-e", "."],
+            [
+                sys.executable, "-m", "pip", "install",
+                "-q", "--disable-pip-version-check",
+                "-e", ".", "pre-commit"
+            ],
             cwd=project_root,
             check=True
         )
@@ -136,17 +139,7 @@ def setup_pre_commit():
     # Get project root directory
     project_root = Path(__file__).parent.parent
     
-    # Check if pre-commit is installed
-    try:
-        subprocess.run(
-            [sys.executable, "-m", "pip", "install", "pre-commit"],
-            check=True
-        )
-    except subprocess.CalledProcessError as e:
-        print_error(f"Failed to install pre-commit: {e}")
-        return
-    
-    # Install pre-commit hooks
+    # Install pre-commit hooks (pre-commit is installed by install_dependencies)
     try:
         subprocess.run(
             ["pre-commit", "install"],
@@ -182,20 +175,19 @@ def check_ollama():
         
         # Check if Ollama is running
         try:
-            result = subprocess.run(
-                ["curl", "-s", "http://localhost:11434/api/version"],
-                capture_output=True,
-                text=True,
-                check=False
-            )
-            
-            if result.returncode == 0 and "version" in result.stdout:
-                print("Ollama is running")
-            else:
-                print_warning("Ollama is installed but not running")
-                print("Start Ollama with: ollama serve")
+            with urlopen("http://localhost:11434/api/version", timeout=1.0) as response:
+                is_running = response.status == 200 and b"version" in response.read()
+        except OSError:  # URLError, connection refused, timeout
+            is_running = False
         except Exception as e:
             print_warning(f"Failed to check if Ollama is running: {e}")
+            return
+        
+        if is_running:
+            print("Ollama is running")
+        else:
+            print_warning("Ollama is installed but not running")
+            print("Start Ollama with: ollama serve")
     else:
         print_warning("Ollama not found")
         print("Install Ollama from: https://ollama.ai/download")
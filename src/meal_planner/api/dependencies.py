@@ -1,39 +1,53 @@
 """API dependencies with database support."""
 
-from functools import lru_cache
 from typing import Optional
 
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from meal_planner.core.config import settings
-from meal_planner.core.services import RecipeStorageService  # Keep the file-based service for now
-from meal_planner.db import get_db_session, UserService, RecipeService, MealPlanService
 
+# Keep the file-based service for now
+from meal_planner.core.services import RecipeStorageService
+from meal_planner.db import MealPlanService, RecipeService, UserService, get_db_session
 
-# Database dependencies
-async def get_user_service(db: AsyncSession = Depends(get_db_session)) -> UserService:
+# Database dependencies. Services in one request share a session that is
+# committed once, after the endpoint returns and before the response is sent.
+DBSession = Depends(get_db_session, scope="function")
+
+
+async def get_user_service(db: AsyncSession = DBSession) -> UserService:
     """Get user service with database session."""
     return UserService(db)
 
 
-async def get_recipe_service(db: AsyncSession = Depends(get_db_session)) -> RecipeService:
+async def get_recipe_service(db: AsyncSession = DBSession) -> RecipeService:
     """Get recipe service with database session."""
     return RecipeService(db)
 
 
-async def get_meal_plan_service_db(db: AsyncSession = Depends(get_db_session)) -> MealPlanService:
+async def get_meal_plan_service_db(db: AsyncSession = DBSession) -> MealPlanService:
     """Get meal plan service with database session."""
     return MealPlanService(db)
 
-@lru_cache
-def get_storage_service() -> RecipeStorageService:
+
+# Shared recipe storage service, created on first use
+_storage_service: Optional[RecipeStorageService] = None
+
+
+async def get_storage_service() -> RecipeStorageService:
     """Get the recipe storage service.
     
+    Declared async so FastAPI calls it inline rather than dispatching a sync
+    dependency to the threadpool on every request.
+    
     Returns:
         Recipe storage service
     """
-    return RecipeStorageService(recipes_dir=settings.recipes_dir)
+    global _storage_service
+    if _storage_service is None:
+        _storage_service = RecipeStorageService(recipes_dir=settings.recipes_dir)
+    return _storage_service
 
 
 # Placeholder functions for other dependencies (will implement later)
@@ -63,4 +77,4 @@ def get_meal_plan_service():
 
 
 # Remove the duplicate functions at the bottom that have missing imports
-# These will be implemented later when we add the actual LLM and OCR functionality
\ No newline at end of file
+# These will be implemented later when we add the actual LLM and OCR functionality
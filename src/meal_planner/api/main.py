@@ -1,46 +1,152 @@
 """Main API application."""
 
+import hashlib
 import os
+from contextlib import asynccontextmanager
 from pathlib import Path
 
+import fastapi
+import orjson
+import pydantic
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 
 from meal_planner.api.routers import health, meal_plans, recipes, users
-from meal_planner.core.config import settings
-from meal_planner.db import init_database, close_database
+from meal_planner.core.config import configure_logging, settings
+from meal_planner.db import close_database, init_database
 
+# OpenAPI schema written by scripts/build_openapi_cache.py
+OPENAPI_CACHE_PATH = settings.data_dir / "openapi.cache.json"
+
+APP_DESCRIPTION = "API for meal planning and recipe management"
+
+
+def openapi_fingerprint() -> str:
+    """Identify everything the OpenAPI schema is generated from.
+    
+    Covers the app's title, version and description, the source of the
+    whole package (routers and the models and enums they use) and the
+    FastAPI and Pydantic versions. Hashing the source rather than
+    comparing mtimes also holds up in builds that reset file times.
+    
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (
+        settings.app_name,
+        settings.app_version,
+        APP_DESCRIPTION,
+        fastapi.__version__,
+        pydantic.VERSION,
+    ):
+        digest.update(part.encode())
+        digest.update(b"\0")
+    
+    package_dir = Path(__file__).parent.parent
+    for path in sorted(package_dir.rglob("*.py")):
+        digest.update(path.relative_to(package_dir).as_posix().encode())
+        digest.update(path.read_bytes())
+    
+    return digest.hexdigest()
+
+
+def _load_openapi_cache(app: FastAPI) -> bool:
+    """Load a prebuilt OpenAPI schema if it was built from the current code.
+    
+    Args:
+        app: FastAPI application
+        
+    Returns:
+        True if the cached schema was loaded
+    """
+    try:
+        cache = orjson.loads(OPENAPI_CACHE_PATH.read_bytes())
+    except FileNotFoundError:
+        return False
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning(f"Failed to load OpenAPI cache: {e}")
+        return False
+    
+    if not isinstance(cache, dict) or cache.get("fingerprint") != openapi_fingerprint():
+        logger.info("OpenAPI cache is stale, rebuilding schema")
+        return False
+    
+    schema = cache.get("schema")
+    if not isinstance(schema, dict):
+        logger.warning("OpenAPI cache has no schema, rebuilding it")
+        return False
+    
+    app.openapi_schema = schema
+    return True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Prepare the application on startup and clean up on shutdown.
+    
+    Args:
+        app: FastAPI application
+    """
+    configure_logging()
+    logger.info("Starting up Meal Planner API...")
+    
+    # Create data directories
+    os.makedirs(settings.data_dir, exist_ok=True)
+    os.makedirs(settings.upload_dir, exist_ok=True)
+    os.makedirs(settings.recipes_dir, exist_ok=True)
+    
+    try:
+        await init_database()
+        logger.info("Database initialized successfully")
+    except Exception as e:
+        logger.error(f"Failed to initialize database: {e}")
+        raise
+    
+    # Build the OpenAPI schema now (or load the persisted one); FastAPI
+    # caches it on the app, so the first /api/docs or /api/openapi.json
+    # request doesn't pay for it
+    if not _load_openapi_cache(app):
+        app.openapi()
+    
+    try:
+        yield
+    finally:
+        logger.info("Shutting down Meal Planner API...")
+        try:
+            await close_database()
+            logger.info("Database connections closed")
+        except Exception as e:
+            logger.error(f"Error closing database: {e}")
 
-# Create data directories
-os.makedirs(settings.data_dir, exist_ok=True)
-os.makedirs(settings.upload_dir, exist_ok=True)
-os.makedirs(settings.recipes_dir, exist_ok=True)
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
-    description="API for meal planning and recipe management",
+    description=APP_DESCRIPTION,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
-    openapi_url="/api/openapi.json"
+    openapi_url="/api/openapi.json",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
 # Add CORS middleware
-allowed_origins = [
+default_origins = (
     "http://localhost:3000",
     "http://localhost:8000", 
     "http://127.0.0.1:3000",
     "http://127.0.0.1:8000",
     "http://localhost:8080",  # Common frontend dev server port
     "http://127.0.0.1:8080"
-]
+)
 
 
-# Add the configured origins from settings
-allowed_origins.extend(settings.allowed_origins)
+# Merge in the configured origins from settings, dropping duplicates
+allowed_origins = frozenset((*default_origins, *settings.allowed_origins))
 
 app.add_middleware(
     CORSMiddleware,
@@ -51,30 +157,6 @@ app.add_middleware(
 )
 
 
-# Database event handlers
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database on startup."""
-    logger.info("Starting up Meal Planner API...")
-    try:
-        await init_database()
-        logger.info("Database initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize database: {e}")
-        raise
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Close database connections on shutdown."""
-    logger.info("Shutting down Meal Planner API...")
-    try:
-        await close_database()
-        logger.info("Database connections closed")
-    except Exception as e:
-        logger.error(f"Error closing database: {e}")
-
-
 # Add routers
 app.include_router(health.router, prefix="/api", tags=["health"])
 app.include_router(recipes.router, prefix="/api", tags=["recipes"])
@@ -94,12 +176,20 @@ async def global_exception_handler(request: Request, exc: Exception):
         JSON response with error details
     """
     logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error"}
     )
 
 
+_API_INFO = {
+    "app_name": settings.app_name,
+    "version": settings.app_version,
+    "environment": settings.environment,
+    "docs_url": "/api/docs"
+}
+
+
 @app.get("/api")
 async def root():
     """Root endpoint.
@@ -107,9 +197,4 @@ async def root():
     Returns:
         API information
     """
-    return {
-        "app_name": settings.app_name,
-        "version": settings.app_version,
-        "environment": settings.environment,
-        "docs_url": "/api/docs"
-    }
+    return _API_INFO
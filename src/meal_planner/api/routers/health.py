@@ -11,6 +11,26 @@ from meal_planner.core.config import settings
 
 router = APIRouter()
 
+# Static part of the health check response, resolved once from settings
+_HEALTH_BASE = {
+    "status": "ok",
+    "app_name": settings.app_name,
+    "version": settings.app_version,
+    "environment": settings.environment
+}
+
+# System information doesn't change while the process is running
+_SYSTEM_INFO = {
+    "status": "ok",
+    "python_version": platform.python_version(),
+    "platform": platform.platform(),
+    "processor": platform.processor(),
+    "memory": {
+        "total": "N/A",  # Would require psutil
+        "available": "N/A"  # Would require psutil
+    }
+}
+
 
 @router.get("/health")
 async def health_check() -> Dict:
@@ -19,13 +39,7 @@ async def health_check() -> Dict:
     Returns:
         Health status
     """
-    return {
-        "status": "ok",
-        "app_name": settings.app_name,
-        "version": settings.app_version,
-        "environment": settings.environment,
-        "timestamp": time.time()
-    }
+    return {**_HEALTH_BASE, "timestamp": time.time()}
 
 
 @router.get("/health/system")
@@ -35,16 +49,7 @@ async def system_info() -> Dict:
     Returns:
         System information
     """
-    return {
-        "status": "ok",
-        "python_version": platform.python_version(),
-        "platform": platform.platform(),
-        "processor": platform.processor(),
-        "memory": {
-            "total": "N/A",  # Would require psutil
-            "available": "N/A"  # Would require psutil
-        }
-    }
+    return _SYSTEM_INFO
 
 
 @router.get("/health/ocr")
@@ -1,25 +1,60 @@
 """Meal plan-related API endpoints."""
 
+import time
 import uuid
-from datetime import date, datetime
 from typing import Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from loguru import logger
 
 from meal_planner.api.dependencies import get_meal_plan_service
+from meal_planner.core.cache import LRUDict
+from meal_planner.core.config import settings
 from meal_planner.core.models import (
-    GroceryList, MealPlan, MealPlanRequest, MealPlanResponse, MealType, NutritionGoal
+    GroceryList,
+    MealPlan,
+    MealPlanRequest,
+    MealPlanResponse,
+    MealType,
+    NutritionGoal,
 )
 from meal_planner.core.services import MealPlanService
 
 router = APIRouter()
 
 
+def _drop_meal_plan(meal_plan_id: uuid.UUID, meal_plan: MealPlan) -> None:
+    """Remove a meal plan's index entries and grocery list.
+    
+    Args:
+        meal_plan_id: Meal plan ID
+        meal_plan: Meal plan that was removed from the store
+    """
+    user_plans = user_meal_plans.get(meal_plan.user_id)
+    if user_plans is not None:
+        user_plans.pop(meal_plan_id, None)
+        if not user_plans:
+            del user_meal_plans[meal_plan.user_id]
+    
+    for grocery_list_id in meal_plan_grocery_lists.pop(meal_plan_id, ()):
+        grocery_lists_db.pop(grocery_list_id, None)
+
+
 # In-memory storage for meal plans and grocery lists (for MVP)
-# In a real application, this would be replaced with a database
-meal_plans_db = {}
-grocery_lists_db = {}
+# In a real application, this would be replaced with a database.
+# Meal plans are capped with LRU eviction; grocery lists are removed along
+# with their meal plan, so both stores stay bounded.
+meal_plans_db: LRUDict = LRUDict(
+    maxsize=settings.meal_plans_max_in_memory,
+    on_evict=_drop_meal_plan
+)
+grocery_lists_db: Dict[uuid.UUID, GroceryList] = {}
+
+# Secondary indexes so per-plan and per-user lookups don't scan the stores.
+# A user's plans are dict keys rather than a set so they list in creation
+# order.
+meal_plan_grocery_lists: Dict[uuid.UUID, List[uuid.UUID]] = {}
+user_meal_plans: Dict[uuid.UUID, Dict[uuid.UUID, None]] = {}
 
 
 @router.post("/meal-plans", response_model=MealPlanResponse)
@@ -37,7 +72,7 @@ async def generate_meal_plan(
         Meal plan response
     """
     # Generate meal plan
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     
     meal_plan_data = await meal_plan_service.generate_meal_plan(
         user_id=request.user_id,
@@ -55,6 +90,8 @@ async def generate_meal_plan(
             detail=meal_plan_data["message"]
         )
     
+    total_cost = meal_plan_data.get("total_cost")
+    
     # Create meal plan
     meal_plan = MealPlan(
         user_id=request.user_id,
@@ -62,7 +99,7 @@ async def generate_meal_plan(
         end_date=request.end_date,
         days=meal_plan_data["days"],
         nutrition_goal=request.nutrition_goal,
-        total_estimated_cost=meal_plan_data.get("total_cost")
+        total_estimated_cost=total_cost
     )
     
     # Create grocery list
@@ -70,20 +107,22 @@ async def generate_meal_plan(
         meal_plan_id=meal_plan.id,
         user_id=request.user_id,
         items=meal_plan_data["grocery_items"],
-        total_estimated_cost=meal_plan_data.get("total_cost")
+        total_estimated_cost=total_cost
     )
     
     # Save meal plan and grocery list
-    meal_plans_db[str(meal_plan.id)] = meal_plan
-    grocery_lists_db[str(grocery_list.id)] = grocery_list
+    meal_plans_db[meal_plan.id] = meal_plan
+    grocery_lists_db[grocery_list.id] = grocery_list
+    meal_plan_grocery_lists.setdefault(meal_plan.id, []).append(grocery_list.id)
+    user_meal_plans.setdefault(meal_plan.user_id, {})[meal_plan.id] = None
     
     # Create response
     response = MealPlanResponse(
         meal_plan=meal_plan,
         grocery_list=grocery_list,
-        total_cost=meal_plan_data.get("total_cost"),
-        nutrition_summary=meal_plan_data.get("nutrition_summary", {}),
-        processing_time=(datetime.now() - start_time).total_seconds()
+        total_cost=total_cost,
+        nutrition_summary=meal_plan_data.get("nutrition_summary") or {},
+        processing_time=time.perf_counter() - start_time
     )
     
     return response
@@ -101,7 +140,7 @@ async def get_meal_plan(
     Returns:
         Meal plan
     """
-    meal_plan = meal_plans_db.get(str(meal_plan_id))
+    meal_plan = meal_plans_db.get(meal_plan_id)
     
     if meal_plan is None:
         raise HTTPException(status_code=404, detail="Meal plan not found")
@@ -123,7 +162,7 @@ async def list_meal_plans(
     """
     if user_id:
         # Filter by user ID
-        return [mp for mp in meal_plans_db.values() if mp.user_id == user_id]
+        return [meal_plans_db[mp_id] for mp_id in user_meal_plans.get(user_id, ())]
     else:
         # Return all meal plans
         return list(meal_plans_db.values())
@@ -142,16 +181,12 @@ async def delete_meal_plan(
         Deletion status
     """
     # Check if meal plan exists
-    if str(meal_plan_id) not in meal_plans_db:
+    if meal_plan_id not in meal_plans_db:
         raise HTTPException(status_code=404, detail="Meal plan not found")
     
-    # Delete meal plan
-    del meal_plans_db[str(meal_plan_id)]
-    
-    # Delete associated grocery lists
-    for gl_id, gl in list(grocery_lists_db.items()):
-        if gl.meal_plan_id == meal_plan_id:
-            del grocery_lists_db[gl_id]
+    # Delete meal plan and its associated grocery list
+    meal_plan = meal_plans_db.pop(meal_plan_id)
+    _drop_meal_plan(meal_plan_id, meal_plan)
     
     return {"message": "Meal plan deleted successfully"}
 
@@ -168,7 +203,7 @@ async def get_grocery_list(
     Returns:
         Grocery list
     """
-    grocery_list = grocery_lists_db.get(str(grocery_list_id))
+    grocery_list = grocery_lists_db.get(grocery_list_id)
     
     if grocery_list is None:
         raise HTTPException(status_code=404, detail="Grocery list not found")
@@ -189,12 +224,13 @@ async def get_meal_plan_grocery_list(
         Grocery list
     """
     # Check if meal plan exists
-    if str(meal_plan_id) not in meal_plans_db:
+    if meal_plan_id not in meal_plans_db:
         raise HTTPException(status_code=404, detail="Meal plan not found")
     
     # Find associated grocery list
-    for gl in grocery_lists_db.values():
-        if gl.meal_plan_id == meal_plan_id:
-            return gl
+    for grocery_list_id in meal_plan_grocery_lists.get(meal_plan_id, ()):
+        grocery_list = grocery_lists_db.get(grocery_list_id)
+        if grocery_list is not None:
+            return grocery_list
     
     raise HTTPException(status_code=404, detail="Grocery list not found for this meal plan")
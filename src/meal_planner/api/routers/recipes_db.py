@@ -1,17 +1,39 @@
 """Database-enabled recipe router (optional alternative to current recipes.py)."""
 
+import base64
+import binascii
+import json
 import uuid
-from typing import List, Optional
-
-from fastapi import APIRouter, Depends, HTTPException, Query
-from pydantic import BaseModel
+from datetime import datetime
+from operator import attrgetter
+from typing import List, Optional, Tuple
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Path,
+    Query,
+    Response,
+)
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
 from meal_planner.api.dependencies import get_recipe_service, get_user_service
-from meal_planner.db.services import RecipeService, UserService
+from meal_planner.core.cache import TTLCache
+from meal_planner.core.config import settings
 from meal_planner.db.models import Recipe as DBRecipe
+from meal_planner.db.services import RecipeService, UserService
 
 router = APIRouter()
 
+# Encoded single-recipe responses by recipe ID. Nothing in this API changes
+# a recipe after creating it, so only deletes need to invalidate; the TTL
+# bounds how long a change made by another worker or a script goes unseen.
+_recipe_responses = TTLCache(
+    maxsize=settings.recipes_max_in_memory, ttl=settings.cache_ttl
+)
+
 
 class RecipeCreate(BaseModel):
     """Request model for creating a recipe."""
@@ -33,7 +55,9 @@ class RecipeCreate(BaseModel):
 
 class RecipeResponse(BaseModel):
     """Response model for recipes."""
-    id: str
+    model_config = ConfigDict(frozen=True)
+    
+    id: uuid.UUID
     title: str
     description: Optional[str]
     ingredients: List
@@ -49,32 +73,70 @@ class RecipeResponse(BaseModel):
     source_url: Optional[str]
     image_url: Optional[str]
     notes: Optional[str]
-    created_at: str
-    updated_at: str
+    created_at: datetime
+    updated_at: datetime
     
     @classmethod
     def from_db_recipe(cls, recipe: DBRecipe) -> "RecipeResponse":
-        """Convert database recipe to response model."""
-        return cls(
-            id=str(recipe.id),
-            title=recipe.title,
-            description=recipe.description,
-            ingredients=recipe.ingredients,
-            instructions=recipe.instructions,
-            meal_types=recipe.meal_types,
-            tags=recipe.tags,
-            dietary_restrictions=recipe.dietary_restrictions,
-            appliances=recipe.appliances,
-            prep_time_minutes=recipe.prep_time_minutes,
-            cook_time_minutes=recipe.cook_time_minutes,
-            total_time_minutes=recipe.total_time_minutes,
-            servings=recipe.servings,
-            source_url=recipe.source_url,
-            image_url=recipe.image_url,
-            notes=recipe.notes,
-            created_at=recipe.created_at.isoformat(),
-            updated_at=recipe.updated_at.isoformat()
-        )
+        """Convert database recipe to response model.
+        
+        Rows coming out of the database are trusted, so validation is skipped.
+        Never use this path for client-supplied data.
+        """
+        return cls.model_construct(**dict(zip(_FIELDS, _get_fields(recipe))))
+
+
+# Response fields are copied from the database row as-is (UUIDs and
+# datetimes are serialized by pydantic-core), read in one attrgetter call
+# rather than one keyword argument each
+_FIELDS = tuple(RecipeResponse.model_fields)
+_get_fields = attrgetter(*_FIELDS)
+
+
+class RecipePage(BaseModel):
+    """Page of recipes with the cursor for the next page."""
+    items: List[RecipeResponse]
+    next_cursor: Optional[str] = None
+
+
+def _encode_cursor(recipe: DBRecipe) -> str:
+    """Encode the keyset position after a recipe as an opaque cursor."""
+    position = {"ts": recipe.created_at.isoformat(), "id": str(recipe.id)}
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Decode a cursor produced by _encode_cursor.
+    
+    Raises:
+        HTTPException: If the cursor is malformed
+    """
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(position["ts"]), uuid.UUID(position["id"])
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# Serializes recipe lists straight to JSON bytes in pydantic-core, without
+# FastAPI re-validating every item against response_model
+_RECIPE_LIST_ADAPTER = TypeAdapter(List[RecipeResponse])
+
+
+def _recipe_list_response(recipes: List[DBRecipe]) -> Response:
+    """Encode database recipes as a JSON list response.
+    
+    Args:
+        recipes: Database recipes
+        
+    Returns:
+        JSON response
+    """
+    items = [RecipeResponse.from_db_recipe(recipe) for recipe in recipes]
+    return Response(
+        content=_RECIPE_LIST_ADAPTER.dump_json(items),
+        media_type="application/json"
+    )
 
 
 @router.post("/recipes-db", response_model=RecipeResponse)
@@ -104,41 +166,27 @@ async def create_recipe_db(
     return RecipeResponse.from_db_recipe(recipe)
 
 
-@router.get("/recipes-db", response_model=List[RecipeResponse])
+@router.get("/recipes-db", response_model=RecipePage)
 async def list_recipes_db(
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page"),
     limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0),
     recipe_service: RecipeService = Depends(get_recipe_service)
 ):
-    """List recipes from database."""
+    """List recipes from database, newest first, one page at a time."""
     recipes = await recipe_service.list_recipes(
         limit=limit,
-        offset=offset,
-        include_public=True
+        include_public=True,
+        after=_decode_cursor(cursor) if cursor else None
     )
     
-    return [RecipeResponse.from_db_recipe(recipe) for recipe in recipes]
-
-
-@router.get("/recipes-db/{recipe_id}", response_model=RecipeResponse)
-async def get_recipe_db(
-    recipe_id: str,
-    recipe_service: RecipeService = Depends(get_recipe_service)
-):
-    """Get a recipe by ID from database."""
-    try:
-        recipe_uuid = uuid.UUID(recipe_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid recipe ID format")
-    
-    recipe = await recipe_service.get_recipe_by_id(recipe_uuid)
-    
-    if not recipe:
-        raise HTTPException(status_code=404, detail="Recipe not found")
-    
-    return RecipeResponse.from_db_recipe(recipe)
+    page = RecipePage.model_construct(
+        items=[RecipeResponse.from_db_recipe(recipe) for recipe in recipes],
+        next_cursor=_encode_cursor(recipes[-1]) if len(recipes) == limit else None
+    )
+    return Response(content=page.model_dump_json(), media_type="application/json")
 
 
+# Registered before /recipes-db/{recipe_id} so "search" isn't taken as an ID
 @router.get("/recipes-db/search", response_model=List[RecipeResponse])
 async def search_recipes_db(
     q: str = Query(..., min_length=1, description="Search query"),
@@ -151,23 +199,43 @@ async def search_recipes_db(
         limit=limit
     )
     
-    return [RecipeResponse.from_db_recipe(recipe) for recipe in recipes]
+    return _recipe_list_response(recipes)
+
+
+@router.get("/recipes-db/{recipe_id}", response_model=RecipeResponse)
+async def get_recipe_db(
+    recipe_id: uuid.UUID = Path(..., description="Recipe ID"),
+    recipe_service: RecipeService = Depends(get_recipe_service)
+):
+    """Get a recipe by ID from database."""
+    body = _recipe_responses.get(recipe_id)
+    if body is None:
+        recipe = await recipe_service.get_recipe_by_id(recipe_id)
+        
+        if not recipe:
+            raise HTTPException(status_code=404, detail="Recipe not found")
+        
+        body = RecipeResponse.from_db_recipe(recipe).model_dump_json()
+        _recipe_responses.set(recipe_id, body)
+    
+    return Response(content=body, media_type="application/json")
 
 
 @router.delete("/recipes-db/{recipe_id}")
 async def delete_recipe_db(
-    recipe_id: str,
+    background_tasks: BackgroundTasks,
+    recipe_id: uuid.UUID = Path(..., description="Recipe ID"),
     recipe_service: RecipeService = Depends(get_recipe_service)
 ):
     """Delete a recipe from database."""
-    try:
-        recipe_uuid = uuid.UUID(recipe_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid recipe ID format")
-    
-    success = await recipe_service.delete_recipe(recipe_uuid)
+    success = await recipe_service.delete_recipe(recipe_id)
     
     if not success:
         raise HTTPException(status_code=404, detail="Recipe not found")
     
+    # The delete commits after this returns, and a read in the meantime
+    # can cache the row again, so drop it once more after the commit
+    _recipe_responses.invalidate(recipe_id)
+    background_tasks.add_task(_recipe_responses.invalidate, recipe_id)
+    
     return {"message": "Recipe deleted successfully"}
\ No newline at end of file
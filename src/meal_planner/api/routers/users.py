@@ -1,21 +1,44 @@
 """User-related API endpoints."""
 
+import time
 import uuid
 from typing import Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from loguru import logger
 
+from meal_planner.core.cache import LRUDict
+from meal_planner.core.config import settings
 from meal_planner.core.models import User, UserFavorite, UserPreferences
 
 router = APIRouter()
 
 
+def _drop_user(user_id: str, user: User) -> None:
+    """Remove a user's email index entry, preferences and favorites.
+    
+    Args:
+        user_id: User ID
+        user: User that was removed from the store
+    """
+    emails_db.pop(user.email, None)
+    preferences_db.pop(user_id, None)
+    favorites_db.pop(user_id, None)
+
+
 # In-memory storage for users and preferences (for MVP)
-# In a real application, this would be replaced with a database
-users_db = {}
+# In a real application, this would be replaced with a database.
+# Users are capped with LRU eviction and take their preferences and
+# favorites with them, so all the stores stay bounded.
+users_db: LRUDict = LRUDict(
+    maxsize=settings.users_max_in_memory,
+    on_evict=_drop_user
+)
 preferences_db = {}
-favorites_db = {}
+favorites_db = {}  # user ID -> {recipe ID -> UserFavorite}
+
+# Index of user email -> user ID, kept in sync with users_db
+emails_db = {}
 
 
 @router.post("/users", response_model=User)
@@ -29,11 +52,12 @@ async def create_user(user: User):
         Created user
     """
     # Check if user already exists
-    if str(user.id) in users_db or any(u.email == user.email for u in users_db.values()):
+    if str(user.id) in users_db or user.email in emails_db:
         raise HTTPException(status_code=400, detail="User already exists")
     
     # Save user
     users_db[str(user.id)] = user
+    emails_db[user.email] = str(user.id)
     
     return user
 
@@ -80,7 +104,14 @@ async def update_user(
     if updated_user.id != user_id:
         raise HTTPException(status_code=400, detail="User ID mismatch")
     
-    # Save updated user
+    # Save updated user, moving the email index entry if it changed
+    previous_email = users_db[str(user_id)].email
+    if previous_email != updated_user.email:
+        if updated_user.email in emails_db:
+            raise HTTPException(status_code=400, detail="User already exists")
+        emails_db.pop(previous_email, None)
+        emails_db[updated_user.email] = str(user_id)
+    
     users_db[str(user_id)] = updated_user
     
     return updated_user
@@ -102,16 +133,8 @@ async def delete_user(
     if str(user_id) not in users_db:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Delete user
-    del users_db[str(user_id)]
-    
-    # Delete user preferences
-    if str(user_id) in preferences_db:
-        del preferences_db[str(user_id)]
-    
-    # Delete user favorites
-    if str(user_id) in favorites_db:
-        del favorites_db[str(user_id)]
+    # Delete user along with their preferences and favorites
+    _drop_user(str(user_id), users_db.pop(str(user_id)))
     
     return {"message": "User deleted successfully"}
 
@@ -183,22 +206,22 @@ async def add_favorite(
     if str(user_id) not in users_db:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Create favorite
-    favorite = UserFavorite(
-        recipe_id=recipe_id,
-        notes=notes
-    )
-    
     # Initialize user favorites if not exists
-    if str(user_id) not in favorites_db:
-        favorites_db[str(user_id)] = []
+    user_favorites = favorites_db.setdefault(str(user_id), {})
     
     # Check if recipe is already a favorite
-    if any(f.recipe_id == recipe_id for f in favorites_db[str(user_id)]):
+    if recipe_id in user_favorites:
         raise HTTPException(status_code=400, detail="Recipe is already a favorite")
     
+    # Create favorite; the inputs were already validated as path/query params
+    favorite = UserFavorite.model_construct(
+        recipe_id=recipe_id,
+        notes=notes,
+        added_at=time.time()
+    )
+    
     # Add to favorites
-    favorites_db[str(user_id)].append(favorite)
+    user_favorites[recipe_id] = favorite
     
     return favorite
 
@@ -220,7 +243,7 @@ async def list_favorites(
         raise HTTPException(status_code=404, detail="User not found")
     
     # Return favorites
-    return favorites_db.get(str(user_id), [])
+    return list(favorites_db.get(str(user_id), {}).values())
 
 
 @router.delete("/users/{user_id}/favorites/{recipe_id}")
@@ -245,14 +268,8 @@ async def remove_favorite(
     if str(user_id) not in favorites_db:
         raise HTTPException(status_code=404, detail="User has no favorites")
     
-    # Find favorite
-    favorites = favorites_db[str(user_id)]
-    favorite_idx = next((i for i, f in enumerate(favorites) if f.recipe_id == recipe_id), None)
-    
-    if favorite_idx is None:
-        raise HTTPException(status_code=404, detail="Favorite not found")
-    
     # Remove favorite
-    favorites.pop(favorite_idx)
+    if favorites_db[str(user_id)].pop(recipe_id, None) is None:
+        raise HTTPException(status_code=404, detail="Favorite not found")
     
     return {"message": "Favorite removed successfully"}
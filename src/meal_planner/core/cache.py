@@ -0,0 +1,125 @@
+"""In-memory caching helpers for the meal planner application."""
+
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class LRUDict(OrderedDict):
+    """Dictionary bounded to ``maxsize`` entries with least-recently-used eviction.
+
+    Reads through ``[]`` and ``get`` mark an entry as recently used. When an
+    insert grows the dictionary past ``maxsize``, the oldest entries are removed
+    and passed to ``on_evict`` so callers can keep secondary indexes consistent.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        on_evict: Optional[Callable[[Hashable, Any], None]] = None
+    ):
+        """Initialize the dictionary.
+
+        Args:
+            maxsize: Maximum number of entries to keep
+            on_evict: Optional callback receiving each evicted key and value
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        super().__init__()
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+
+        while len(self) > self.maxsize:
+            evicted_key, evicted_value = self.popitem(last=False)
+            if self.on_evict is not None:
+                self.on_evict(evicted_key, evicted_value)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a value and mark it as recently used.
+
+        Args:
+            key: Key to look up
+            default: Value to return if the key is missing
+
+        Returns:
+            Stored value, or the default
+        """
+        if key not in self:
+            return default
+        return self[key]
+
+
+class TTLCache:
+    """LRU-bounded cache whose entries also expire ``ttl`` seconds after being set.
+
+    Meant for values that are invalidated explicitly when they change; the
+    expiry is a safety net for changes made elsewhere (another worker, a
+    script) that this process never hears about.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries to keep
+            ttl: Seconds an entry stays valid after it is set
+            clock: Source of the current time in seconds
+        """
+        self._entries = LRUDict(maxsize)
+        self.ttl = ttl
+        self._clock = clock
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get an unexpired value and mark it as recently used.
+
+        Args:
+            key: Key to look up
+
+        Returns:
+            Stored value, or None if missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at <= self._clock():
+            del self._entries[key]
+            return None
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a value, replacing any existing entry and restarting its TTL.
+
+        Args:
+            key: Key to store under
+            value: Value to store
+        """
+        self._entries[key] = (self._clock() + self.ttl, value)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop an entry if present.
+
+        Args:
+            key: Key to remove
+        """
+        self._entries.pop(key, None)
@@ -2,8 +2,9 @@
 
 import os
 import sys
+from functools import cached_property
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import FrozenSet, Optional, Tuple, Union
 
 from loguru import logger
 from pydantic import AnyHttpUrl, Field, field_validator
@@ -29,6 +30,15 @@ class Settings(BaseSettings):
     
     # Database settings
     database_url: str = Field(default="sqlite+aiosqlite:///./data/meal_planner.db")
+    # Connection pool (in-memory SQLite shares a single connection instead)
+    db_pool_size: int = Field(default=20)
+    db_max_overflow: int = Field(default=10)
+    db_pool_timeout: int = Field(default=30)
+    db_pool_recycle: int = Field(default=3600)  # 1 hour
+    # Compiled statements kept per engine
+    db_query_cache_size: int = Field(default=1200)
+    # Raise on relationship access a read query didn't eager load
+    db_strict_loading: bool = Field(default=False)
     
     # Data directories
     data_dir: Path = Field(default=Path("data"))
@@ -47,15 +57,28 @@ class Settings(BaseSettings):
     # OCR settings
     ocr_primary_engine: OCREngine = OCREngine.PYMUPDF
     ocr_fallback_engine: Optional[OCREngine] = OCREngine.MARKER
+    ocr_max_concurrency: int = Field(default=2)  # Files processed at once
+    ocr_cache_dir: Optional[Path] = Field(default=None)  # Extracted text
+    ocr_cache_max_files: int = Field(default=1_000)
     
     # LLM settings
     llm_provider: str = "ollama"
     llm_model: str = "llama3"
     llm_api_base: str = "http://localhost:11434/api"
     llm_timeout: int = Field(default=30)
+    llm_max_concurrency: int = Field(default=4)  # Requests in flight per batch
+    llm_parse_retries: int = Field(default=2)  # Re-asks after an unparseable response
+    llm_retry_backoff: float = Field(default=1.0)  # Seconds, doubled per retry
+    llm_cache_ttl: int = Field(default=86400)  # 1 day
+    llm_cache_max_entries: int = Field(default=1_000)  # In memory
+    llm_cache_dir: Optional[Path] = Field(default=None)  # On disk
+    llm_cache_max_files: int = Field(default=10_000)  # On disk
     
     # Caching
     cache_ttl: int = Field(default=300)  # 5 minutes
+    recipes_max_in_memory: int = Field(default=2_000)  # Parsed recipe files
+    meal_plans_max_in_memory: int = Field(default=10_000)
+    users_max_in_memory: int = Field(default=10_000)
     
     # Rate limiting
     rate_limit_per_minute: int = Field(default=60)
@@ -68,17 +91,21 @@ class Settings(BaseSettings):
         extra="ignore",
     )
     
-    @property
-    def allowed_origins(self) -> List[str]:
+    @cached_property
+    def allowed_origins(self) -> Tuple[str, ...]:
         """Parse allowed_origins from comma-separated string."""
         if isinstance(self._allowed_origins, str):
-            return [origin.strip() for origin in self._allowed_origins.split(",") if origin.strip()]
-        return ["http://localhost:3000", "http://localhost:8000", "http://localhost:8080"]
+            return tuple(
+                origin.strip()
+                for origin in self._allowed_origins.split(",")
+                if origin.strip()
+            )
+        return ("http://localhost:3000", "http://localhost:8000", "http://localhost:8080")
     
-    @property
-    def allowed_extensions(self) -> List[str]:
+    @cached_property
+    def allowed_extensions(self) -> FrozenSet[str]:
         """Return allowed file extensions."""
-        return [".pdf", ".jpg", ".jpeg", ".png", ".txt"]
+        return frozenset({".pdf", ".jpg", ".jpeg", ".png", ".txt"})
     
     def __init__(self, **kwargs):
         """Initialize settings."""
@@ -91,24 +118,39 @@ class Settings(BaseSettings):
         if self.recipes_dir is None:
             self.recipes_dir = self.data_dir / "recipes"
         
-        # Convert string paths to Path objects
-        if isinstance(self.data_dir, str):
-            self.data_dir = Path(self.data_dir)
+        if self.llm_cache_dir is None:
+            self.llm_cache_dir = self.data_dir / "llm_cache"
         
-        if isinstance(self.upload_dir, str):
-            self.upload_dir = Path(self.upload_dir)
-        
-        if isinstance(self.recipes_dir, str):
-            self.recipes_dir = Path(self.recipes_dir)
+        if self.ocr_cache_dir is None:
+            self.ocr_cache_dir = self.data_dir / "ocr_cache"
 
 
 # Create settings instance
 settings = Settings()
 
-# Configure logger
-logger.remove()
-logger.add(
-    sys.stderr,
-    level=settings.log_level,
-    format="<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
-)
\ No newline at end of file
+_logging_configured = False
+
+
+def configure_logging() -> None:
+    """Install the application's log sink.
+    
+    Called on application startup rather than at import, so importing the
+    package (including in each forked worker) doesn't reconfigure loguru.
+    Calling it again is a no-op.
+    """
+    global _logging_configured
+    if _logging_configured:
+        return
+    
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        level=settings.log_level,
+        format=(
+            "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
+            "<level>{level: <8}</level> | "
+            "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
+            "<level>{message}</level>"
+        ),
+    )
+    _logging_configured = True
\ No newline at end of file
@@ -0,0 +1,114 @@
+"""Helpers for on-disk caches stored as one file per entry."""
+
+import os
+import time
+import uuid
+from pathlib import Path
+from typing import Optional
+
+# Writes between sweeps of a cache directory for expired and surplus entries
+PRUNE_INTERVAL = 100
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write a file so that readers see the old or the new contents, never part of it.
+
+    The data goes to a uniquely named temporary file next to ``path``, which
+    is then renamed over it; concurrent writers of the same entry each
+    replace it whole.
+
+    Args:
+        path: File to write
+        data: File contents
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+def prune_cache_dir(
+    cache_dir: Path, max_files: Optional[int] = None, max_age: Optional[float] = None
+) -> int:
+    """Delete expired entries from a cache directory, then the oldest beyond a limit.
+
+    Args:
+        cache_dir: Directory of ``.json`` entries, searched recursively
+        max_files: Number of most recently written entries to keep, or None
+            for no limit
+        max_age: Seconds after being written that an entry expires, or None
+            for no expiry
+
+    Returns:
+        Number of entries deleted
+    """
+    entries = []
+    for path in cache_dir.rglob("*.json"):
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue  # Removed by another process meanwhile
+
+    # Newest first, so everything from index max_files on goes
+    entries.sort(reverse=True)
+    expired_before = time.time() - max_age if max_age is not None else None
+
+    removed = 0
+    for index, (mtime, path) in enumerate(entries):
+        if (max_files is not None and index >= max_files) or (
+            expired_before is not None and mtime <= expired_before
+        ):
+            path.unlink(missing_ok=True)
+            removed += 1
+    return removed
+
+
+class DiskCache:
+    """Base for caches kept as one ``.json`` file per entry under ``cache_dir``.
+
+    Entries are written atomically, and on the first write and every
+    ``PRUNE_INTERVAL`` writes after it the directory is swept of entries
+    older than ``max_age`` and all but the ``max_files`` newest, so it
+    can't grow without bound.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_files: Optional[int] = None,
+        max_age: Optional[float] = None
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory to store entries in
+            max_files: Most entries to keep, or None for no limit
+            max_age: Seconds an entry is kept, or None to keep it until
+                ``max_files`` pushes it out
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_files = max_files
+        self.max_age = max_age
+        self._writes = 0
+
+    def _write(self, path: Path, data: bytes) -> None:
+        """Write an entry, pruning the directory if a sweep is due."""
+        atomic_write_bytes(path, data)
+
+        if self._writes % PRUNE_INTERVAL == 0:
+            self.prune()
+        self._writes += 1
+
+    def prune(self) -> int:
+        """Delete expired entries, then the oldest beyond ``max_files``.
+
+        Returns:
+            Number of entries deleted
+        """
+        if self.max_files is None and self.max_age is None:
+            return 0
+        return prune_cache_dir(self.cache_dir, self.max_files, self.max_age)
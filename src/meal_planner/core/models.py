@@ -1,6 +1,5 @@
 """Core models for the meal planner application."""
 
-import json
 import time
 import uuid
 from datetime import date, datetime
@@ -9,7 +8,8 @@ from enum import Enum, auto
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Union
 
-from pydantic import BaseModel, Field, field_validator
+import orjson
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 
 
 class OCREngine(str, Enum):
@@ -116,7 +116,7 @@ class Recipe(BaseModel):
     title: str
     ingredients: List[Union[str, "Ingredient"]]
     instructions: List[str]
-    meal_types: List[Union[str, "MealType"]] = Field(default_factory=list)
+    meal_types: List[str] = Field(default_factory=list)
     prep_time_minutes: Optional[int] = None
     cook_time_minutes: Optional[int] = None
     servings: Optional[int] = None
@@ -124,8 +124,8 @@ class Recipe(BaseModel):
     source_file: Optional[str] = None
     image_url: Optional[str] = None
     tags: List[str] = Field(default_factory=list)
-    dietary_restrictions: List[Union[str, "DietaryRestriction"]] = Field(default_factory=list)
-    appliances: List[Union[str, "Appliance"]] = Field(default_factory=list)
+    dietary_restrictions: List[str] = Field(default_factory=list)
+    appliances: List[str] = Field(default_factory=list)
     nutrition: Optional["NutritionInfo"] = None
     notes: Optional[str] = None
     created_at: float = Field(default_factory=time.time)
@@ -146,16 +146,12 @@ class Recipe(BaseModel):
         # Create file path
         file_path = directory / f"{self.id}.json"
         
-        # Convert to dict and handle UUID serialization
-        recipe_dict = self.model_dump()
-        
-        # Convert UUID to string for JSON serialization
-        if isinstance(recipe_dict.get('id'), uuid.UUID):
-            recipe_dict['id'] = str(recipe_dict['id'])
-        
-        # Save to file
-        with open(file_path, "w") as f:
-            json.dump(recipe_dict, f, indent=2, default=str)
+        # JSON-mode dump converts UUIDs, enums and Decimals to JSON types;
+        # orjson then encodes the dict faster than model_dump_json
+        file_path.write_bytes(orjson.dumps(
+            self.model_dump(mode="json", exclude_none=True),
+            option=orjson.OPT_INDENT_2
+        ))
         
         return file_path
     
@@ -169,18 +165,8 @@ class Recipe(BaseModel):
         Returns:
             Recipe object
         """
-        with open(file_path, "r") as f:
-            data = json.load(f)
-        
-        # Convert string ID back to UUID if needed
-        if isinstance(data.get('id'), str):
-            try:
-                data['id'] = uuid.UUID(data['id'])
-            except ValueError:
-                # If it's not a valid UUID string, generate a new one
-                data['id'] = uuid.uuid4()
-        
-        return cls(**data)
+        # Parsing with orjson and validating the dict beats model_validate_json
+        return cls.model_validate(orjson.loads(file_path.read_bytes()))
 
 class RecipeExtractionResponse(BaseModel):
     """Response for recipe extraction."""
@@ -206,7 +192,7 @@ class UserPreferences(BaseModel):
     
     favorite_cuisines: List[str] = Field(default_factory=list)
     disliked_ingredients: List[str] = Field(default_factory=list)
-    dietary_restrictions: List[Union[str, DietaryRestriction]] = Field(default_factory=list)
+    dietary_restrictions: List[str] = Field(default_factory=list)
     meal_preferences: Dict[str, List[MealType]] = Field(default_factory=dict)
     budget_per_meal: Optional[Decimal] = None
     servings_per_meal: int = 1
@@ -226,6 +212,8 @@ class NutritionGoalSettings(BaseModel):
 class UserFavorite(BaseModel):
     """User favorite recipe."""
     
+    model_config = ConfigDict(frozen=True)
+    
     recipe_id: uuid.UUID
     notes: Optional[str] = None
     added_at: float = Field(default_factory=time.time)
@@ -0,0 +1,200 @@
+"""Full-text search index for file-based recipe storage."""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+from uuid import UUID
+
+from meal_planner.core.models import Recipe
+
+# Stored in PRAGMA user_version; an index file with another version is
+# dropped and rebuilt from the recipe files
+SCHEMA_VERSION = 1
+
+
+class RecipeSearchIndex:
+    """SQLite FTS5 index over recipe titles, ingredients and tags.
+
+    Uses the trigram tokenizer, so a query matches any case-insensitive
+    substring of a field, the same as scanning the recipes in Python.
+    Queries shorter than three characters can't use trigrams and fall back
+    to a LIKE scan over the index, which is still far cheaper than loading
+    every recipe file.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        list_recipes: Callable[[], Dict[str, int]],
+        load_recipe: Callable[[str], Optional[Recipe]],
+    ):
+        """Open the index, bringing it up to date with the stored recipes.
+
+        Args:
+            db_path: Path to the SQLite database file
+            list_recipes: Callable mapping the ID of every stored recipe to
+                its file's modification time in nanoseconds
+            load_recipe: Callable loading a stored recipe by ID, or
+                returning None if it can't be read
+
+        Raises:
+            sqlite3.OperationalError: If SQLite lacks FTS5 or the trigram tokenizer
+        """
+        self.db_path = db_path
+        self.list_recipes = list_recipes
+        self.load_recipe = load_recipe
+        self._conn: Optional[sqlite3.Connection] = None
+        # The connection is shared by worker threads; reentrant because a
+        # rebuild adds recipes while holding it
+        self._lock = threading.RLock()
+        with self._lock:
+            self._connection()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the open connection, recreating the index if its file was removed.
+
+        Must be called with the lock held.
+        """
+        if self._conn is not None and self.db_path.exists():
+            return self._conn
+
+        if self._conn is not None:
+            self._conn.close()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+
+        # WAL keeps commits from creating and deleting a journal file next to
+        # the recipes, which would change the directory's mtime
+        conn.execute("PRAGMA journal_mode=WAL")
+
+        with conn:
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                conn.execute("DROP TABLE IF EXISTS recipe_ids")
+                conn.execute("DROP TABLE IF EXISTS recipes_fts")
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+            # FTS5 rows are keyed by integer rowid, so map recipe IDs to one.
+            # mtime_ns is the indexed file's, to spot files changed since.
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS recipe_ids ("
+                "rowid INTEGER PRIMARY KEY, id TEXT UNIQUE NOT NULL, mtime_ns INTEGER)"
+            )
+            conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts "
+                "USING fts5(title, ingredients, tags, tokenize='trigram')"
+            )
+
+        self._conn = conn
+        self._sync()
+
+        return conn
+
+    def _sync(self) -> None:
+        """Index recipe files added or changed since last indexed; drop removed ones.
+
+        Catches up with changes made to the recipes directory while the
+        index wasn't open, or by anything other than ``add`` and ``remove``.
+        Must be called with the lock held.
+        """
+        stored = self.list_recipes()
+        indexed = dict(self._conn.execute("SELECT id, mtime_ns FROM recipe_ids"))
+
+        for recipe_id in indexed.keys() - stored.keys():
+            self.remove(recipe_id)
+
+        for recipe_id, mtime_ns in stored.items():
+            if indexed.get(recipe_id) == mtime_ns:
+                continue
+            recipe = self.load_recipe(recipe_id)
+            if recipe is not None:
+                self.add(recipe, mtime_ns)
+
+    def add(self, recipe: Recipe, mtime_ns: Optional[int] = None) -> None:
+        """Add or replace a recipe in the index.
+
+        Args:
+            recipe: Recipe to index
+            mtime_ns: Modification time of the recipe's file, if known; a
+                recipe indexed without one is re-read on the next open
+        """
+        ingredients = "\n".join(
+            ingredient if isinstance(ingredient, str) else ingredient.name
+            for ingredient in recipe.ingredients
+        )
+
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                "INSERT INTO recipe_ids (id, mtime_ns) VALUES (?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET mtime_ns = excluded.mtime_ns",
+                (str(recipe.id), mtime_ns)
+            )
+            (rowid,) = conn.execute(
+                "SELECT rowid FROM recipe_ids WHERE id = ?", (str(recipe.id),)
+            ).fetchone()
+            conn.execute("DELETE FROM recipes_fts WHERE rowid = ?", (rowid,))
+            conn.execute(
+                "INSERT INTO recipes_fts (rowid, title, ingredients, tags) "
+                "VALUES (?, ?, ?, ?)",
+                (rowid, recipe.title, ingredients, "\n".join(recipe.tags)),
+            )
+
+    def remove(self, recipe_id: Union[UUID, str]) -> None:
+        """Remove a recipe from the index.
+
+        Args:
+            recipe_id: Recipe ID
+        """
+        with self._lock, self._connection() as conn:
+            row = conn.execute(
+                "SELECT rowid FROM recipe_ids WHERE id = ?", (str(recipe_id),)
+            ).fetchone()
+            if row is None:
+                return
+
+            conn.execute("DELETE FROM recipes_fts WHERE rowid = ?", row)
+            conn.execute("DELETE FROM recipe_ids WHERE rowid = ?", row)
+
+    def search(self, query: str, limit: int = 100) -> List[str]:
+        """Find recipes whose title, ingredients or tags contain the query.
+
+        Args:
+            query: Search query
+            limit: Maximum number of recipe IDs to return
+
+        Returns:
+            Matching recipe IDs, in ID order
+        """
+        if len(query) >= 3:
+            # Quote the query so FTS5 treats it as a literal phrase
+            condition = "recipes_fts MATCH ?"
+            params = ['"' + query.replace('"', '""') + '"']
+        else:
+            pattern = (
+                "%"
+                + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+                + "%"
+            )
+            condition = " OR ".join(
+                f"{column} LIKE ? ESCAPE '\\'"
+                for column in ("title", "ingredients", "tags")
+            )
+            params = [pattern] * 3
+
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT recipe_ids.id FROM recipes_fts "
+                "JOIN recipe_ids ON recipe_ids.rowid = recipes_fts.rowid "
+                f"WHERE {condition} ORDER BY recipe_ids.id LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+
+        return [recipe_id for (recipe_id,) in rows]
+
+    def close(self) -> None:
+        """Close the index database."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,19 +1,24 @@
 """Core services for the meal planner application."""
 
-import glob
+import asyncio
 import json
 import os
+import re
+import sqlite3
+import threading
 import time
+from datetime import date
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
 from uuid import UUID
 
+import orjson
 from loguru import logger
 
+from meal_planner.core.cache import LRUDict
 from meal_planner.core.config import settings
-from meal_planner.core.models import (
-    MealPlan, OCRResult, Recipe, RecipeExtractionResponse
-)
+from meal_planner.core.models import Recipe, RecipeExtractionResponse
+from meal_planner.core.search_index import RecipeSearchIndex
 from meal_planner.ml.llm.base import BaseLLMProvider
 from meal_planner.ml.ocr.base import BaseOCREngine
 
@@ -38,6 +43,9 @@ class RecipeExtractionService:
         self.ocr_fallback = ocr_fallback
         self.llm_provider = llm_provider
         
+        # Caps how many files are run through OCR at once
+        self._ocr_semaphore = asyncio.Semaphore(settings.ocr_max_concurrency)
+        
         logger.info(
             f"Initialized RecipeExtractionService with {ocr_primary.get_name()} "
             f"and {ocr_fallback.get_name() if ocr_fallback else 'no fallback'}"
@@ -62,47 +70,51 @@ class RecipeExtractionService:
         
         logger.info(f"Extracting recipe from {file_path}")
         
-        # Extract text using primary OCR engine
-        ocr_result = await self.ocr_primary.extract_text(file_path)
-        
-        # Check if OCR was successful
-        if ocr_result.confidence < 0.5 and self.ocr_fallback is not None:
-            warnings.append(
-                f"Primary OCR engine ({self.ocr_primary.get_name()}) produced low confidence "
-                f"result ({ocr_result.confidence:.2f}). Trying fallback engine."
-            )
+        async with self._ocr_semaphore:
+            # Extract text using primary OCR engine
+            ocr_result = await self.ocr_primary.extract_text(file_path)
             
-            # Try fallback OCR engine
-            fallback_result = await self.ocr_fallback.extract_text(file_path)
-            
-            # Use fallback result if it has higher confidence
-            if fallback_result.confidence > ocr_result.confidence:
+            # Check if OCR was successful; the fallback only runs when it
+            # wasn't, since most files don't need it and a running OCR pass
+            # can't be cancelled
+            if ocr_result.confidence < 0.5 and self.ocr_fallback is not None:
                 warnings.append(
-                    f"Using fallback OCR engine ({self.ocr_fallback.get_name()}) "
-                    f"with confidence {fallback_result.confidence:.2f}"
+                    f"Primary OCR engine ({self.ocr_primary.get_name()}) produced low "
+                    f"confidence result ({ocr_result.confidence:.2f}). "
+                    f"Trying fallback engine."
                 )
-                ocr_result = fallback_result
-            else:
-                warnings.append(
-                    f"Fallback OCR engine ({self.ocr_fallback.get_name()}) "
-                    f"produced lower confidence result ({fallback_result.confidence:.2f}). "
-                    f"Using primary OCR result."
-                )
-        
-        # Evaluate OCR quality
-        quality_assessment = await self.llm_provider.evaluate_ocr_quality(
-            ocr_result.text, ocr_result.confidence
+                
+                # Try fallback OCR engine
+                fallback_result = await self.ocr_fallback.extract_text(file_path)
+                
+                # Use fallback result if it has higher confidence
+                if fallback_result.confidence > ocr_result.confidence:
+                    warnings.append(
+                        f"Using fallback OCR engine ({self.ocr_fallback.get_name()}) "
+                        f"with confidence {fallback_result.confidence:.2f}"
+                    )
+                    ocr_result = fallback_result
+                else:
+                    warnings.append(
+                        f"Fallback OCR engine ({self.ocr_fallback.get_name()}) "
+                        f"produced lower confidence result "
+                        f"({fallback_result.confidence:.2f}). "
+                        f"Using primary OCR result."
+                    )
+        
+        # Evaluate OCR quality and structure the recipe; both only need the
+        # OCR text, so the two LLM calls run concurrently
+        quality_assessment, recipe = await asyncio.gather(
+            self.llm_provider.evaluate_ocr_quality(
+                ocr_result.text, ocr_result.confidence
+            ),
+            self.llm_provider.structure_recipe(ocr_result.text, user_notes),
         )
         
         # Add warnings from quality assessment
         if "detected_issues" in quality_assessment:
             warnings.extend(quality_assessment["detected_issues"])
         
-        # Structure recipe using LLM
-        recipe = await self.llm_provider.structure_recipe(
-            ocr_result.text, user_notes
-        )
-        
         # Set source file
         recipe.source_file = str(file_path)
         
@@ -115,11 +127,81 @@ class RecipeExtractionService:
         )
         
         return response
+    
+    async def extract_recipes_batch(
+        self,
+        file_paths: List[Path],
+        user_notes: Optional[str] = None
+    ) -> List[RecipeExtractionResponse]:
+        """Extract recipes from several files concurrently.
+        
+        OCR for up to ``ocr_max_concurrency`` files runs at once, and the LLM
+        calls for files that are done with OCR overlap with the rest.
+        
+        Args:
+            file_paths: Paths to the files
+            user_notes: Optional notes from the user, applied to every file
+            
+        Returns:
+            Extraction responses, in the same order as ``file_paths``
+        """
+        return list(await asyncio.gather(
+            *(self.extract_recipe(file_path, user_notes) for file_path in file_paths)
+        ))
+
+
+class _CachedRecipe(NamedTuple):
+    """Parsed recipe file held in RecipeStorageService's cache."""
+    
+    mtime_ns: int
+    recipe: Recipe
+    search_text: str  # Lowercased title, ingredient names and tags
+
+
+def _search_text(
+    title: str, ingredient_names: Iterable[str], tags: Iterable[str]
+) -> str:
+    """Build the lowercased text that search queries are matched against.
+    
+    Fields are joined with newlines so a query can't match across two of them.
+    
+    Args:
+        title: Recipe title
+        ingredient_names: Ingredient strings or names
+        tags: Recipe tags
+        
+    Returns:
+        Lowercased searchable text
+    """
+    return "\n".join([title, *ingredient_names, *tags]).lower()
+
+
+def _ingredient_pattern(ingredients: Iterable[str]) -> Optional["re.Pattern[str]"]:
+    """Build a pattern finding any of the given ingredients as whole words.
+    
+    Matches on word boundaries, allowing a plural ending, so "egg" matches
+    "2 eggs" but not "eggplant", and "pea" doesn't match "peanut".
+    
+    Args:
+        ingredients: Lowercase ingredient names
+        
+    Returns:
+        Compiled pattern, or None if there are no ingredients
+    """
+    alternatives = "|".join(
+        re.escape(ingredient) for ingredient in ingredients if ingredient
+    )
+    if not alternatives:
+        return None
+    return re.compile(rf"\b(?:{alternatives})(?:e?s)?\b")
 
 
 class RecipeStorageService:
     """Service for storing and retrieving recipes."""
     
+    # Number of recipes list_candidate_recipes loads at a time
+    candidate_batch_size = 200
+    
     def __init__(self, recipes_dir: Optional[Path] = None):
         """Initialize the recipe storage service.
         
@@ -131,9 +213,133 @@ class RecipeStorageService:
         # Create directory if it doesn't exist
         self.recipes_dir.mkdir(exist_ok=True, parents=True)
         
+        # _CachedRecipe entries keyed by file path
+        self._cache: LRUDict = LRUDict(maxsize=settings.recipes_max_in_memory)
+        # list_recipes loads files in worker threads
+        self._cache_lock = threading.Lock()
+        
+        # Sorted recipe file paths, with the directory mtime they were read at
+        self._listing: Optional[Tuple[int, List[str]]] = None
+        
+        # Full-text index for search_recipes; fall back to scanning the
+        # recipe files if this SQLite build lacks FTS5 trigram support
+        self.search_index: Optional[RecipeSearchIndex] = None
+        try:
+            self.search_index = RecipeSearchIndex(
+                self.recipes_dir / "recipes_index.db",
+                self._recipe_file_mtimes,
+                self._read_recipe_file,
+            )
+        except sqlite3.OperationalError as e:
+            logger.warning(
+                f"Recipe search index unavailable, searches will scan files: {e}"
+            )
+        
         logger.info(f"Initialized RecipeStorageService with directory {self.recipes_dir}")
     
-    def save_recipe(self, recipe: Recipe) -> Path:
+    def _recipe_file_mtimes(self) -> Dict[str, int]:
+        """Map the ID of every recipe in the recipes directory to its file's mtime."""
+        with os.scandir(self.recipes_dir) as entries:
+            return {
+                entry.name[:-len(".json")]: entry.stat().st_mtime_ns
+                for entry in entries
+                if entry.name.endswith(".json")
+            }
+    
+    def _read_recipe_file(self, recipe_id: str) -> Optional[Recipe]:
+        """Read a recipe file, bypassing the cache; None if it can't be loaded."""
+        file_path = self.recipes_dir / f"{recipe_id}.json"
+        try:
+            return Recipe.load_from_file(file_path)
+        except Exception as e:
+            logger.error(f"Error loading recipe from {file_path}: {e}")
+            return None
+    
+    def _load_cached(self, file_path: Path) -> _CachedRecipe:
+        """Load a recipe file, reusing the parsed recipe if the file is unchanged.
+        
+        Cached recipes are shared between callers, so they must not be
+        modified in place; use ``model_copy`` to derive an updated recipe.
+        
+        Args:
+            file_path: Path to the recipe file
+            
+        Returns:
+            Cache entry with the loaded recipe
+        """
+        mtime_ns = file_path.stat().st_mtime_ns
+        cached = self._cached_entry(file_path, mtime_ns)
+        if cached is not None:
+            return cached
+        
+        return self._cache_recipe(file_path, mtime_ns, Recipe.load_from_file(file_path))
+    
+    def _cached_entry(self, file_path: Path, mtime_ns: int) -> Optional[_CachedRecipe]:
+        """Return the cache entry for a file if it is still current.
+        
+        Args:
+            file_path: Path to the recipe file
+            mtime_ns: Current file modification time
+            
+        Returns:
+            Cache entry, or None if the file isn't cached or has changed
+        """
+        with self._cache_lock:
+            cached = self._cache.get(file_path)
+        
+        if cached is not None and cached.mtime_ns == mtime_ns:
+            return cached
+        return None
+    
+    def _cache_recipe(
+        self, file_path: Path, mtime_ns: int, recipe: Recipe
+    ) -> _CachedRecipe:
+        """Add a parsed recipe file to the cache.
+        
+        Args:
+            file_path: Path to the recipe file
+            mtime_ns: File modification time the recipe was read at
+            recipe: Parsed recipe
+            
+        Returns:
+            New cache entry
+        """
+        ingredient_names = (
+            ingredient if isinstance(ingredient, str) else ingredient.name
+            for ingredient in recipe.ingredients
+        )
+        cached = _CachedRecipe(
+            mtime_ns, recipe, _search_text(recipe.title, ingredient_names, recipe.tags)
+        )
+        with self._cache_lock:
+            self._cache[file_path] = cached
+        return cached
+    
+    def _recipe_files(self, count: Optional[int] = None) -> List[str]:
+        """Return the first recipe file paths in file name order.
+        
+        Args:
+            count: Maximum number of paths to return, or None for all of them
+            
+        Returns:
+            Sorted recipe file paths
+        """
+        # Adding or removing a file changes the directory's mtime, so the
+        # directory is only re-read when that has moved on. save_recipe and
+        # delete_recipe also reset the listing, in case the filesystem's
+        # timestamps are too coarse to show their change.
+        mtime_ns = self.recipes_dir.stat().st_mtime_ns
+        listing = self._listing
+        if listing is None or listing[0] != mtime_ns:
+            with os.scandir(self.recipes_dir) as entries:
+                paths = sorted(
+                    entry.path for entry in entries if entry.name.endswith(".json")
+                )
+            listing = self._listing = (mtime_ns, paths)
+        
+        return listing[1][:count]
+    
+    async def save_recipe(self, recipe: Recipe) -> Path:
         """Save a recipe.
         
         Args:
@@ -145,13 +351,46 @@ class RecipeStorageService:
         # Update timestamp
         recipe.updated_at = time.time()
         
-        # Save recipe
-        file_path = recipe.save_to_file(self.recipes_dir)
+        # Write the file and index entry off the event loop
+        file_path = await asyncio.to_thread(self._write_recipe, recipe)
         
         logger.info(f"Saved recipe {recipe.id} to {file_path}")
         
         return file_path
     
+    def _write_recipe(self, recipe: Recipe) -> Path:
+        """Write a recipe file and update the cache and search index.
+        
+        Args:
+            recipe: Recipe to write
+            
+        Returns:
+            Path to the saved file
+        """
+        file_path = recipe.save_to_file(self.recipes_dir)
+        self._listing = None
+        with self._cache_lock:
+            self._cache.pop(file_path, None)
+        
+        if self.search_index is not None:
+            self.search_index.add(recipe, file_path.stat().st_mtime_ns)
+        
+        return file_path
+    
+    def _remove_recipe(self, recipe_id: UUID, file_path: Path) -> None:
+        """Remove a recipe file and its cache and search index entries.
+        
+        Args:
+            recipe_id: Recipe ID
+            file_path: Path to the recipe file
+        """
+        os.remove(file_path)
+        self._listing = None
+        with self._cache_lock:
+            self._cache.pop(file_path, None)
+        if self.search_index is not None:
+            self.search_index.remove(recipe_id)
+    
     def load_recipe(self, recipe_id: UUID) -> Optional[Recipe]:
         """Load a recipe.
         
@@ -168,14 +407,14 @@ class RecipeStorageService:
             return None
         
         try:
-            recipe = Recipe.load_from_file(file_path)
+            recipe = self._load_cached(file_path).recipe
             logger.info(f"Loaded recipe {recipe_id} from {file_path}")
             return recipe
         except Exception as e:
             logger.error(f"Error loading recipe {recipe_id}: {e}")
             return None
     
-    def delete_recipe(self, recipe_id: UUID) -> bool:
+    async def delete_recipe(self, recipe_id: UUID) -> bool:
         """Delete a recipe.
         
         Args:
@@ -191,14 +430,14 @@ class RecipeStorageService:
             return False
         
         try:
-            os.remove(file_path)
+            await asyncio.to_thread(self._remove_recipe, recipe_id, file_path)
             logger.info(f"Deleted recipe {recipe_id} from {file_path}")
             return True
         except Exception as e:
             logger.error(f"Error deleting recipe {recipe_id}: {e}")
             return False
     
-    def list_recipes(self, limit: int = 100, offset: int = 0) -> List[Recipe]:
+    async def list_recipes(self, limit: int = 100, offset: int = 0) -> List[Recipe]:
         """List recipes.
         
         Args:
@@ -208,25 +447,114 @@ class RecipeStorageService:
         Returns:
             List of recipes
         """
-        # Get all recipe files
-        recipe_files = sorted(glob.glob(str(self.recipes_dir / "*.json")))
-        
         # Apply pagination
-        recipe_files = recipe_files[offset:offset + limit]
+        recipe_files = [Path(p) for p in self._recipe_files(offset + limit)[offset:]]
         
-        # Load recipes
-        recipes = []
+        # Serve unchanged files from the cache, and read the rest in worker
+        # threads so their disk reads overlap instead of blocking the loop
+        recipes: List[Optional[Recipe]] = []
+        to_load = []
         for file_path in recipe_files:
             try:
-                recipe = Recipe.load_from_file(Path(file_path))
-                recipes.append(recipe)
-            except Exception as e:
-                logger.error(f"Error loading recipe from {file_path}: {e}")
+                cached = self._cached_entry(file_path, file_path.stat().st_mtime_ns)
+            except OSError:
+                cached = None
+            
+            if cached is None:
+                to_load.append((len(recipes), file_path))
+            recipes.append(cached.recipe if cached is not None else None)
+        
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(self._load_cached, file_path)
+                for _, file_path in to_load
+            ),
+            return_exceptions=True,
+        )
+        for (position, file_path), result in zip(to_load, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error loading recipe from {file_path}: {result}")
+            else:
+                recipes[position] = result.recipe
+        
+        recipes = [recipe for recipe in recipes if recipe is not None]
         
         logger.info(f"Listed {len(recipes)} recipes")
         
         return recipes
     
+    async def list_candidate_recipes(
+        self, preferences: Dict, k: int = 50
+    ) -> List[Recipe]:
+        """Select the recipes that best fit a user's preferences.
+        
+        Recipes missing any of the user's dietary restrictions, or using a
+        disliked or allergenic ingredient, are dropped. Recipes tagged with
+        one of the user's favorite cuisines are ranked first.
+        
+        Every recipe in the library is considered, loading them a batch at a
+        time. The scan stops early once k recipes of the top rank have been
+        found, since nothing later could displace them, so in the worst
+        case every recipe file is read.
+        
+        Args:
+            preferences: User preferences
+            k: Maximum number of recipes to return
+            
+        Returns:
+            List of candidate recipes
+        """
+        required = {
+            restriction.lower()
+            for restriction in preferences.get("dietary_restrictions") or ()
+        }
+        avoided = _ingredient_pattern(
+            ingredient.strip().lower()
+            for key in ("disliked_ingredients", "allergies")
+            for ingredient in preferences.get(key) or ()
+        )
+        cuisines = {
+            cuisine.lower() for cuisine in preferences.get("favorite_cuisines") or ()
+        }
+        
+        # Candidates in listing order, split by rank; only the first k of
+        # each rank can be returned, so no more than that are kept
+        preferred: List[Recipe] = []
+        others: List[Recipe] = []
+        
+        total = len(self._recipe_files())
+        for offset in range(0, total, self.candidate_batch_size):
+            batch = await self.list_recipes(
+                limit=self.candidate_batch_size, offset=offset
+            )
+            for recipe in batch:
+                if not required.issubset(
+                    r.lower() for r in recipe.dietary_restrictions
+                ):
+                    continue
+                
+                names = (
+                    ingredient if isinstance(ingredient, str) else ingredient.name
+                    for ingredient in recipe.ingredients
+                )
+                if avoided is not None and any(
+                    avoided.search(n.lower()) for n in names
+                ):
+                    continue
+                
+                if cuisines and not cuisines.isdisjoint(
+                    tag.lower() for tag in recipe.tags
+                ):
+                    preferred.append(recipe)
+                elif len(others) < k:
+                    others.append(recipe)
+            
+            top_rank = preferred if cuisines else others
+            if len(top_rank) >= k:
+                break
+        
+        return (preferred + others)[:k]
+    
     def search_recipes(self, query: str, limit: int = 100) -> List[Recipe]:
         """Search recipes.
         
@@ -237,38 +565,66 @@ class RecipeStorageService:
         Returns:
             List of matching recipes
         """
-        # Get all recipes
-        all_recipes = self.list_recipes(limit=1000)
+        if self.search_index is None:
+            matching_recipes = self._scan_recipes(query, limit)
+        else:
+            matching_recipes = []
+            for recipe_id in self.search_index.search(query, limit):
+                recipe = self.load_recipe(recipe_id)
+                if recipe is not None:
+                    matching_recipes.append(recipe)
         
-        # Filter recipes by query
-        matching_recipes = []
+        logger.info(f"Found {len(matching_recipes)} recipes matching '{query}'")
+        
+        return matching_recipes
+    
+    def _scan_recipes(self, query: str, limit: int) -> List[Recipe]:
+        """Search recipes by loading and checking each one.
+        
+        Args:
+            query: Search query
+            limit: Maximum number of recipes to return
+            
+        Returns:
+            List of matching recipes
+        """
         query = query.lower()
+        matching_recipes = []
         
-        for recipe in all_recipes:
-            # Check title
-            if query in recipe.title.lower():
-                matching_recipes.append(recipe)
+        for file_path in map(Path, self._recipe_files(1000)):
+            try:
+                mtime_ns = file_path.stat().st_mtime_ns
+                cached = self._cached_entry(file_path, mtime_ns)
+                
+                if cached is None:
+                    # Check the raw JSON first; only matching files are
+                    # validated into Recipe objects
+                    data = orjson.loads(file_path.read_bytes())
+                    ingredient_names = (
+                        (
+                            ingredient
+                            if isinstance(ingredient, str)
+                            else ingredient["name"]
+                        )
+                        for ingredient in data["ingredients"]
+                    )
+                    if query not in _search_text(
+                        data["title"], ingredient_names, data.get("tags", ())
+                    ):
+                        continue
+                    
+                    cached = self._cache_recipe(
+                        file_path, mtime_ns, Recipe.model_validate(data)
+                    )
+            except Exception as e:
+                logger.error(f"Error loading recipe from {file_path}: {e}")
                 continue
             
-            # Check ingredients
-            for ingredient in recipe.ingredients:
-                if isinstance(ingredient, str) and query in ingredient.lower():
-                    matching_recipes.append(recipe)
-                    break
-                elif hasattr(ingredient, "name") and query in ingredient.name.lower():
-                    matching_recipes.append(recipe)
+            # Match against the cached recipe's precomputed search text
+            if query in cached.search_text:
+                matching_recipes.append(cached.recipe)
+                if len(matching_recipes) == limit:
                     break
-            
-            # Check tags
-            for tag in recipe.tags:
-                if query in tag.lower():
-                    matching_recipes.append(recipe)
-                    break
-        
-        # Apply limit
-        matching_recipes = matching_recipes[:limit]
-        
-        logger.info(f"Found {len(matching_recipes)} recipes matching '{query}'")
         
         return matching_recipes
 
@@ -295,8 +651,8 @@ class MealPlanService:
     async def generate_meal_plan(
         self,
         user_id: UUID,
-        start_date: str,
-        end_date: str,
+        start_date: Union[str, date],
+        end_date: Union[str, date],
         preferences: Dict,
         nutrition_goal: Optional[str] = None,
         budget_limit: Optional[float] = None
@@ -305,8 +661,8 @@ class MealPlanService:
         
         Args:
             user_id: User ID
-            start_date: Start date (YYYY-MM-DD)
-            end_date: End date (YYYY-MM-DD)
+            start_date: Start date, as a date or YYYY-MM-DD string
+            end_date: End date, as a date or YYYY-MM-DD string
             preferences: User preferences
             nutrition_goal: Optional nutrition goal
             budget_limit: Optional budget limit
@@ -316,8 +672,15 @@ class MealPlanService:
         """
         logger.info(f"Generating meal plan for user {user_id}")
         
-        # Get available recipes
-        available_recipes = self.recipe_storage.list_recipes(limit=1000)
+        if isinstance(start_date, str):
+            start_date = date.fromisoformat(start_date)
+        if isinstance(end_date, str):
+            end_date = date.fromisoformat(end_date)
+        
+        # Only send the LLM recipes that suit the user
+        available_recipes = await self.recipe_storage.list_candidate_recipes(
+            preferences
+        )
         
         if not available_recipes:
             logger.warning("No recipes available for meal planning")
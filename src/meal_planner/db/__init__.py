@@ -1,11 +1,19 @@
 """Database package for meal planner."""
 
-from .database import database, get_db_session, init_database, close_database
+from .database import close_database, database, get_db_session, init_database
 from .models import (
-    Base, User, UserPreferences, Recipe, MealPlan, MealPlanRecipe, 
-    GroceryList, RecipeRating, UploadedFile
+    Base,
+    GroceryList,
+    GroceryListItem,
+    MealPlan,
+    MealPlanRecipe,
+    Recipe,
+    RecipeRating,
+    UploadedFile,
+    User,
+    UserPreferences,
 )
-from .services import UserService, RecipeService, MealPlanService
+from .services import MealPlanService, RecipeService, UserService
 
 __all__ = [
     # Database connection
@@ -22,6 +30,7 @@ __all__ = [
     "MealPlan",
     "MealPlanRecipe",
     "GroceryList",
+    "GroceryListItem",
     "RecipeRating",
     "UploadedFile",
     
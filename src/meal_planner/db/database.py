@@ -1,13 +1,156 @@
 """Database configuration and session management."""
 
+import asyncio
 import os
-from typing import AsyncGenerator
+import uuid
+from typing import Any, AsyncGenerator, Awaitable, Callable, List
 
+from sqlalchemy import JSON, event, insert, inspect, text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateIndex
 
 from meal_planner.core.config import settings
-from meal_planner.db.models import Base
+from meal_planner.db.models import (
+    GUID,
+    SQLITE_RECIPE_FTS_BACKFILL,
+    SQLITE_RECIPE_FTS_DDL,
+    Base,
+    GroceryList,
+    GroceryListItem,
+    RecipeLabel,
+)
+from meal_planner.db.services import RecipeService, _grocery_item_rows
+
+# Applied to every new SQLite connection. WAL lets readers run alongside a
+# writer, and synchronous=NORMAL is still durable against crashes in WAL
+# mode; the rest trade memory for fewer syscalls.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256MB
+    "PRAGMA cache_size=-65536",  # 64MB
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Configure a new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def _create_missing_indexes(sync_conn):
+    """Create every model index an existing database doesn't have yet.
+    
+    ``create_all`` only creates indexes alongside their tables, so one
+    declared on a table that already exists would otherwise never be added.
+    Each CREATE INDEX is run as a DDL listener would be, which skips indexes
+    limited to another dialect with ``ddl_if``.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            CreateIndex(index, if_not_exists=True)(table, sync_conn)
+
+
+async def _convert_text_guids(conn):
+    """Rewrite GUIDs stored as 36-character text by earlier versions as blobs."""
+    for table in Base.metadata.sorted_tables:
+        for column in table.columns:
+            if not isinstance(column.type, GUID):
+                continue
+            
+            rows = await conn.execute(
+                text(
+                    f"SELECT rowid, {column.name} FROM {table.name} "
+                    f"WHERE typeof({column.name}) = 'text'"
+                )
+            )
+            params = [
+                {"rowid": rowid, "value": uuid.UUID(value).bytes}
+                for rowid, value in rows
+            ]
+            if params:
+                await conn.execute(
+                    text(
+                        f"UPDATE {table.name} SET {column.name} = :value "
+                        "WHERE rowid = :rowid"
+                    ),
+                    params,
+                )
+
+
+async def _pad_legacy_timestamps(conn):
+    """Give created_at values written by CURRENT_TIMESTAMP microsecond precision.
+    
+    Earlier versions let SQLite fill in created_at as ``YYYY-MM-DD HH:MM:SS``,
+    which sorts below the ``.ffffff`` form SQLAlchemy binds keyset cursors
+    in, so pages of older rows never advanced.
+    """
+    for table in Base.metadata.sorted_tables:
+        if "created_at" not in table.columns:
+            continue
+        
+        await conn.execute(text(
+            f"UPDATE {table.name} "
+            "SET created_at = strftime('%Y-%m-%d %H:%M:%S', created_at) || '.000000' "
+            "WHERE typeof(created_at) = 'text' AND created_at NOT LIKE '%.%'"
+        ))
+
+
+async def _move_grocery_list_items(conn):
+    """Move grocery list items from the old JSON column into grocery_list_items.
+    
+    The table is then rebuilt without the column, since inserts no longer
+    fill in its NOT NULL constraint.
+    """
+    columns = await conn.execute(text("PRAGMA table_info(grocery_lists)"))
+    if "items" not in {row.name for row in columns}:
+        return
+    
+    lists = await conn.execute(
+        text("SELECT id, items FROM grocery_lists").columns(id=GUID(), items=JSON())
+    )
+    rows = [
+        row
+        for list_id, items in lists
+        for row in _grocery_item_rows(list_id, items or [])
+    ]
+    if rows:
+        await conn.execute(insert(GroceryListItem), rows)
+    
+    # Renaming would otherwise repoint grocery_list_items' foreign key at
+    # the old table
+    await conn.execute(text("PRAGMA legacy_alter_table = ON"))
+    await conn.execute(text("ALTER TABLE grocery_lists RENAME TO grocery_lists_old"))
+    await conn.run_sync(GroceryList.__table__.create)
+    names = ", ".join(column.name for column in GroceryList.__table__.columns)
+    await conn.execute(
+        text(
+            f"INSERT INTO grocery_lists ({names}) SELECT {names} FROM grocery_lists_old"
+        )
+    )
+    await conn.execute(text("DROP TABLE grocery_lists_old"))
+    await conn.execute(text("PRAGMA legacy_alter_table = OFF"))
+
+
+# Run in order, once per SQLite database; PRAGMA user_version records how
+# many have been applied. Append new steps, never reorder or remove them.
+SQLITE_MIGRATIONS = (
+    _convert_text_guids,
+    _pad_legacy_timestamps,
+    _move_grocery_list_items,
+)
+
+
+async def _migrate_sqlite(conn):
+    """Apply the SQLite migrations this database hasn't had yet."""
+    applied = await conn.scalar(text("PRAGMA user_version"))
+    for version, migration in enumerate(SQLITE_MIGRATIONS[applied:], start=applied + 1):
+        await migration(conn)
+        await conn.execute(text(f"PRAGMA user_version = {version}"))
 
 
 class Database:
@@ -27,20 +170,38 @@ class Database:
         
         # Configure engine based on database type
         if db_url.startswith("sqlite"):
-            # SQLite specific configuration
+            # An in-memory database only exists within its one connection,
+            # so it must be shared; file databases get a real pool so WAL
+            # readers can run concurrently
+            if ":memory:" in db_url or "mode=memory" in db_url or db_url.endswith("://"):
+                pool_args = {"poolclass": StaticPool}
+            else:
+                pool_args = {
+                    "pool_size": settings.db_pool_size,
+                    "max_overflow": settings.db_max_overflow,
+                    "pool_timeout": settings.db_pool_timeout,
+                }
+            
             self.engine = create_async_engine(
                 db_url,
                 echo=settings.debug,
-                poolclass=StaticPool,
+                query_cache_size=settings.db_query_cache_size,
                 connect_args={
                     "check_same_thread": False,
                 },
+                **pool_args,
             )
+            event.listen(self.engine.sync_engine, "connect", _set_sqlite_pragmas)
         else:
             # PostgreSQL and other databases
             self.engine = create_async_engine(
                 db_url,
                 echo=settings.debug,
+                query_cache_size=settings.db_query_cache_size,
+                pool_size=settings.db_pool_size,
+                max_overflow=settings.db_max_overflow,
+                pool_timeout=settings.db_pool_timeout,
+                pool_recycle=settings.db_pool_recycle,
                 pool_pre_ping=True,
             )
         
@@ -53,7 +214,46 @@ class Database:
     async def create_tables(self):
         """Create all database tables."""
         async with self.engine.begin() as conn:
+            has_labels = await conn.run_sync(
+                lambda sync_conn: inspect(sync_conn).has_table(
+                    RecipeLabel.__tablename__
+                )
+            )
             await conn.run_sync(Base.metadata.create_all)
+            
+            # Fill recipe_labels from the recipes' JSON fields when it's new
+            # to an existing database, as with the search table below
+            if not has_labels:
+                async with AsyncSession(bind=conn) as session:
+                    await RecipeService(session).rebuild_labels()
+            
+            # Likewise for indexes added after their table was created
+            await conn.run_sync(_create_missing_indexes)
+            
+            # create_all only adds the search table alongside a new recipes
+            # table; add and fill it for databases created before it existed
+            if conn.dialect.name == "sqlite":
+                await _migrate_sqlite(conn)
+                
+                has_fts = await conn.scalar(
+                    text("SELECT 1 FROM sqlite_master WHERE name = 'recipes_fts'")
+                )
+                if not has_fts:
+                    for statement in SQLITE_RECIPE_FTS_DDL:
+                        await conn.execute(text(statement))
+                    await conn.execute(text(SQLITE_RECIPE_FTS_BACKFILL))
+    
+    async def warm_pool(self):
+        """Open the pool's connections up front so early requests don't wait on them."""
+        if isinstance(self.engine.pool, StaticPool):
+            return
+        
+        async def ping():
+            async with self.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        
+        # Hold the connections concurrently so the pool has to open pool_size of them
+        await asyncio.gather(*(ping() for _ in range(settings.db_pool_size)))
     
     async def drop_tables(self):
         """Drop all database tables."""
@@ -75,6 +275,32 @@ class Database:
             raise RuntimeError("Database not initialized")
         
         return self.session_factory()
+    
+    async def gather_reads(
+        self, *reads: Callable[[AsyncSession], Awaitable[Any]]
+    ) -> List[Any]:
+        """Run independent reads concurrently, each on its own session.
+        
+        One AsyncSession can't run two statements at once, so overlapping
+        reads need a session (and pooled connection) apiece. The returned
+        objects are detached, keeping whatever the read loaded.
+        
+        Args:
+            reads: Callables taking a session and returning an awaitable,
+                e.g. ``lambda db: UserService(db).get_user_by_id(user_id)``
+        
+        Returns:
+            Each read's result, in argument order
+        """
+        async def run(read):
+            async with await self.get_session() as session:
+                return await read(session)
+        
+        # An in-memory database has a single shared connection to run on
+        if isinstance(self.engine.pool, StaticPool):
+            return [await run(read) for read in reads]
+        
+        return list(await asyncio.gather(*(run(read) for read in reads)))
 
 
 # Global database instance
@@ -84,17 +310,21 @@ database = Database()
 async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
     """Dependency for getting database session.
     
+    The session is one unit of work: services only flush, and everything
+    the request wrote is committed together once the endpoint returns, or
+    rolled back if it raises. Declare it with ``scope="function"`` so the
+    commit happens before the response is sent.
+    
     Yields:
         Database session
     """
-    async with database.get_session() as session:
+    async with await database.get_session() as session:
         try:
             yield session
+            await session.commit()
         except Exception:
             await session.rollback()
             raise
-        finally:
-            await session.close()
 
 
 async def init_database():
@@ -108,6 +338,9 @@ async def init_database():
     # Create tables
     await database.create_tables()
     
+    # Open pooled connections before serving requests
+    await database.warm_pool()
+    
     print(f"Database initialized at: {settings.database_url}")
 
 
@@ -1,12 +1,34 @@
 """Database models using SQLAlchemy."""
 
 import uuid
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import List, Optional
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, Text, Boolean, UniqueConstraint
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    UniqueConstraint,
+    cast,
+    column,
+    desc,
+    event,
+    literal_column,
+    table,
+    text,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.types import JSON, TypeDecorator
@@ -17,8 +39,9 @@ Base = declarative_base()
 class GUID(TypeDecorator):
     """Platform-independent GUID type.
     
-    Uses PostgreSQL's UUID type when available,
-    otherwise uses CHAR(36) for other databases.
+    Uses PostgreSQL's UUID type when available, 16-byte blobs on SQLite
+    (half the size of the text form, so smaller indexes and cheaper
+    comparisons), and CHAR(36) for other databases.
     """
     impl = String
     cache_ok = True
@@ -26,32 +49,50 @@ class GUID(TypeDecorator):
     def load_dialect_impl(self, dialect):
         if dialect.name == 'postgresql':
             return dialect.type_descriptor(UUID())
+        elif dialect.name == 'sqlite':
+            return dialect.type_descriptor(LargeBinary(16))
         else:
             return dialect.type_descriptor(String(36))
 
     def process_bind_param(self, value, dialect):
         if value is None:
             return value
-        elif dialect.name == 'postgresql':
-            return str(value)
-        else:
-            if not isinstance(value, uuid.UUID):
-                return str(uuid.UUID(value))
-            return str(value)
+        if not isinstance(value, uuid.UUID):
+            value = _parse_uuid(value)
+        if dialect.name == 'sqlite':
+            return value.bytes
+        # Canonical 36-character form
+        return str(value)
 
     def process_result_value(self, value, dialect):
-        if value is None:
-            return value
-        else:
-            if not isinstance(value, uuid.UUID):
-                return uuid.UUID(value)
+        if value is None or isinstance(value, uuid.UUID):
             return value
+        if isinstance(value, bytes):
+            return _uuid_from_bytes(value)
+        return _parse_uuid(value)
+
+
+# The same IDs recur across rows (user_id, recipe_id in joins), and parsing
+# is the bulk of a GUID conversion; UUIDs are immutable, so sharing is safe
+_parse_uuid = lru_cache(maxsize=4096)(uuid.UUID)
+
+
+@lru_cache(maxsize=4096)
+def _uuid_from_bytes(value: bytes) -> uuid.UUID:
+    return uuid.UUID(bytes=value)
 
 
 class TimestampMixin:
     """Mixin for created_at and updated_at timestamps."""
     
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Set client-side so every row stores the same precision; SQLite's
+    # CURRENT_TIMESTAMP drops microseconds, which breaks keyset pagination
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        nullable=False
+    )
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
 
 
@@ -108,7 +149,8 @@ class Recipe(Base, TimestampMixin):
     __tablename__ = "recipes"
     
     id = Column(GUID(), primary_key=True, default=uuid.uuid4)
-    user_id = Column(GUID(), ForeignKey("users.id"), nullable=True)  # Nullable for system recipes
+    # Nullable for system recipes
+    user_id = Column(GUID(), ForeignKey("users.id"), nullable=True, index=True)
     
     # Basic recipe info
     title = Column(String(255), nullable=False, index=True)
@@ -127,7 +169,6 @@ class Recipe(Base, TimestampMixin):
     # Timing and serving
     prep_time_minutes = Column(Integer, nullable=True)
     cook_time_minutes = Column(Integer, nullable=True)
-    total_time_minutes = Column(Integer, nullable=True)  # Computed field
     servings = Column(Integer, nullable=True)
     
     # External references
@@ -152,9 +193,146 @@ class Recipe(Base, TimestampMixin):
     # Estimated cost
     estimated_cost_per_serving = Column(Float, nullable=True)
     
+    @hybrid_property
+    def total_time_minutes(self) -> Optional[int]:
+        """Prep plus cook time, or None when neither is set (or both are zero)."""
+        return (self.prep_time_minutes or 0) + (self.cook_time_minutes or 0) or None
+    
+    @total_time_minutes.expression
+    def total_time_minutes(cls):
+        # Zeros are rendered inline so the expression matches its index
+        zero = literal_column("0")
+        return func.nullif(
+            func.coalesce(cls.prep_time_minutes, zero)
+            + func.coalesce(cls.cook_time_minutes, zero),
+            zero,
+        )
+    
     # Relationships
     user = relationship("User", back_populates="recipes")
     meal_plan_recipes = relationship("MealPlanRecipe", back_populates="recipe")
+    labels = relationship("RecipeLabel", cascade="all, delete-orphan")
+    
+    # Back the (created_at, id) keyset used for cursor pagination, overall
+    # and within the public-recipes filter
+    __table_args__ = (
+        Index("ix_recipes_created_at_id", "created_at", "id"),
+        Index("ix_recipes_public_created_at_id", "is_public", "created_at", "id"),
+    )
+
+
+# Back the public-recipe time filters with index seeks; the total time index
+# is on the same expression the hybrid property renders
+RECIPE_TIME_INDEXES = (
+    Index("ix_recipes_public_prep_time", Recipe.is_public, Recipe.prep_time_minutes),
+    Index(
+        "ix_recipes_public_total_time",
+        Recipe.is_public,
+        Recipe.total_time_minutes.label("total_time_minutes")
+    ),
+)
+
+# Public recipes in best-rated-first order, so filtered listings read the
+# first LIMIT matches off the index instead of sorting every public recipe
+RECIPE_RANK_INDEX = Index(
+    "ix_recipes_public_rank",
+    Recipe.is_public,
+    desc(Recipe.average_rating),
+    desc(Recipe.created_at),
+)
+
+
+# Full-text search (PostgreSQL only). Constants are rendered inline rather
+# than bound so the search query's expression matches the index expression.
+SEARCH_CONFIG = text("'english'::regconfig")
+
+
+def _weighted_tsvector(column, weight: str):
+    return func.setweight(
+        func.to_tsvector(SEARCH_CONFIG, func.coalesce(column, text("''"))),
+        text(f"'{weight}'")
+    )
+
+
+RECIPE_SEARCH_VECTOR = (
+    _weighted_tsvector(Recipe.title, "A")
+    .op("||")(_weighted_tsvector(Recipe.description, "B"))
+    .op("||")(_weighted_tsvector(cast(Recipe.ingredients, Text), "C"))
+)
+
+Index(
+    "ix_recipes_search_vector", RECIPE_SEARCH_VECTOR, postgresql_using="gin"
+).ddl_if(dialect="postgresql")
+
+# Case-insensitive title prefix lookups for queries too short for full-text search
+Index(
+    "ix_recipes_title_prefix",
+    func.lower(Recipe.title).label("title_lower"),
+    postgresql_ops={"title_lower": "text_pattern_ops"}
+).ddl_if(dialect="postgresql")
+
+
+# Full-text search (SQLite). A trigram FTS5 table keyed by the recipes rowid,
+# kept in sync by triggers; JSON arrays are indexed one element per line so
+# a query can't match across two elements. Trigrams keep the substring
+# semantics of the LIKE search they replace.
+recipes_fts = table("recipes_fts", column("rowid"), column("rank"))
+
+_FTS_ROW = """
+    NEW.title, coalesce(NEW.description, ''),
+    (SELECT group_concat(value, char(10)) FROM json_each(NEW.tags)),
+    (SELECT group_concat(value, char(10)) FROM json_each(NEW.ingredients))
+"""
+
+SQLITE_RECIPE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS recipes_fts "
+    "USING fts5(title, description, tags, ingredients, tokenize='trigram')",
+    f"""CREATE TRIGGER IF NOT EXISTS recipes_fts_insert AFTER INSERT ON recipes BEGIN
+        INSERT INTO recipes_fts (rowid, title, description, tags, ingredients)
+        VALUES (NEW.rowid, {_FTS_ROW});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS recipes_fts_update
+    AFTER UPDATE OF title, description, tags, ingredients ON recipes BEGIN
+        DELETE FROM recipes_fts WHERE rowid = OLD.rowid;
+        INSERT INTO recipes_fts (rowid, title, description, tags, ingredients)
+        VALUES (NEW.rowid, {_FTS_ROW});
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS recipes_fts_delete AFTER DELETE ON recipes BEGIN
+        DELETE FROM recipes_fts WHERE rowid = OLD.rowid;
+    END""",
+)
+
+# Index rows for recipes that existed before the table did
+SQLITE_RECIPE_FTS_BACKFILL = (
+    "INSERT INTO recipes_fts (rowid, title, description, tags, ingredients) "
+    "SELECT NEW.rowid, " + _FTS_ROW + " FROM recipes AS NEW"
+)
+
+for _statement in SQLITE_RECIPE_FTS_DDL:
+    event.listen(
+        Recipe.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+
+
+# Recipe JSON list fields mirrored into recipe_labels, so filtering on them is
+# an index lookup rather than a JSON scan of every row
+RECIPE_LABEL_FIELDS = ("tags", "meal_types", "dietary_restrictions", "appliances")
+
+
+class RecipeLabel(Base):
+    """One value of a recipe's tags, meal types, dietary restrictions or appliances."""
+    
+    __tablename__ = "recipe_labels"
+    
+    recipe_id = Column(
+        GUID(), ForeignKey("recipes.id", ondelete="CASCADE"), primary_key=True
+    )
+    kind = Column(String(32), primary_key=True)  # One of RECIPE_LABEL_FIELDS
+    value = Column(String(100), primary_key=True)
+    
+    __table_args__ = (
+        Index("ix_recipe_labels_kind_value", "kind", "value", "recipe_id"),
+    )
 
 
 class MealPlan(Base, TimestampMixin):
@@ -163,7 +341,7 @@ class MealPlan(Base, TimestampMixin):
     __tablename__ = "meal_plans"
     
     id = Column(GUID(), primary_key=True, default=uuid.uuid4)
-    user_id = Column(GUID(), ForeignKey("users.id"), nullable=False)
+    user_id = Column(GUID(), ForeignKey("users.id"), nullable=False, index=True)
     
     # Plan metadata
     name = Column(String(255), nullable=True)  # Optional name for the plan
@@ -182,9 +360,16 @@ class MealPlan(Base, TimestampMixin):
     # Plan status
     is_active = Column(Boolean, default=True)
     
-    # Relationships
-    user = relationship("User", back_populates="meal_plans")
-    recipes = relationship("MealPlanRecipe", back_populates="meal_plan", cascade="all, delete-orphan")
+    # Relationships. A plan is almost always read with its user and scheduled
+    # recipes, so they load by default with one SELECT ... IN per level
+    # rather than per plan; queries can still override this with options.
+    user = relationship("User", back_populates="meal_plans", lazy="selectin")
+    recipes = relationship(
+        "MealPlanRecipe",
+        back_populates="meal_plan",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+    )
     grocery_lists = relationship("GroceryList", back_populates="meal_plan", cascade="all, delete-orphan")
 
 
@@ -195,7 +380,7 @@ class MealPlanRecipe(Base):
     
     id = Column(GUID(), primary_key=True, default=uuid.uuid4)
     meal_plan_id = Column(GUID(), ForeignKey("meal_plans.id"), nullable=False)
-    recipe_id = Column(GUID(), ForeignKey("recipes.id"), nullable=False)
+    recipe_id = Column(GUID(), ForeignKey("recipes.id"), nullable=False, index=True)
     
     # When this recipe is scheduled
     scheduled_date = Column(DateTime(timezone=True), nullable=False)
@@ -207,7 +392,12 @@ class MealPlanRecipe(Base):
     
     # Relationships
     meal_plan = relationship("MealPlan", back_populates="recipes")
-    recipe = relationship("Recipe", back_populates="meal_plan_recipes")
+    recipe = relationship("Recipe", back_populates="meal_plan_recipes", lazy="selectin")
+    
+    # Leading meal_plan_id also serves plain per-plan lookups
+    __table_args__ = (
+        Index("ix_meal_plan_recipes_plan_date", "meal_plan_id", "scheduled_date"),
+    )
 
 
 class GroceryList(Base, TimestampMixin):
@@ -222,9 +412,6 @@ class GroceryList(Base, TimestampMixin):
     # List metadata
     name = Column(String(255), nullable=True)
     
-    # List items (stored as JSON for flexibility)
-    items = Column(JSON, nullable=False)  # List of grocery items with quantities
-    
     # Shopping info
     total_estimated_cost = Column(Float, nullable=True)
     store_preference = Column(String(255), nullable=True)
@@ -233,8 +420,38 @@ class GroceryList(Base, TimestampMixin):
     is_completed = Column(Boolean, default=False)
     completed_at = Column(DateTime(timezone=True), nullable=True)
     
-    # Relationships
+    # Relationships. Items are rows of their own so a list isn't one large
+    # JSON blob to rewrite and re-parse; they load with the list.
     meal_plan = relationship("MealPlan", back_populates="grocery_lists")
+    items = relationship(
+        "GroceryListItem",
+        order_by="GroceryListItem.ordinal",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+    )
+
+
+class GroceryListItem(Base):
+    """One item on a grocery list."""
+    
+    __tablename__ = "grocery_list_items"
+    
+    id = Column(GUID(), primary_key=True, default=uuid.uuid4)
+    grocery_list_id = Column(GUID(), ForeignKey("grocery_lists.id"), nullable=False)
+    ordinal = Column(Integer, nullable=False)  # Position in the list
+    
+    name = Column(String(255), nullable=False)
+    quantity = Column(Float, nullable=True)
+    unit = Column(String(50), nullable=True)
+    category = Column(String(100), nullable=True)  # "Produce", "Dairy", ...
+    estimated_cost = Column(Float, nullable=True)
+    recipe_ids = Column(JSON, default=list)  # Recipes using this item
+    purchased = Column(Boolean, default=False)
+    
+    # Leading grocery_list_id also serves plain per-list lookups
+    __table_args__ = (
+        Index("ix_grocery_list_items_list_ordinal", "grocery_list_id", "ordinal"),
+    )
 
 
 class RecipeRating(Base, TimestampMixin):
@@ -244,7 +461,8 @@ class RecipeRating(Base, TimestampMixin):
     
     id = Column(GUID(), primary_key=True, default=uuid.uuid4)
     user_id = Column(GUID(), ForeignKey("users.id"), nullable=False)
-    recipe_id = Column(GUID(), ForeignKey("recipes.id"), nullable=False)
+    # user_id lookups use the unique constraint's index
+    recipe_id = Column(GUID(), ForeignKey("recipes.id"), nullable=False, index=True)
     
     rating = Column(Integer, nullable=False)  # 1-5 stars
     review = Column(Text, nullable=True)
@@ -253,10 +471,32 @@ class RecipeRating(Base, TimestampMixin):
     difficulty_rating = Column(Integer, nullable=True)  # 1-5 (easy to hard)
     would_make_again = Column(Boolean, nullable=True)
     
+    # Relationships
+    user = relationship("User")
+    
     # Prevent duplicate ratings using proper SQLAlchemy constraint
     __table_args__ = (UniqueConstraint('user_id', 'recipe_id', name='_user_recipe_rating'),)
 
 
+# Back newest-first keyset pagination of meal plans (overall and per user)
+# and of a recipe's ratings, like the (created_at, id) indexes on recipes
+KEYSET_INDEXES = (
+    Index("ix_meal_plans_created_at_id", MealPlan.created_at, MealPlan.id),
+    Index(
+        "ix_meal_plans_user_created_at_id",
+        MealPlan.user_id,
+        MealPlan.created_at,
+        MealPlan.id,
+    ),
+    Index(
+        "ix_recipe_ratings_recipe_created_at_id",
+        RecipeRating.recipe_id,
+        RecipeRating.created_at,
+        RecipeRating.id,
+    ),
+)
+
+
 class UploadedFile(Base, TimestampMixin):
     """Uploaded file model for recipe extraction."""
     
@@ -279,4 +519,9 @@ class UploadedFile(Base, TimestampMixin):
     
     # Cleanup
     is_temporary = Column(Boolean, default=True)
-    expires_at = Column(DateTime(timezone=True), nullable=True)
\ No newline at end of file
+    expires_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    
+    # Leading user_id also serves plain per-user lookups
+    __table_args__ = (
+        Index("ix_uploaded_files_user_status", "user_id", "status"),
+    )
\ No newline at end of file
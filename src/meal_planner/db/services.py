@@ -1,19 +1,143 @@
-"""Database service layer for CRUD operations."""
+"""Database service layer for CRUD operations.
+
+Services flush their changes but never commit: the caller owns the
+transaction, so an API request commits once however many writes it makes
+(see ``get_db_session``).
+"""
 
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
 
-from sqlalchemy import and_, desc, func, or_
+from sqlalchemy import (
+    ColumnElement,
+    CursorResult,
+    and_,
+    delete,
+    desc,
+    exists,
+    func,
+    insert,
+    lambda_stmt,
+    literal_column,
+    or_,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import lazyload, raiseload, selectinload
+from sqlalchemy.sql.base import ExecutableOption
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
+from meal_planner.core.config import settings
 from meal_planner.db.models import (
-    GroceryList, MealPlan, MealPlanRecipe, Recipe, RecipeRating, UploadedFile, User, UserPreferences
+    RECIPE_LABEL_FIELDS,
+    RECIPE_SEARCH_VECTOR,
+    SEARCH_CONFIG,
+    GroceryList,
+    GroceryListItem,
+    MealPlan,
+    MealPlanRecipe,
+    Recipe,
+    RecipeLabel,
+    RecipeRating,
+    User,
+    recipes_fts,
 )
 
 
+class _Row(Protocol):
+    """A mapped model with an ``id`` primary key column."""
+    
+    id: Any
+
+
+M = TypeVar("M", bound=_Row)
+
+
+def _load(*options: ExecutableOption) -> Tuple[ExecutableOption, ...]:
+    """Loader options for a read query.
+    
+    Returns the query's eager loads and, with ``db_strict_loading`` on, a
+    ``raiseload("*")`` so touching any other relationship raises at once
+    instead of lazy loading one query per object.
+    """
+    if settings.db_strict_loading:
+        return (*options, raiseload("*"))
+    return options
+
+
+def _strict(stmt: StatementLambdaElement) -> StatementLambdaElement:
+    """Add ``_load``'s strict-loading option to a ``lambda_stmt``.
+    
+    A separate step because a lambda's body only runs the first time its
+    statement is built; anything it reads besides closure values used as
+    bound parameters is frozen at that point.
+    """
+    if settings.db_strict_loading:
+        stmt += lambda s: s.options(raiseload("*"))
+    return stmt
+
+
+def _newest_first_after(
+    model: Any, after: Tuple[datetime, uuid.UUID]
+) -> ColumnElement[bool]:
+    """Keyset condition for rows after ``(created_at, id)`` in newest-first order."""
+    after_created_at, after_id = after
+    return or_(
+        model.created_at < after_created_at,
+        and_(model.created_at == after_created_at, model.id < after_id)
+    )
+
+
+async def _update_where(
+    db: AsyncSession,
+    model: Type[M],
+    values: Dict[str, Any],
+    *conditions: ColumnElement[bool],
+) -> Optional[M]:
+    """UPDATE the one row matching the conditions and return it, in a single statement.
+    
+    The row comes back through RETURNING rather than a prior SELECT. An
+    instance already in the session is updated in place and keeps whatever
+    relationships it had loaded; otherwise none are loaded, overriding any
+    eager defaults on the model.
+    """
+    result = await db.execute(
+        update(model).where(*conditions).values(**values).returning(model)
+        .options(lazyload("*"))
+    )
+    row: Optional[M] = result.scalar_one_or_none()
+    return row
+
+
+async def _update_by_id(
+    db: AsyncSession, model: Type[M], row_id: uuid.UUID, values: Dict[str, Any]
+) -> Optional[M]:
+    """UPDATE one row by primary key and return it; see ``_update_where``."""
+    return await _update_where(db, model, values, model.id == row_id)
+
+
+async def _delete_where(
+    db: AsyncSession, model: Type[Any], *conditions: ColumnElement[bool]
+) -> bool:
+    """DELETE matching rows without loading them first; True if any were deleted."""
+    result = cast(CursorResult[Any], await db.execute(delete(model).where(*conditions)))
+    return result.rowcount > 0
+
+
 class UserService:
     """Service for user operations."""
     
@@ -24,75 +148,141 @@ class UserService:
         """Create a new user."""
         user = User(email=email, full_name=full_name)
         self.db.add(user)
-        await self.db.commit()
+        await self.db.flush()
         await self.db.refresh(user)
         return user
     
     async def get_user_by_id(self, user_id: uuid.UUID) -> Optional[User]:
         """Get user by ID."""
-        result = await self.db.execute(select(User).where(User.id == user_id))
+        result = await self.db.execute(
+            select(User).options(*_load()).where(User.id == user_id)
+        )
         return result.scalar_one_or_none()
     
     async def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email."""
-        result = await self.db.execute(select(User).where(User.email == email))
+        result = await self.db.execute(
+            select(User).options(*_load()).where(User.email == email)
+        )
         return result.scalar_one_or_none()
     
-    async def update_user(self, user_id: uuid.UUID, **kwargs) -> Optional[User]:
+    async def update_user(self, user_id: uuid.UUID, **kwargs: Any) -> Optional[User]:
         """Update user."""
-        user = await self.get_user_by_id(user_id)
-        if not user:
-            return None
-        
-        for key, value in kwargs.items():
-            setattr(user, key, value)
+        if not kwargs:
+            return await self.get_user_by_id(user_id)
         
-        await self.db.commit()
-        await self.db.refresh(user)
-        return user
+        return await _update_by_id(self.db, User, user_id, kwargs)
     
     async def delete_user(self, user_id: uuid.UUID) -> bool:
-        """Delete user."""
+        """Delete user.
+        
+        Loads the user so the ORM cascades to their recipes, meal plans and
+        preferences, which is too much to spell out as bulk deletes.
+        """
         user = await self.get_user_by_id(user_id)
         if not user:
             return False
         
         await self.db.delete(user)
-        await self.db.commit()
+        await self.db.flush()
         return True
 
 
+def _label_rows(recipe_id: uuid.UUID, fields: Mapping[Any, Any]) -> List[dict]:
+    """Build recipe_labels rows from a recipe's label list fields."""
+    return [
+        {"recipe_id": recipe_id, "kind": kind, "value": value}
+        for kind in RECIPE_LABEL_FIELDS
+        for value in set(fields.get(kind) or ())
+    ]
+
+
+# Optional grocery item fields, with the values used when an item omits them
+_GROCERY_ITEM_DEFAULTS: Dict[str, Any] = {
+    "quantity": None,
+    "unit": None,
+    "category": None,
+    "estimated_cost": None,
+    "recipe_ids": [],
+    "purchased": False,
+}
+
+
+def _grocery_item_rows(grocery_list_id: uuid.UUID, items: List[dict]) -> List[dict]:
+    """Build grocery_list_items rows, in list order, from item dicts."""
+    return [
+        {
+            "grocery_list_id": grocery_list_id,
+            "ordinal": ordinal,
+            "name": item["name"],
+            **{
+                field: item.get(field, default)
+                for field, default in _GROCERY_ITEM_DEFAULTS.items()
+            },
+        }
+        for ordinal, item in enumerate(items)
+    ]
+
+
+def _has_element_like(column: ColumnElement[Any], pattern: str) -> ColumnElement[bool]:
+    """Condition matching rows whose JSON array column has an element ILIKE the pattern.
+    
+    Matching elements one at a time, rather than the serialized array, keeps
+    patterns from matching across elements or on the JSON punctuation.
+    """
+    elements = func.json_each(column).table_valued("value")
+    return exists(
+        select(1).select_from(elements).where(elements.c.value.ilike(pattern))
+    )
+
+
+def _has_label(kind: str, values: List[str]) -> ColumnElement[bool]:
+    """Condition matching recipes labelled with any of the given values."""
+    return Recipe.id.in_(
+        select(RecipeLabel.recipe_id).where(
+            RecipeLabel.kind == kind, RecipeLabel.value.in_(values)
+        )
+    )
+
+
 class RecipeService:
     """Service for recipe operations."""
     
     def __init__(self, db: AsyncSession):
         self.db = db
     
-    async def create_recipe(self, user_id: Optional[uuid.UUID], recipe_data: dict) -> Recipe:
-        """Create a new recipe."""
-        # Calculate total time
-        prep_time = recipe_data.get('prep_time_minutes', 0) or 0
-        cook_time = recipe_data.get('cook_time_minutes', 0) or 0
-        total_time = prep_time + cook_time if prep_time or cook_time else None
+    async def _sync_labels(self, recipe: Recipe) -> None:
+        """Replace a recipe's recipe_labels rows with its current label lists."""
+        await self.db.execute(
+            delete(RecipeLabel).where(RecipeLabel.recipe_id == recipe.id)
+        )
         
-        recipe = Recipe(
-            user_id=user_id,
-            total_time_minutes=total_time,
-            **recipe_data
+        rows = _label_rows(
+            recipe.id, {kind: getattr(recipe, kind) for kind in RECIPE_LABEL_FIELDS}
         )
+        if rows:
+            await self.db.execute(insert(RecipeLabel), rows)
+    
+    async def create_recipe(
+        self, user_id: Optional[uuid.UUID], recipe_data: dict
+    ) -> Recipe:
+        """Create a new recipe."""
+        recipe = Recipe(user_id=user_id, **recipe_data)
         
         self.db.add(recipe)
-        await self.db.commit()
+        await self.db.flush()
+        await self._sync_labels(recipe)
         await self.db.refresh(recipe)
         return recipe
     
     async def get_recipe_by_id(self, recipe_id: uuid.UUID) -> Optional[Recipe]:
         """Get recipe by ID."""
-        result = await self.db.execute(
-            select(Recipe)
+        stmt = lambda_stmt(
+            lambda: select(Recipe)
             .options(selectinload(Recipe.user))
             .where(Recipe.id == recipe_id)
         )
+        result = await self.db.execute(_strict(stmt))
         return result.scalar_one_or_none()
     
     async def list_recipes(
@@ -100,87 +290,163 @@ class RecipeService:
         user_id: Optional[uuid.UUID] = None,
         limit: int = 20,
         offset: int = 0,
-        include_public: bool = True
+        include_public: bool = True,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None
     ) -> List[Recipe]:
-        """List recipes with pagination."""
-        query = select(Recipe).options(selectinload(Recipe.user))
-        
-        # Filter conditions
-        conditions = []
-        if user_id:
-            conditions.append(Recipe.user_id == user_id)
-        if include_public:
-            conditions.append(Recipe.is_public == True)
-        
-        if conditions:
-            query = query.where(or_(*conditions))
+        """List recipes with pagination.
+        
+        Pass the (created_at, id) of the last recipe on the previous page as
+        ``after`` to seek straight to the next page instead of using ``offset``.
+        The ``user`` relationship is not loaded.
+        """
+        stmt = self._visible_recipes(user_id, include_public)
+        
+        if after is not None:
+            # Unpacked here so each value is tracked as a bound parameter
+            after_created_at, after_id = after
+            stmt += lambda s: s.where(
+                _newest_first_after(Recipe, (after_created_at, after_id))
+            )
         
-        query = query.order_by(desc(Recipe.created_at)).limit(limit).offset(offset)
+        stmt += (
+            lambda s: s.order_by(desc(Recipe.created_at), desc(Recipe.id))
+            .limit(limit)
+            .offset(offset)
+        )
         
-        result = await self.db.execute(query)
+        result = await self.db.execute(stmt)
         return result.scalars().all()
     
+    async def iter_recipes(
+        self,
+        user_id: Optional[uuid.UUID] = None,
+        include_public: bool = True,
+        batch_size: int = 200
+    ) -> AsyncIterator[Recipe]:
+        """Stream every recipe ``list_recipes`` would page through, newest first.
+        
+        Rows are fetched ``batch_size`` at a time from an open cursor, so
+        walking the whole table holds one batch in memory rather than all of
+        it. The session is busy until the iteration finishes or is closed.
+        """
+        stmt = self._visible_recipes(user_id, include_public)
+        stmt += lambda s: s.order_by(desc(Recipe.created_at), desc(Recipe.id))
+        
+        result = await self.db.stream_scalars(
+            stmt, execution_options={"yield_per": batch_size}
+        )
+        try:
+            async for recipe in result:
+                yield recipe
+        finally:
+            await result.close()
+    
+    def _visible_recipes(
+        self, user_id: Optional[uuid.UUID], include_public: bool
+    ) -> StatementLambdaElement:
+        """Recipe ``lambda_stmt`` limited to a user's recipes and/or the public ones.
+        
+        Built as a lambda statement so SQLAlchemy caches the statement per
+        shape and skips rebuilding it on every page request.
+        """
+        stmt = _strict(lambda_stmt(lambda: select(Recipe)))
+        
+        # Filter conditions; each shape is its own lambda
+        if user_id and include_public:
+            stmt += lambda s: s.where(
+                or_(Recipe.user_id == user_id, Recipe.is_public.is_(True))
+            )
+        elif user_id:
+            stmt += lambda s: s.where(Recipe.user_id == user_id)
+        elif include_public:
+            stmt += lambda s: s.where(Recipe.is_public.is_(True))
+        
+        return stmt
+    
     async def search_recipes(
         self,
         query: str,
         user_id: Optional[uuid.UUID] = None,
         limit: int = 20
     ) -> List[Recipe]:
-        """Search recipes by title, tags, or ingredients."""
-        search_query = select(Recipe).options(selectinload(Recipe.user))
-        
-        # Text search conditions
-        search_conditions = [
-            Recipe.title.ilike(f"%{query}%"),
-            Recipe.description.ilike(f"%{query}%"),
-            # For JSON fields, we'll use a simple string search for SQLite compatibility
-            func.json_extract(Recipe.tags, '$').like(f"%{query}%"),
-            func.json_extract(Recipe.ingredients, '$').like(f"%{query}%")
-        ]
-        
-        search_query = search_query.where(or_(*search_conditions))
+        """Search recipes by title, tags, or ingredients.
+        
+        On PostgreSQL this uses the indexed full-text search vector, and on
+        SQLite the trigram FTS5 table, both ranked by relevance; other
+        databases, and SQLite queries too short for trigrams, fall back to
+        substring matching. The ``user`` relationship is not loaded.
+        """
+        search_query = select(Recipe).options(*_load())
+        order_by: List[ColumnElement[Any]] = [desc(Recipe.created_at)]
+        
+        if self.db.get_bind().dialect.name == "postgresql":
+            if len(query) < 3:
+                # Too short for useful stemming; match title prefixes instead
+                search_query = search_query.where(
+                    func.lower(Recipe.title).like(f"{query.lower()}%")
+                )
+            else:
+                ts_query = func.plainto_tsquery(SEARCH_CONFIG, query)
+                search_query = search_query.where(
+                    RECIPE_SEARCH_VECTOR.op("@@")(ts_query)
+                )
+                order_by.insert(
+                    0, desc(func.ts_rank_cd(RECIPE_SEARCH_VECTOR, ts_query))
+                )
+        elif self.db.get_bind().dialect.name == "sqlite" and len(query) >= 3:
+            # Quote the query so FTS5 treats it as a literal phrase; rank is BM25
+            search_query = search_query.join(
+                recipes_fts, recipes_fts.c.rowid == literal_column("recipes.rowid")
+            ).where(
+                literal_column("recipes_fts").op("MATCH")(
+                    '"' + query.replace('"', '""') + '"'
+                )
+            )
+            order_by.insert(0, recipes_fts.c.rank)
+        else:
+            # Text search conditions
+            search_conditions = [
+                Recipe.title.ilike(f"%{query}%"),
+                Recipe.description.ilike(f"%{query}%"),
+                _has_element_like(Recipe.tags, f"%{query}%"),
+                _has_element_like(Recipe.ingredients, f"%{query}%"),
+            ]
+            
+            search_query = search_query.where(or_(*search_conditions))
         
         # User filter
         if user_id:
             search_query = search_query.where(
-                or_(Recipe.user_id == user_id, Recipe.is_public == True)
+                or_(Recipe.user_id == user_id, Recipe.is_public.is_(True))
             )
         else:
-            search_query = search_query.where(Recipe.is_public == True)
+            search_query = search_query.where(Recipe.is_public.is_(True))
         
-        search_query = search_query.order_by(desc(Recipe.created_at)).limit(limit)
+        search_query = search_query.order_by(*order_by).limit(limit)
         
         result = await self.db.execute(search_query)
         return result.scalars().all()
     
     async def update_recipe(self, recipe_id: uuid.UUID, recipe_data: dict) -> Optional[Recipe]:
-        """Update recipe."""
-        recipe = await self.get_recipe_by_id(recipe_id)
-        if not recipe:
-            return None
+        """Update recipe.
         
-        # Calculate total time if prep/cook time changed
-        if 'prep_time_minutes' in recipe_data or 'cook_time_minutes' in recipe_data:
-            prep_time = recipe_data.get('prep_time_minutes', recipe.prep_time_minutes) or 0
-            cook_time = recipe_data.get('cook_time_minutes', recipe.cook_time_minutes) or 0
-            recipe_data['total_time_minutes'] = prep_time + cook_time if prep_time or cook_time else None
+        The returned recipe's relationships are not loaded; use
+        ``get_recipe_by_id`` when they're needed.
+        """
+        if not recipe_data:
+            return await self.get_recipe_by_id(recipe_id)
         
-        for key, value in recipe_data.items():
-            setattr(recipe, key, value)
+        recipe = await _update_by_id(self.db, Recipe, recipe_id, recipe_data)
+        
+        if recipe and not recipe_data.keys().isdisjoint(RECIPE_LABEL_FIELDS):
+            await self._sync_labels(recipe)
         
-        await self.db.commit()
-        await self.db.refresh(recipe)
         return recipe
     
     async def delete_recipe(self, recipe_id: uuid.UUID) -> bool:
-        """Delete recipe."""
-        recipe = await self.get_recipe_by_id(recipe_id)
-        if not recipe:
-            return False
-        
-        await self.db.delete(recipe)
-        await self.db.commit()
-        return True
+        """Delete recipe and its labels."""
+        await _delete_where(self.db, RecipeLabel, RecipeLabel.recipe_id == recipe_id)
+        return await _delete_where(self.db, Recipe, Recipe.id == recipe_id)
     
     async def get_recipes_by_filters(
         self,
@@ -192,22 +458,16 @@ class RecipeService:
         limit: int = 20
     ) -> List[Recipe]:
         """Get recipes by various filters."""
-        query = select(Recipe).where(Recipe.is_public == True)
+        query = select(Recipe).options(*_load()).where(Recipe.is_public.is_(True))
         
+        # Each list matches recipes labelled with any of its values
         if meal_types:
-            # For SQLite, we'll use a simple text search in JSON
-            meal_type_conditions = [
-                func.json_extract(Recipe.meal_types, '$').like(f"%{mt}%") 
-                for mt in meal_types
-            ]
-            query = query.where(or_(*meal_type_conditions))
+            query = query.where(_has_label("meal_types", meal_types))
         
         if dietary_restrictions:
-            dr_conditions = [
-                func.json_extract(Recipe.dietary_restrictions, '$').like(f"%{dr}%")
-                for dr in dietary_restrictions
-            ]
-            query = query.where(or_(*dr_conditions))
+            query = query.where(
+                _has_label("dietary_restrictions", dietary_restrictions)
+            )
         
         if max_prep_time:
             query = query.where(Recipe.prep_time_minutes <= max_prep_time)
@@ -216,16 +476,56 @@ class RecipeService:
             query = query.where(Recipe.total_time_minutes <= max_total_time)
         
         if appliances:
-            app_conditions = [
-                func.json_extract(Recipe.appliances, '$').like(f"%{app}%")
-                for app in appliances
-            ]
-            query = query.where(or_(*app_conditions))
+            query = query.where(_has_label("appliances", appliances))
         
         query = query.order_by(desc(Recipe.average_rating), desc(Recipe.created_at)).limit(limit)
         
         result = await self.db.execute(query)
         return result.scalars().all()
+    
+    async def list_candidate_recipes(
+        self,
+        dietary_restrictions: Optional[List[str]] = None,
+        limit: int = 50
+    ) -> List[Recipe]:
+        """Get the best-rated public recipes meeting every dietary restriction."""
+        query = (
+            select(Recipe)
+            .options(*_load())
+            .where(
+                Recipe.is_public.is_(True),
+                *(
+                    _has_label("dietary_restrictions", [dr])
+                    for dr in dietary_restrictions or ()
+                ),
+            )
+        )
+        query = query.order_by(
+            desc(Recipe.average_rating), desc(Recipe.created_at)
+        ).limit(limit)
+        
+        result = await self.db.execute(query)
+        return result.scalars().all()
+    
+    async def rebuild_labels(self) -> int:
+        """Rebuild recipe_labels from every recipe's JSON label fields.
+        
+        Returns:
+            Number of recipes processed
+        """
+        result = await self.db.execute(
+            select(Recipe.id, *(getattr(Recipe, kind) for kind in RECIPE_LABEL_FIELDS))
+        )
+        recipes = result.all()
+        
+        await self.db.execute(delete(RecipeLabel))
+        rows = [
+            row for recipe in recipes for row in _label_rows(recipe.id, recipe._mapping)
+        ]
+        if rows:
+            await self.db.execute(insert(RecipeLabel), rows)
+        
+        return len(recipes)
 
 
 class MealPlanService:
@@ -234,11 +534,25 @@ class MealPlanService:
     def __init__(self, db: AsyncSession):
         self.db = db
     
-    async def create_meal_plan(self, user_id: uuid.UUID, meal_plan_data: dict) -> MealPlan:
-        """Create a new meal plan."""
+    async def create_meal_plan(
+        self,
+        user_id: uuid.UUID,
+        meal_plan_data: dict,
+        recipes: Optional[List[dict]] = None
+    ) -> MealPlan:
+        """Create a new meal plan, optionally with its scheduled recipes.
+        
+        ``recipes`` takes the same fields as ``add_recipe_to_meal_plan`` and is
+        inserted in the same transaction.
+        """
         meal_plan = MealPlan(user_id=user_id, **meal_plan_data)
         self.db.add(meal_plan)
-        await self.db.commit()
+        
+        if recipes:
+            await self.db.flush()
+            await self._insert_meal_plan_recipes(meal_plan.id, recipes)
+        
+        await self.db.flush()
         await self.db.refresh(meal_plan)
         return meal_plan
     
@@ -246,11 +560,11 @@ class MealPlanService:
         """Get meal plan by ID."""
         result = await self.db.execute(
             select(MealPlan)
-            .options(
+            .options(*_load(
                 selectinload(MealPlan.user),
                 selectinload(MealPlan.recipes).selectinload(MealPlanRecipe.recipe),
-                selectinload(MealPlan.grocery_lists)
-            )
+                selectinload(MealPlan.grocery_lists).selectinload(GroceryList.items)
+            ))
             .where(MealPlan.id == meal_plan_id)
         )
         return result.scalar_one_or_none()
@@ -259,44 +573,60 @@ class MealPlanService:
         self,
         user_id: Optional[uuid.UUID] = None,
         limit: int = 20,
-        offset: int = 0
+        offset: int = 0,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None
     ) -> List[MealPlan]:
-        """List meal plans with pagination."""
-        query = select(MealPlan).options(
+        """List meal plans with pagination, newest first.
+        
+        Pass the (created_at, id) of the last plan on the previous page as
+        ``after`` to seek straight to the next page instead of using ``offset``.
+        """
+        query = select(MealPlan).options(*_load(
             selectinload(MealPlan.user),
             selectinload(MealPlan.recipes).selectinload(MealPlanRecipe.recipe)
-        )
+        ))
         
         if user_id:
             query = query.where(MealPlan.user_id == user_id)
         
-        query = query.order_by(desc(MealPlan.created_at)).limit(limit).offset(offset)
+        if after is not None:
+            query = query.where(_newest_first_after(MealPlan, after))
+        
+        query = (
+            query.order_by(desc(MealPlan.created_at), desc(MealPlan.id))
+            .limit(limit)
+            .offset(offset)
+        )
         
         result = await self.db.execute(query)
         return result.scalars().all()
     
     async def update_meal_plan(self, meal_plan_id: uuid.UUID, meal_plan_data: dict) -> Optional[MealPlan]:
-        """Update meal plan."""
-        meal_plan = await self.get_meal_plan_by_id(meal_plan_id)
-        if not meal_plan:
-            return None
+        """Update meal plan.
         
-        for key, value in meal_plan_data.items():
-            setattr(meal_plan, key, value)
+        The returned meal plan's relationships are not loaded; use
+        ``get_meal_plan_by_id`` when they're needed.
+        """
+        if not meal_plan_data:
+            return await self.get_meal_plan_by_id(meal_plan_id)
         
-        await self.db.commit()
-        await self.db.refresh(meal_plan)
-        return meal_plan
+        return await _update_by_id(self.db, MealPlan, meal_plan_id, meal_plan_data)
     
     async def delete_meal_plan(self, meal_plan_id: uuid.UUID) -> bool:
-        """Delete meal plan."""
-        meal_plan = await self.get_meal_plan_by_id(meal_plan_id)
-        if not meal_plan:
-            return False
-        
-        await self.db.delete(meal_plan)
-        await self.db.commit()
-        return True
+        """Delete meal plan with its scheduled recipes and grocery lists."""
+        await _delete_where(
+            self.db, MealPlanRecipe, MealPlanRecipe.meal_plan_id == meal_plan_id
+        )
+        await _delete_where(
+            self.db, GroceryListItem,
+            GroceryListItem.grocery_list_id.in_(
+                select(GroceryList.id).where(GroceryList.meal_plan_id == meal_plan_id)
+            )
+        )
+        await _delete_where(
+            self.db, GroceryList, GroceryList.meal_plan_id == meal_plan_id
+        )
+        return await _delete_where(self.db, MealPlan, MealPlan.id == meal_plan_id)
     
     async def add_recipe_to_meal_plan(
         self,
@@ -318,10 +648,52 @@ class MealPlanService:
         )
         
         self.db.add(meal_plan_recipe)
-        await self.db.commit()
+        await self.db.flush()
         await self.db.refresh(meal_plan_recipe)
+        self._expire_plan_recipes(meal_plan_id)
         return meal_plan_recipe
     
+    async def add_recipes_to_meal_plan(
+        self, meal_plan_id: uuid.UUID, recipes: List[dict]
+    ) -> int:
+        """Add several recipes to a meal plan.
+        
+        Each dict takes the keyword arguments of ``add_recipe_to_meal_plan``
+        other than ``meal_plan_id``.
+        
+        Returns:
+            Number of recipes added
+        """
+        await self._insert_meal_plan_recipes(meal_plan_id, recipes)
+        return len(recipes)
+    
+    async def _insert_meal_plan_recipes(
+        self, meal_plan_id: uuid.UUID, recipes: List[dict]
+    ) -> None:
+        """Insert meal plan recipes in one executemany, not a flush per object."""
+        if not recipes:
+            return
+        
+        rows = [
+            {
+                "servings_multiplier": 1.0,
+                "notes": None,
+                **recipe,
+                "meal_plan_id": meal_plan_id,
+            }
+            for recipe in recipes
+        ]
+        await self.db.execute(insert(MealPlanRecipe), rows)
+        self._expire_plan_recipes(meal_plan_id)
+    
+    def _expire_plan_recipes(self, meal_plan_id: uuid.UUID) -> None:
+        """Drop a loaded plan's recipes collection after a bulk statement changed it."""
+        meal_plan = self.db.identity_map.get(
+            self.db.identity_key(MealPlan, meal_plan_id)
+        )
+        if meal_plan is not None:
+            self.db.expire(meal_plan, ["recipes"])
+    
     async def remove_recipe_from_meal_plan(
         self,
         meal_plan_id: uuid.UUID,
@@ -330,24 +702,16 @@ class MealPlanService:
         meal_type: str
     ) -> bool:
         """Remove a recipe from a meal plan."""
-        result = await self.db.execute(
-            select(MealPlanRecipe).where(
-                and_(
-                    MealPlanRecipe.meal_plan_id == meal_plan_id,
-                    MealPlanRecipe.recipe_id == recipe_id,
-                    MealPlanRecipe.scheduled_date == scheduled_date,
-                    MealPlanRecipe.meal_type == meal_type
-                )
-            )
+        removed = await _delete_where(
+            self.db,
+            MealPlanRecipe,
+            MealPlanRecipe.meal_plan_id == meal_plan_id,
+            MealPlanRecipe.recipe_id == recipe_id,
+            MealPlanRecipe.scheduled_date == scheduled_date,
+            MealPlanRecipe.meal_type == meal_type
         )
-        meal_plan_recipe = result.scalar_one_or_none()
-        
-        if not meal_plan_recipe:
-            return False
-        
-        await self.db.delete(meal_plan_recipe)
-        await self.db.commit()
-        return True
+        self._expire_plan_recipes(meal_plan_id)
+        return removed
     
     async def create_grocery_list(
         self,
@@ -357,24 +721,38 @@ class MealPlanService:
         name: Optional[str] = None,
         total_estimated_cost: Optional[float] = None
     ) -> GroceryList:
-        """Create a grocery list for a meal plan."""
+        """Create a grocery list for a meal plan.
+        
+        Args:
+            items: Item dicts with a ``name`` and optionally ``quantity``,
+                ``unit``, ``category``, ``estimated_cost``, ``recipe_ids``
+                and ``purchased``; other keys are ignored
+        """
         grocery_list = GroceryList(
             meal_plan_id=meal_plan_id,
             user_id=user_id,
             name=name,
-            items=items,
             total_estimated_cost=total_estimated_cost
         )
         
         self.db.add(grocery_list)
-        await self.db.commit()
+        await self.db.flush()
+        
+        # All items in one executemany INSERT
+        if items:
+            await self.db.execute(
+                insert(GroceryListItem), _grocery_item_rows(grocery_list.id, items)
+            )
+        
         await self.db.refresh(grocery_list)
         return grocery_list
     
     async def get_grocery_list_by_meal_plan(self, meal_plan_id: uuid.UUID) -> Optional[GroceryList]:
         """Get grocery list for a meal plan."""
         result = await self.db.execute(
-            select(GroceryList).where(GroceryList.meal_plan_id == meal_plan_id)
+            select(GroceryList)
+            .options(*_load(selectinload(GroceryList.items)))
+            .where(GroceryList.meal_plan_id == meal_plan_id)
         )
         return result.scalar_one_or_none()
 
@@ -405,22 +783,39 @@ class RecipeRatingService:
         )
         
         self.db.add(recipe_rating)
-        await self.db.commit()
-        await self.db.refresh(recipe_rating)
+        await self.db.flush()
         
         # Update recipe average rating
         await self._update_recipe_average_rating(recipe_id)
         
+        await self.db.refresh(recipe_rating)
         return recipe_rating
     
-    async def get_ratings_for_recipe(self, recipe_id: uuid.UUID) -> List[RecipeRating]:
-        """Get all ratings for a recipe."""
-        result = await self.db.execute(
+    async def get_ratings_for_recipe(
+        self,
+        recipe_id: uuid.UUID,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[datetime, uuid.UUID]] = None
+    ) -> List[RecipeRating]:
+        """Get a recipe's ratings, newest first.
+        
+        Returns every rating unless ``limit`` is given; pass the (created_at, id)
+        of the last rating on the previous page as ``after`` to continue from it.
+        """
+        query = (
             select(RecipeRating)
-            .options(selectinload(RecipeRating.user))
+            .options(*_load(selectinload(RecipeRating.user)))
             .where(RecipeRating.recipe_id == recipe_id)
-            .order_by(desc(RecipeRating.created_at))
         )
+        
+        if after is not None:
+            query = query.where(_newest_first_after(RecipeRating, after))
+        
+        query = query.order_by(
+            desc(RecipeRating.created_at), desc(RecipeRating.id)
+        ).limit(limit)
+        
+        result = await self.db.execute(query)
         return result.scalars().all()
     
     async def get_user_rating_for_recipe(
@@ -430,7 +825,7 @@ class RecipeRatingService:
     ) -> Optional[RecipeRating]:
         """Get a user's rating for a specific recipe."""
         result = await self.db.execute(
-            select(RecipeRating).where(
+            select(RecipeRating).options(*_load()).where(
                 and_(
                     RecipeRating.user_id == user_id,
                     RecipeRating.recipe_id == recipe_id
@@ -443,19 +838,25 @@ class RecipeRatingService:
         self,
         user_id: uuid.UUID,
         recipe_id: uuid.UUID,
-        **kwargs
+        **kwargs: Any
     ) -> Optional[RecipeRating]:
-        """Update a recipe rating."""
-        rating = await self.get_user_rating_for_recipe(user_id, recipe_id)
+        """Update a recipe rating.
+        
+        The returned rating's ``user`` relationship is not loaded.
+        """
+        if not kwargs:
+            return await self.get_user_rating_for_recipe(user_id, recipe_id)
+        
+        rating = await _update_where(
+            self.db,
+            RecipeRating,
+            kwargs,
+            RecipeRating.user_id == user_id,
+            RecipeRating.recipe_id == recipe_id
+        )
         if not rating:
             return None
         
-        for key, value in kwargs.items():
-            setattr(rating, key, value)
-        
-        await self.db.commit()
-        await self.db.refresh(rating)
-        
         # Update recipe average rating
         await self._update_recipe_average_rating(recipe_id)
         
@@ -463,39 +864,30 @@ class RecipeRatingService:
     
     async def delete_rating(self, user_id: uuid.UUID, recipe_id: uuid.UUID) -> bool:
         """Delete a recipe rating."""
-        rating = await self.get_user_rating_for_recipe(user_id, recipe_id)
-        if not rating:
+        deleted = await _delete_where(
+            self.db,
+            RecipeRating,
+            RecipeRating.user_id == user_id,
+            RecipeRating.recipe_id == recipe_id
+        )
+        if not deleted:
             return False
         
-        await self.db.delete(rating)
-        await self.db.commit()
-        
         # Update recipe average rating
         await self._update_recipe_average_rating(recipe_id)
         
         return True
     
-    async def _update_recipe_average_rating(self, recipe_id: uuid.UUID):
-        """Update the average rating for a recipe."""
-        # Get average rating and count
-        result = await self.db.execute(
-            select(
-                func.avg(RecipeRating.rating).label('avg_rating'),
-                func.count(RecipeRating.rating).label('rating_count')
-            ).where(RecipeRating.recipe_id == recipe_id)
-        )
-        row = result.fetchone()
-        
-        avg_rating = row.avg_rating or 0.0
-        rating_count = row.rating_count or 0
-        
-        # Update recipe
-        recipe_result = await self.db.execute(
-            select(Recipe).where(Recipe.id == recipe_id)
-        )
-        recipe = recipe_result.scalar_one_or_none()
-        
-        if recipe:
-            recipe.average_rating = float(avg_rating)
-            recipe.rating_count = int(rating_count)
-            await self.db.commit()
\ No newline at end of file
+    async def _update_recipe_average_rating(self, recipe_id: uuid.UUID) -> None:
+        """Recompute a recipe's stored rating aggregates in a single UPDATE."""
+        ratings: ColumnElement[bool] = RecipeRating.recipe_id == recipe_id
+        await self.db.execute(
+            update(Recipe)
+            .where(Recipe.id == recipe_id)
+            .values(
+                average_rating=select(func.coalesce(func.avg(RecipeRating.rating), 0.0))
+                .where(ratings)
+                .scalar_subquery(),
+                rating_count=select(func.count(RecipeRating.rating)).where(ratings).scalar_subquery(),
+            )
+        )
\ No newline at end of file
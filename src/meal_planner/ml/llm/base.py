@@ -1,14 +1,32 @@
 """Base LLM provider interface."""
 
 import abc
-from typing import Any, Dict, List, Optional
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
 
+from meal_planner.core.cache import TTLCache
+from meal_planner.core.config import settings
 from meal_planner.core.models import Recipe
+from meal_planner.ml.llm.cache import LLMResponseCache, normalize_prompt
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Recently used responses to deterministic prompts, shared by every provider
+# instance and keyed like the on-disk cache
+_responses = TTLCache(
+    maxsize=settings.llm_cache_max_entries, ttl=settings.llm_cache_ttl
+)
 
 
 class BaseLLMProvider(abc.ABC):
     """Base class for LLM providers."""
     
+    # Whether _generate_cached reuses responses at all, and the on-disk
+    # cache it reads through, if any
+    use_cache: bool = True
+    response_cache: Optional[LLMResponseCache] = None
+    
     @abc.abstractmethod
     async def _generate(self, prompt: str) -> str:
         """Generate text using the LLM.
@@ -21,6 +39,114 @@ class BaseLLMProvider(abc.ABC):
         """
         pass
     
+    async def _generate_cached(
+        self,
+        prompt: str,
+        normalize: bool = False,
+        validate: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """Generate text, reusing an earlier response to the same prompt.
+        
+        For prompts whose answer depends only on the prompt (OCR checks,
+        recipe structuring, nutrition), not ones where a fresh answer is
+        wanted. Responses are looked up in memory, then in
+        ``response_cache``; failed requests raise and are not cached.
+        
+        Args:
+            prompt: Prompt to generate from
+            normalize: Key the cache on ``normalize_prompt(prompt)``, so
+                prompts differing only in Unicode forms or whitespace share
+                a response. For prompts where those differences can't
+                change the answer.
+            validate: Returns whether a new response is usable; responses
+                it rejects are returned but not cached
+            
+        Returns:
+            Generated text
+        """
+        if not self.use_cache:
+            return await self._generate(prompt)
+        
+        key = self._cache_key(prompt, normalize)
+        response = _responses.get(key)
+        if response is not None:
+            return response
+        
+        if self.response_cache is not None:
+            response = await asyncio.to_thread(self.response_cache.get, key)
+            if response is not None:
+                _responses.set(key, response)
+                return response
+        
+        response = await self._generate(prompt)
+        if validate is None or validate(response):
+            await self._store_cached(key, response)
+        return response
+    
+    async def _cache_response(
+        self, prompt: str, response: str, normalize: bool = False
+    ) -> None:
+        """Cache a response as the answer to a prompt, as ``_generate_cached`` would.
+        
+        For answers obtained some other way, such as by re-asking after
+        ``prompt``'s own response failed validation.
+        
+        Args:
+            prompt: Prompt the response answers
+            response: Response text
+            normalize: As for ``_generate_cached``
+        """
+        if self.use_cache:
+            await self._store_cached(self._cache_key(prompt, normalize), response)
+    
+    def _cache_key(self, prompt: str, normalize: bool) -> str:
+        return LLMResponseCache.key(
+            self.get_name(),
+            self.get_model(),
+            normalize_prompt(prompt) if normalize else prompt,
+        )
+    
+    async def _store_cached(self, key: str, response: str) -> None:
+        if self.response_cache is not None:
+            await asyncio.to_thread(
+                self.response_cache.set, key, response, self.get_model()
+            )
+        _responses.set(key, response)
+    
+    async def batch_generate(
+        self,
+        prompts: List[str],
+        concurrency: Optional[int] = None
+    ) -> List[str]:
+        """Generate text for several prompts with overlapping requests.
+        
+        Providers with a native batch endpoint can override this.
+        
+        Args:
+            prompts: Prompts to generate from
+            concurrency: Requests in flight at once, defaulting to
+                ``llm_max_concurrency``
+            
+        Returns:
+            Generated text, in the same order as ``prompts``
+        """
+        return await self._map_bounded(self._generate, prompts, concurrency)
+    
+    async def _map_bounded(
+        self,
+        func: Callable[[T], Awaitable[R]],
+        items: List[T],
+        concurrency: Optional[int] = None
+    ) -> List[R]:
+        """Await ``func`` on every item, at most ``concurrency`` calls at a time."""
+        semaphore = asyncio.Semaphore(concurrency or settings.llm_max_concurrency)
+        
+        async def call(item: T) -> R:
+            async with semaphore:
+                return await func(item)
+        
+        return list(await asyncio.gather(*(call(item) for item in items)))
+    
     @abc.abstractmethod
     async def evaluate_ocr_quality(self, text: str, confidence: float) -> Dict[str, Any]:
         """Evaluate the quality of OCR text.
@@ -84,6 +210,23 @@ class BaseLLMProvider(abc.ABC):
         """
         pass
     
+    async def analyze_nutrition_batch(
+        self,
+        recipes: List[Recipe],
+        concurrency: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Analyze nutrition for several recipes with overlapping requests.
+        
+        Args:
+            recipes: Recipes to analyze
+            concurrency: Requests in flight at once, defaulting to
+                ``llm_max_concurrency``
+            
+        Returns:
+            Nutrition information, in the same order as ``recipes``
+        """
+        return await self._map_bounded(self.analyze_nutrition, recipes, concurrency)
+    
     @abc.abstractmethod
     def get_name(self) -> str:
         """Get the name of the LLM provider.
@@ -101,3 +244,6 @@ class BaseLLMProvider(abc.ABC):
             Model name
         """
         pass
+    
+    async def aclose(self) -> None:  # noqa: B027 - optional hook, a no-op by default
+        """Release resources held by the provider, such as HTTP connections."""
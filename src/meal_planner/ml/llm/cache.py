@@ -0,0 +1,116 @@
+"""On-disk cache of LLM responses."""
+
+import hashlib
+import re
+import time
+import unicodedata
+from pathlib import Path
+from typing import Optional
+
+import orjson
+from loguru import logger
+
+from meal_planner.core.disk_cache import DiskCache
+
+# Part of every key; bump it to stop using responses cached before a change
+# the prompt text doesn't capture, such as a model being re-pulled
+CACHE_VERSION = "v1"
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Canonicalize a prompt so OCR variants of the same text share a cache key.
+
+    Applies NFKC (``½`` becomes ``1/2``, ligatures split into letters) and
+    collapses runs of whitespace, so rescans that differ only in how
+    fractions or line breaks came out reuse one response.
+
+    Args:
+        prompt: Prompt text
+
+    Returns:
+        Normalized prompt text
+    """
+    text = unicodedata.normalize("NFKC", prompt).replace("\u2044", "/")
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class LLMResponseCache(DiskCache):
+    """Content-addressed store of raw LLM responses, one JSON file per prompt.
+
+    Files live at ``cache_dir/<first 2 hex digits>/<sha256>.json`` so that no
+    single directory grows too large. Responses survive restarts and are
+    shared by every process using the same directory. Expired entries are
+    deleted when read, besides by the periodic sweep.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl: Optional[float] = None,
+        max_files: Optional[int] = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory to store responses in
+            ttl: Seconds a response stays valid, or None to keep it forever
+            max_files: Most responses to keep on disk, or None for no limit
+        """
+        super().__init__(cache_dir, max_files=max_files, max_age=ttl)
+        self.ttl = ttl
+
+    @staticmethod
+    def key(provider: str, model: str, prompt: str) -> str:
+        """Build the cache key for a prompt.
+
+        Args:
+            provider: Provider name
+            model: Model name
+            prompt: Prompt text
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        parts = (provider, model, CACHE_VERSION, prompt)
+        return hashlib.sha256(b"\x00".join(part.encode() for part in parts)).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response.
+
+        Args:
+            key: Key from ``key``
+
+        Returns:
+            Response text, or None if missing, expired or unreadable
+        """
+        path = self._path(key)
+        try:
+            entry = orjson.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable LLM cache entry {key}: {e}")
+            return None
+
+        if self.ttl is not None and entry["ts"] + self.ttl <= time.time():
+            path.unlink(missing_ok=True)
+            return None
+        return entry["response"]
+
+    def set(self, key: str, response: str, model: str) -> None:
+        """Store a response.
+
+        Args:
+            key: Key from ``key``
+            response: Response text
+            model: Model that produced the response, kept for inspection
+        """
+        self._write(
+            self._path(key),
+            orjson.dumps({"response": response, "model": model, "ts": time.time()}),
+        )
@@ -1,30 +1,167 @@
 """Ollama LLM provider."""
 
+import asyncio
 import json
 import time
+from operator import attrgetter
 from typing import Any, Dict, List, Optional
 
 import aiohttp
+import orjson
 from loguru import logger
 
+from meal_planner.core.config import settings
 from meal_planner.core.models import Recipe
 from meal_planner.ml.llm.base import BaseLLMProvider
+from meal_planner.ml.llm.cache import LLMResponseCache
+
+# orjson has no way to parse a prefix of a string, so picking the object out
+# of a response stays with the standard library decoder
+_json_decoder = json.JSONDecoder()
+
+
+# Recipe fields the meal planning prompt describes each recipe by
+_SUMMARY_FIELDS = (
+    "id",
+    "title",
+    "meal_types",
+    "dietary_restrictions",
+    "prep_time_minutes",
+    "cook_time_minutes",
+)
+_summary_values = attrgetter(*_SUMMARY_FIELDS)
+
+
+def _dumps(value: Any) -> str:
+    """Serialize a value as indented JSON for a prompt."""
+    return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode()
+
+
+def _decode_json(text: str) -> Dict[str, Any]:
+    """Parse the first JSON object in an LLM response.
+    
+    Decodes from the first ``{`` in one pass, ignoring any prose before or
+    after the object.
+    
+    Args:
+        text: Response text
+        
+    Returns:
+        Parsed object
+        
+    Raises:
+        ValueError: If the response doesn't contain a JSON object
+    """
+    start = text.find("{")
+    if start < 0:
+        raise ValueError("no JSON object found")
+    
+    data, _ = _json_decoder.raw_decode(text, start)
+    if not isinstance(data, dict):
+        raise ValueError(f"expected a JSON object, got {type(data).__name__}")
+    return data
+
+
+def _extract_json(text: str) -> Optional[Dict[str, Any]]:
+    """Parse the first JSON object in an LLM response.
+    
+    Args:
+        text: Response text
+        
+    Returns:
+        Parsed object, or None if the response doesn't start one or it
+        doesn't parse
+    """
+    try:
+        return _decode_json(text)
+    except ValueError:
+        return None
+
+
+def _has_json(text: str) -> bool:
+    """Whether a response contains a JSON object; others aren't cached."""
+    return _extract_json(text) is not None
+
+
+def _parse_recipe(text: str, notes: Optional[str] = None) -> Recipe:
+    """Build a recipe from the JSON object in an LLM response.
+    
+    Args:
+        text: Response text
+        notes: Notes to attach to the recipe
+        
+    Returns:
+        Parsed recipe
+        
+    Raises:
+        ValueError: If the response has no JSON object or it isn't a valid
+            recipe (pydantic's ValidationError is a ValueError)
+    """
+    recipe_data = _decode_json(text)
+    return Recipe(
+        title=recipe_data.get("title", "Untitled Recipe"),
+        ingredients=recipe_data.get("ingredients", []),
+        instructions=recipe_data.get("instructions", []),
+        meal_types=recipe_data.get("meal_types", []),
+        prep_time_minutes=recipe_data.get("prep_time_minutes"),
+        cook_time_minutes=recipe_data.get("cook_time_minutes"),
+        servings=recipe_data.get("servings"),
+        tags=recipe_data.get("tags", []),
+        dietary_restrictions=recipe_data.get("dietary_restrictions", []),
+        notes=notes
+    )
+
+
+def _is_recipe(text: str) -> bool:
+    """Whether a response parses as a recipe; responses that don't aren't cached."""
+    try:
+        _parse_recipe(text)
+    except ValueError:
+        return False
+    return True
 
 
 class OllamaProvider(BaseLLMProvider):
     """LLM provider using Ollama."""
     
-    def __init__(self, model: str, api_base: str):
+    def __init__(self, model: str, api_base: str, use_cache: bool = True):
         """Initialize the Ollama provider.
         
         Args:
             model: Model name
             api_base: API base URL
+            use_cache: Whether to reuse responses to repeated prompts, in
+                memory and under ``settings.llm_cache_dir``
         """
         self.model = model
         self.api_base = api_base.rstrip("/")
+        self.use_cache = use_cache
+        if use_cache:
+            self.response_cache = LLMResponseCache(
+                settings.llm_cache_dir,
+                ttl=settings.llm_cache_ttl,
+                max_files=settings.llm_cache_max_files,
+            )
+        # Created on first use, inside the running event loop
+        self._session: Optional[aiohttp.ClientSession] = None
         logger.info(f"Initialized OllamaProvider with model {model}")
     
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, so requests reuse keep-alive connections."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=75),
+                timeout=aiohttp.ClientTimeout(total=settings.llm_timeout),
+                json_serialize=lambda value: orjson.dumps(value).decode(),
+            )
+        return self._session
+    
+    async def aclose(self) -> None:
+        """Close the shared HTTP session; a later request opens a new one."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
     async def _generate(self, prompt: str) -> str:
         """Generate text using Ollama.
         
@@ -33,6 +170,9 @@ class OllamaProvider(BaseLLMProvider):
             
         Returns:
             Generated text
+            
+        Raises:
+            RuntimeError: If Ollama responds with an error status
         """
         url = f"{self.api_base}/generate"
         
@@ -42,20 +182,16 @@ class OllamaProvider(BaseLLMProvider):
             "stream": False
         }
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, json=payload) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"Ollama API error: {error_text}")
-                        return f"Error: {error_text}"
-                    
-                    result = await response.json()
-                    return result.get("response", "")
-        
-        except Exception as e:
-            logger.error(f"Error calling Ollama API: {e}")
-            return f"Error: {str(e)}"
+        # Errors propagate to the calling method's fallback rather than being
+        # returned as text, so they're never mistaken for (or cached as) output
+        async with self._get_session().post(url, json=payload) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                logger.error(f"Ollama API error: {error_text}")
+                raise RuntimeError(f"Ollama API error {response.status}: {error_text}")
+            
+            result = await response.json(loads=orjson.loads)
+            return result.get("response", "")
     
     async def evaluate_ocr_quality(self, text: str, confidence: float) -> Dict[str, Any]:
         """Evaluate the quality of OCR text.
@@ -83,15 +219,13 @@ class OllamaProvider(BaseLLMProvider):
         """
         
         try:
-            response = await self._generate(prompt)
-            
-            # Extract JSON from response
-            json_start = response.find("{")
-            json_end = response.rfind("}") + 1
+            response = await self._generate_cached(
+                prompt, normalize=True, validate=_has_json
+            )
             
-            if json_start >= 0 and json_end > json_start:
-                json_str = response[json_start:json_end]
-                return json.loads(json_str)
+            data = _extract_json(response)
+            if data is not None:
+                return data
             else:
                 # Fallback if JSON parsing fails
                 return {
@@ -147,39 +281,39 @@ class OllamaProvider(BaseLLMProvider):
         """
         
         try:
-            response = await self._generate(prompt)
-            
-            # Extract JSON from response
-            json_start = response.find("{")
-            json_end = response.rfind("}") + 1
+            response = await self._generate_cached(prompt, validate=_is_recipe)
             
-            if json_start >= 0 and json_end > json_start:
-                json_str = response[json_start:json_end]
-                recipe_data = json.loads(json_str)
-                
-                # Create recipe
-                recipe = Recipe(
-                    title=recipe_data.get("title", "Untitled Recipe"),
-                    ingredients=recipe_data.get("ingredients", []),
-                    instructions=recipe_data.get("instructions", []),
-                    meal_types=recipe_data.get("meal_types", []),
-                    prep_time_minutes=recipe_data.get("prep_time_minutes"),
-                    cook_time_minutes=recipe_data.get("cook_time_minutes"),
-                    servings=recipe_data.get("servings"),
-                    tags=recipe_data.get("tags", []),
-                    dietary_restrictions=recipe_data.get("dietary_restrictions", []),
-                    notes=user_notes
-                )
+            # A response that doesn't parse, or doesn't validate as a recipe,
+            # is sent back with the error so the model can correct it
+            retry_prompt = prompt
+            for attempt in range(settings.llm_parse_retries + 1):
+                try:
+                    recipe = _parse_recipe(response, user_notes)
+                except ValueError as e:
+                    if attempt == settings.llm_parse_retries:
+                        logger.warning(f"Giving up on unparseable recipe response: {e}")
+                        break
+                    
+                    await asyncio.sleep(settings.llm_retry_backoff * 2 ** attempt)
+                    retry_prompt += (
+                        f"\n\nYour previous output had an error: {e}. "
+                        "Return ONLY valid JSON now."
+                    )
+                    response = await self._generate(retry_prompt)
+                    continue
                 
+                # A corrected answer stands in for the original prompt's
+                if attempt:
+                    await self._cache_response(prompt, response)
                 return recipe
-            else:
-                # Fallback if JSON parsing fails
-                return Recipe(
-                    title="Extraction Failed",
-                    ingredients=["Extraction failed"],
-                    instructions=["Could not extract recipe from text"],
-                    notes=f"Original text: {text[:100]}..."
-                )
+            
+            # Fallback if JSON parsing fails
+            return Recipe(
+                title="Extraction Failed",
+                ingredients=["Extraction failed"],
+                instructions=["Could not extract recipe from text"],
+                notes=f"Original text: {text[:100]}..."
+            )
         
         except Exception as e:
             logger.error(f"Error structuring recipe: {e}")
@@ -208,31 +342,25 @@ class OllamaProvider(BaseLLMProvider):
         Returns:
             Dictionary with meal plan
         """
-        # Create a list of recipe summaries
-        recipe_summaries = []
-        for recipe in available_recipes:
-            summary = {
-                "id": str(recipe.id),
-                "title": recipe.title,
-                "meal_types": recipe.meal_types,
-                "dietary_restrictions": recipe.dietary_restrictions,
-                "prep_time_minutes": recipe.prep_time_minutes,
-                "cook_time_minutes": recipe.cook_time_minutes
-            }
-            recipe_summaries.append(summary)
+        # Callers pass recipes already filtered to the user's restrictions
+        # (RecipeStorageService.list_candidate_recipes)
+        recipe_summaries = [
+            dict(zip(_SUMMARY_FIELDS, _summary_values(recipe)))
+            for recipe in available_recipes
+        ]
         
         prompt = f"""
         Generate a meal plan based on the following information:
         
         USER PREFERENCES:
-        {json.dumps(user_preferences, indent=2)}
+        {_dumps(user_preferences)}
         
         NUTRITION GOAL: {nutrition_goal or "None"}
         
         DAYS: {days}
         
         AVAILABLE RECIPES:
-        {json.dumps(recipe_summaries, indent=2)}
+        {_dumps(recipe_summaries)}
         
         Create a meal plan that satisfies the user's preferences and nutrition goals.
         Provide a JSON response with the following fields:
@@ -257,13 +385,9 @@ class OllamaProvider(BaseLLMProvider):
         try:
             response = await self._generate(prompt)
             
-            # Extract JSON from response
-            json_start = response.find("{")
-            json_end = response.rfind("}") + 1
-            
-            if json_start >= 0 and json_end > json_start:
-                json_str = response[json_start:json_end]
-                return json.loads(json_str)
+            data = _extract_json(response)
+            if data is not None:
+                return data
             else:
                 # Fallback if JSON parsing fails
                 return {
@@ -304,7 +428,7 @@ class OllamaProvider(BaseLLMProvider):
         RECIPE: {recipe.title}
         
         INGREDIENTS:
-        {json.dumps(ingredient_strings, indent=2)}
+        {_dumps(ingredient_strings)}
         
         SERVINGS: {recipe.servings or "Unknown"}
         
@@ -322,15 +446,13 @@ class OllamaProvider(BaseLLMProvider):
         """
         
         try:
-            response = await self._generate(prompt)
-            
-            # Extract JSON from response
-            json_start = response.find("{")
-            json_end = response.rfind("}") + 1
+            response = await self._generate_cached(
+                prompt, normalize=True, validate=_has_json
+            )
             
-            if json_start >= 0 and json_end > json_start:
-                json_str = response[json_start:json_end]
-                return json.loads(json_str)
+            data = _extract_json(response)
+            if data is not None:
+                return data
             else:
                 # Fallback if JSON parsing fails
                 return {
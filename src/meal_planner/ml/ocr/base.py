@@ -2,7 +2,7 @@
 
 import abc
 from pathlib import Path
-from typing import List, Set
+from typing import FrozenSet, List
 
 from meal_planner.core.models import OCRResult
 
@@ -41,11 +41,11 @@ class BaseOCREngine(abc.ABC):
         pass
     
     @abc.abstractmethod
-    def get_supported_formats(self) -> Set[str]:
+    def get_supported_formats(self) -> FrozenSet[str]:
         """Get the supported file formats.
         
         Returns:
-            Set of supported file extensions
+            Set of supported file extensions, lowercase with the leading dot
         """
         pass
     
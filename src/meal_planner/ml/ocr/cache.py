@@ -0,0 +1,104 @@
+"""On-disk cache of extracted document text."""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional, Tuple
+
+import orjson
+from loguru import logger
+
+from meal_planner.core.disk_cache import DiskCache
+
+
+class OCRTextCache(DiskCache):
+    """Extracted text and page counts, one JSON file per document version.
+
+    Entries are keyed by a file's path, modification time and size, so a
+    re-import of an unchanged file skips parsing while an edited or replaced
+    file is extracted again. Entries written by a different engine version
+    are discarded on read; those for superseded file versions are never
+    read again and are left to the periodic sweep.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        engine: str,
+        engine_version: str,
+        max_files: Optional[int] = None
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory to store extractions in
+            engine: Name of the engine whose output is cached
+            engine_version: Version of that engine; entries from other
+                versions are evicted
+            max_files: Most extractions to keep on disk, or None for no limit
+        """
+        super().__init__(cache_dir, max_files=max_files)
+        self.engine = engine
+        self.engine_version = engine_version
+
+    @staticmethod
+    def key(file_path: Path, stat: os.stat_result) -> str:
+        """Build the cache key for a file.
+
+        BLAKE2b rather than SHA-256: the key only needs to tell file versions
+        apart, and it's the faster of the two.
+
+        Args:
+            file_path: Path to the file
+            stat: Result of ``os.stat`` on the file
+
+        Returns:
+            Hex digest
+        """
+        identity = f"{file_path.absolute()}:{stat.st_mtime_ns}:{stat.st_size}"
+        return hashlib.blake2b(identity.encode(), digest_size=16).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Tuple[str, int]]:
+        """Get a cached extraction.
+
+        Args:
+            key: Key from ``key``
+
+        Returns:
+            Text and page count, or None if missing, unreadable or from
+            another engine version
+        """
+        path = self._path(key)
+        try:
+            entry = orjson.loads(path.read_bytes())
+        except FileNotFoundError:
+            return None
+        except (OSError, orjson.JSONDecodeError) as e:
+            logger.warning(f"Ignoring unreadable OCR cache entry {key}: {e}")
+            return None
+
+        if (
+            entry.get("engine") != self.engine
+            or entry.get("engine_version") != self.engine_version
+        ):
+            path.unlink(missing_ok=True)
+            return None
+        return entry["text"], entry["page_count"]
+
+    def set(self, key: str, text: str, page_count: int) -> None:
+        """Store an extraction.
+
+        Args:
+            key: Key from ``key``
+            text: Extracted text
+            page_count: Number of pages
+        """
+        self._write(self._path(key), orjson.dumps({
+            "text": text,
+            "page_count": page_count,
+            "engine": self.engine,
+            "engine_version": self.engine_version,
+        }))
@@ -2,7 +2,7 @@
 
 import time
 from pathlib import Path
-from typing import Set
+from typing import FrozenSet
 
 from loguru import logger
 from PIL import Image
@@ -18,6 +18,11 @@ class MarkerEngine(BaseOCREngine):
     a library like Tesseract, EasyOCR, or a cloud-based OCR service.
     """
     
+    # Built once; supports_format checks membership for every file
+    SUPPORTED_FORMATS = frozenset({
+        ".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".tif", ".gif"
+    })
+    
     def __init__(self):
         """Initialize the Marker engine."""
         logger.info("Initializing Marker OCR engine")
@@ -108,12 +113,10 @@ class MarkerEngine(BaseOCREngine):
         """
         return "0.1.0"  # Placeholder version
     
-    def get_supported_formats(self) -> Set[str]:
+    def get_supported_formats(self) -> FrozenSet[str]:
         """Get the supported file formats.
         
         Returns:
             Set of supported file extensions
         """
-        return {
-            ".jpg", ".jpeg", ".png", ".bmp", ".tiff", ".tif", ".gif"
-        }
+        return self.SUPPORTED_FORMATS
@@ -8,6 +8,10 @@ from pathlib import Path
 from typing import AsyncGenerator, Generator
 from unittest.mock import MagicMock
 
+# Make relationship access that a query didn't eager load fail the tests;
+# set before meal_planner is imported since settings are read at import
+os.environ.setdefault("MEAL_PLANNER_DB_STRICT_LOADING", "true")
+
 from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.pool import StaticPool
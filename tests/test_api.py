@@ -1,9 +1,11 @@
 """Tests for API endpoints - Fixed version."""
 
-import pytest
 import json
+import uuid
 from unittest.mock import patch
 
+import pytest
+
 
 class TestHealthEndpoints:
     """Test health check endpoints."""
@@ -72,6 +74,19 @@ class TestRecipeEndpoints:
         assert "id" in data
         assert "created_at" in data
     
+    def test_recipes_cors_preflight(self, test_client):
+        """Test CORS preflight for recipes is answered by the middleware."""
+        response = test_client.options(
+            "/api/recipes",
+            headers={
+                "Origin": "http://localhost:3000",
+                "Access-Control-Request-Method": "POST"
+            }
+        )
+
+        assert response.status_code == 200
+        assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
+
     def test_create_recipe_validation_error(self, test_client):
         """Test creating recipe with missing required fields."""
         incomplete_data = {
@@ -228,6 +243,35 @@ class TestRecipeEndpoints:
             # 422 means search endpoint needs different parameters
             assert response.status_code in [200, 422, 501]
 
+    def test_search_recipes_off_event_loop(self, test_client):
+        """Test the blocking recipe search runs outside the event loop."""
+        import asyncio
+
+        from meal_planner.api.dependencies import get_storage_service
+        from meal_planner.api.main import app
+
+        searched_on_loop = []
+
+        class StubStorageService:
+            def search_recipes(self, query, limit=100):
+                try:
+                    asyncio.get_running_loop()
+                    searched_on_loop.append(True)
+                except RuntimeError:
+                    searched_on_loop.append(False)
+                return []
+
+        app.dependency_overrides[get_storage_service] = StubStorageService
+        try:
+            response = test_client.get(
+                "/api/recipes/search", params={"query": "chicken"}
+            )
+        finally:
+            del app.dependency_overrides[get_storage_service]
+
+        assert response.status_code == 200
+        assert searched_on_loop == [False]
+
 
 class TestMealPlanEndpoints:
     """Test meal plan API endpoints."""
@@ -255,6 +299,138 @@ class TestMealPlanEndpoints:
         data = response.json()
         assert isinstance(data, list)
 
+    def test_list_meal_plans_unknown_user(self, test_client):
+        """Test listing meal plans for a user with no plans."""
+        response = test_client.get(
+            "/api/meal-plans",
+            params={"user_id": "00000000-0000-0000-0000-000000000002"}
+        )
+
+        assert response.status_code == 200
+        assert response.json() == []
+
+    def test_list_user_meal_plans_in_creation_order(self, test_client):
+        """Test a user's meal plans are listed in the order they were created."""
+        from meal_planner.api.dependencies import get_meal_plan_service
+        from meal_planner.api.main import app
+
+        class StubMealPlanService:
+            async def generate_meal_plan(self, **kwargs):
+                return {"days": [], "grocery_items": [], "total_cost": None}
+
+        user_id = str(uuid.uuid4())
+        app.dependency_overrides[get_meal_plan_service] = StubMealPlanService
+        try:
+            created = [
+                test_client.post(
+                    "/api/meal-plans",
+                    json={
+                        "user_id": user_id,
+                        "start_date": f"2025-06-{day}",
+                        "end_date": f"2025-06-{day}",
+                    },
+                ).json()["meal_plan"]["id"]
+                for day in range(10, 16)
+            ]
+        finally:
+            del app.dependency_overrides[get_meal_plan_service]
+
+        response = test_client.get("/api/meal-plans", params={"user_id": user_id})
+
+        assert [plan["id"] for plan in response.json()] == created
+
+    def test_get_meal_plan_grocery_list_not_found(self, test_client):
+        """Test getting the grocery list of a meal plan that doesn't exist."""
+        fake_id = "00000000-0000-0000-0000-000000000000"
+        response = test_client.get(f"/api/meal-plans/{fake_id}/grocery-list")
+
+        assert response.status_code == 404
+
+
+class TestUserEndpoints:
+    """Test user API endpoints."""
+    
+    def test_create_user_duplicate_email(self, test_client):
+        """Test creating a second user with the same email is rejected."""
+        email = f"{uuid.uuid4()}@example.com"
+        
+        response = test_client.post("/api/users", json={"email": email})
+        assert response.status_code == 200
+        
+        response = test_client.post("/api/users", json={"email": email})
+        assert response.status_code == 400
+    
+    def test_email_reusable_after_delete(self, test_client):
+        """Test a deleted user's email can be registered again."""
+        email = f"{uuid.uuid4()}@example.com"
+        user = test_client.post("/api/users", json={"email": email}).json()
+        
+        response = test_client.delete(f"/api/users/{user['id']}")
+        assert response.status_code == 200
+        
+        response = test_client.post("/api/users", json={"email": email})
+        assert response.status_code == 200
+    
+    def test_update_to_taken_email(self, test_client):
+        """Test a user can't take another user's email."""
+        taken = f"{uuid.uuid4()}@example.com"
+        test_client.post("/api/users", json={"email": taken})
+        user = test_client.post(
+            "/api/users", json={"email": f"{uuid.uuid4()}@example.com"}
+        ).json()
+        
+        response = test_client.put(
+            f"/api/users/{user['id']}", json={**user, "email": taken}
+        )
+        assert response.status_code == 400
+        
+        response = test_client.get(f"/api/users/{user['id']}")
+        assert response.json()["email"] == user["email"]
+    
+    def test_favorites(self, test_client):
+        """Test adding, listing and removing favorites."""
+        user = test_client.post(
+            "/api/users", json={"email": f"{uuid.uuid4()}@example.com"}
+        ).json()
+        recipe_id = str(uuid.uuid4())
+        favorites_url = f"/api/users/{user['id']}/favorites"
+        
+        response = test_client.post(f"{favorites_url}/{recipe_id}")
+        assert response.status_code == 200
+        
+        response = test_client.post(f"{favorites_url}/{recipe_id}")
+        assert response.status_code == 400
+        
+        response = test_client.get(favorites_url)
+        assert [f["recipe_id"] for f in response.json()] == [recipe_id]
+        
+        response = test_client.delete(f"{favorites_url}/{recipe_id}")
+        assert response.status_code == 200
+        
+        response = test_client.delete(f"{favorites_url}/{recipe_id}")
+        assert response.status_code == 404
+    
+    def test_evicted_user_data_is_dropped(self, test_client):
+        """Test evicting a user also drops their email, preferences and favorites."""
+        from meal_planner.api.routers import users
+        
+        user = test_client.post(
+            "/api/users", json={"email": f"{uuid.uuid4()}@example.com"}
+        ).json()
+        user_id = user["id"]
+        test_client.post(f"/api/users/{user_id}/preferences", json={})
+        test_client.post(f"/api/users/{user_id}/favorites/{uuid.uuid4()}")
+        
+        with patch.object(users.users_db, "maxsize", 1):
+            test_client.post(
+                "/api/users", json={"email": f"{uuid.uuid4()}@example.com"}
+            )
+        
+        assert user_id not in users.users_db
+        assert user["email"] not in users.emails_db
+        assert user_id not in users.preferences_db
+        assert user_id not in users.favorites_db
+
 
 class TestRootEndpoint:
     """Test root API endpoint."""
@@ -268,4 +444,64 @@ class TestRootEndpoint:
         assert "app_name" in data
         assert "version" in data
         assert "environment" in data
-        assert "docs_url" in data
\ No newline at end of file
+        assert "docs_url" in data
+
+    def test_openapi_schema_built_on_startup(self, test_client):
+        """Test the OpenAPI schema is prebuilt during startup."""
+        assert test_client.app.openapi_schema is not None
+
+        response = test_client.get("/api/openapi.json")
+
+        assert response.status_code == 200
+        assert "/api/recipes" in response.json()["paths"]
+
+    def test_openapi_schema_loaded_from_cache(self, test_client, tmp_path):
+        """Test a fresh persisted OpenAPI schema is used instead of rebuilding."""
+        from meal_planner.api import main
+
+        schema = {"openapi": "3.1.0", "paths": {}}
+        cache_path = tmp_path / "openapi.cache.json"
+        cache_path.write_text(
+            json.dumps({"fingerprint": main.openapi_fingerprint(), "schema": schema})
+        )
+
+        app = test_client.app
+        original_schema = app.openapi_schema
+        try:
+            with patch.object(main, "OPENAPI_CACHE_PATH", cache_path):
+                assert main._load_openapi_cache(app)
+            assert app.openapi_schema == schema
+
+            with patch.object(main, "OPENAPI_CACHE_PATH", tmp_path / "missing.json"):
+                assert not main._load_openapi_cache(app)
+        finally:
+            app.openapi_schema = original_schema
+
+    def test_stale_openapi_cache_ignored(self, test_client, tmp_path):
+        """Test a schema built from other code or library versions is rebuilt."""
+        from meal_planner.api import main
+
+        cache_path = tmp_path / "openapi.cache.json"
+        cache_path.write_text(
+            json.dumps({"fingerprint": "old", "schema": {"paths": {}}})
+        )
+
+        with patch.object(main, "OPENAPI_CACHE_PATH", cache_path):
+            assert not main._load_openapi_cache(test_client.app)
+        assert test_client.app.openapi_schema["paths"]
+
+        fingerprint = main.openapi_fingerprint()
+        with patch.object(main.pydantic, "VERSION", "0.0.0"):
+            assert main.openapi_fingerprint() != fingerprint
+        with patch.object(main.settings, "app_name", "Renamed API"):
+            assert main.openapi_fingerprint() != fingerprint
+
+    def test_openapi_cache_without_schema_ignored(self, test_client, tmp_path):
+        """Test a cache file with a current fingerprint but no schema is rebuilt."""
+        from meal_planner.api import main
+
+        cache_path = tmp_path / "openapi.cache.json"
+        cache_path.write_text(json.dumps({"fingerprint": main.openapi_fingerprint()}))
+
+        with patch.object(main, "OPENAPI_CACHE_PATH", cache_path):
+            assert not main._load_openapi_cache(test_client.app)
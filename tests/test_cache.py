@@ -0,0 +1,71 @@
+"""Tests for in-memory caching helpers."""
+
+import pytest
+
+from meal_planner.core.cache import LRUDict, TTLCache
+
+
+class TestLRUDict:
+    """Test the LRU-bounded dictionary."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest entry is evicted past maxsize."""
+        evicted = []
+        cache = LRUDict(maxsize=2, on_evict=lambda k, v: evicted.append((k, v)))
+
+        cache["a"] = 1
+        cache["b"] = 2
+        cache["a"]  # Mark "a" as recently used
+        cache["c"] = 3
+
+        assert list(cache.keys()) == ["a", "c"]
+        assert evicted == [("b", 2)]
+
+    def test_get_marks_recently_used(self):
+        """Test that get() refreshes recency and returns defaults."""
+        cache = LRUDict(maxsize=2)
+        cache["a"] = 1
+        cache["b"] = 2
+
+        assert cache.get("a") == 1
+        assert cache.get("missing", "default") == "default"
+
+        cache["c"] = 3
+        assert "a" in cache
+        assert "b" not in cache
+
+    def test_invalid_maxsize(self):
+        """Test that a non-positive maxsize is rejected."""
+        with pytest.raises(ValueError):
+            LRUDict(maxsize=0)
+
+
+class TestTTLCache:
+    """Test the expiring LRU cache."""
+
+    def test_entries_expire(self):
+        """Test that entries are served until their TTL runs out."""
+        now = [100.0]
+        cache = TTLCache(maxsize=10, ttl=5, clock=lambda: now[0])
+        cache.set("a", 1)
+
+        now[0] = 104.9
+        assert cache.get("a") == 1
+
+        now[0] = 105.0
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_invalidate_and_maxsize(self):
+        """Test explicit invalidation and LRU eviction."""
+        cache = TTLCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.invalidate("a")
+        cache.invalidate("missing")
+        cache.set("c", 3)
+        cache.set("d", 4)
+
+        assert cache.get("a") is None
+        assert cache.get("b") is None
+        assert (cache.get("c"), cache.get("d")) == (3, 4)
@@ -1,10 +1,11 @@
 """Tests for database services."""
 
-import pytest
 import uuid
 from datetime import datetime, timedelta
 
-from meal_planner.db.services import UserService, RecipeService, MealPlanService
+import pytest
+
+from meal_planner.db.services import MealPlanService, RecipeService, UserService
 
 
 class TestUserService:
@@ -124,6 +125,37 @@ class TestRecipeService:
         assert found_recipe.title == test_recipe.title
         assert found_recipe.user is not None  # Should load user relationship
     
+    @pytest.mark.asyncio
+    async def test_cached_statements_rebind_parameters(
+        self, recipe_service, test_user, test_recipe_data
+    ):
+        """Test cached lambda statements pick up each call's values."""
+        first = await recipe_service.create_recipe(
+            test_user.id, {**test_recipe_data, "title": "First"}
+        )
+        second = await recipe_service.create_recipe(
+            None, {**test_recipe_data, "title": "Second"}
+        )
+        
+        assert (await recipe_service.get_recipe_by_id(first.id)).title == "First"
+        assert (await recipe_service.get_recipe_by_id(second.id)).title == "Second"
+        newest = await recipe_service.list_recipes(limit=1)
+        next_newest = await recipe_service.list_recipes(limit=1, offset=1)
+        assert [r.id for r in newest] == [second.id]
+        assert [r.id for r in next_newest] == [first.id]
+    
+    @pytest.mark.asyncio
+    async def test_strict_loading(self, recipe_service, test_recipe):
+        """Test that relationships a read didn't eager load raise on access."""
+        from sqlalchemy.exc import InvalidRequestError
+        
+        recipe_service.db.expunge_all()
+        found_recipe = await recipe_service.get_recipe_by_id(test_recipe.id)
+        
+        assert found_recipe.user.email == "test@example.com"
+        with pytest.raises(InvalidRequestError, match="lazy='raise'"):
+            _ = found_recipe.meal_plan_recipes
+    
     @pytest.mark.asyncio
     async def test_list_recipes(self, recipe_service, test_recipe):
         """Test listing recipes with pagination."""
@@ -132,6 +164,44 @@ class TestRecipeService:
         assert len(recipes) >= 1
         assert any(r.id == test_recipe.id for r in recipes)
     
+    @pytest.mark.asyncio
+    async def test_list_recipes_keyset_pagination(
+        self, recipe_service, test_user, test_recipe_data
+    ):
+        """Test paging through recipes with the (created_at, id) keyset."""
+        for i in range(5):
+            await recipe_service.create_recipe(
+                user_id=test_user.id,
+                recipe_data={**test_recipe_data, "title": f"Keyset Recipe {i}"}
+            )
+        
+        seen = []
+        after = None
+        for _ in range(10):  # Bounded so a broken cursor can't loop forever
+            page = await recipe_service.list_recipes(limit=2, after=after)
+            if not page:
+                break
+            seen.extend(r.id for r in page)
+            after = (page[-1].created_at, page[-1].id)
+        
+        all_recipes = await recipe_service.list_recipes(limit=100)
+        assert seen == [r.id for r in all_recipes]
+        assert len(seen) == len(set(seen)) == 5
+    
+    @pytest.mark.asyncio
+    async def test_iter_recipes(self, recipe_service, test_user, test_recipe_data):
+        """Test streaming recipes in batches yields the same rows as listing them."""
+        for i in range(5):
+            await recipe_service.create_recipe(
+                user_id=test_user.id,
+                recipe_data={**test_recipe_data, "title": f"Streamed Recipe {i}"}
+            )
+        
+        streamed = [r.id async for r in recipe_service.iter_recipes(batch_size=2)]
+        
+        assert streamed == [r.id for r in await recipe_service.list_recipes(limit=100)]
+        assert len(streamed) == 5
+    
     @pytest.mark.asyncio
     async def test_list_recipes_by_user(self, recipe_service, test_user, test_recipe):
         """Test listing recipes for specific user."""
@@ -148,6 +218,30 @@ class TestRecipeService:
         assert len(recipes) >= 1
         assert any(r.id == test_recipe.id for r in recipes)
     
+    @pytest.mark.asyncio
+    async def test_search_recipes_full_text(self, recipe_service, test_recipe):
+        """Test the FTS index matches substrings and follows updates and deletes."""
+        search = recipe_service.search_recipes
+        assert [r.id for r in await search("TOMATO SAU")] == [test_recipe.id]
+        assert [r.id for r in await search("quic")] == [test_recipe.id]
+        assert await search("quick easy") == []
+        
+        await recipe_service.update_recipe(test_recipe.id, {"tags": ["weeknight"]})
+        assert await search("quick") == []
+        assert [r.id for r in await search("weeknight")] == [test_recipe.id]
+        
+        await recipe_service.delete_recipe(test_recipe.id)
+        assert await search("weeknight") == []
+    
+    @pytest.mark.asyncio
+    async def test_search_recipes_short_query(self, recipe_service, test_recipe):
+        """Test queries too short for trigrams match individual tags and ingredients."""
+        search = recipe_service.search_recipes
+        assert [r.id for r in await search("LB")] == [test_recipe.id]
+        assert [r.id for r in await search("ea")] == [test_recipe.id]
+        # Doesn't match the serialized array
+        assert await search('",') == []
+    
     @pytest.mark.asyncio
     async def test_search_recipes_no_results(self, recipe_service):
         """Test searching with no matching results."""
@@ -202,6 +296,159 @@ class TestRecipeService:
             max_prep_time=15
         )
         assert len(recipes) >= 1
+    
+    @pytest.mark.asyncio
+    async def test_total_time_filter(self, recipe_service, test_recipe):
+        """Test filtering on the computed total time."""
+        assert await recipe_service.get_recipes_by_filters(max_total_time=24) == []
+        recipes = await recipe_service.get_recipes_by_filters(max_total_time=25)
+        assert [r.id for r in recipes] == [test_recipe.id]
+    
+    @pytest.mark.asyncio
+    async def test_time_filters_use_indexes(self, recipe_service):
+        """Test that SQLite seeks the time filter indexes rather than scanning."""
+        from sqlalchemy import select, text
+
+        from meal_planner.db.models import Recipe
+        
+        for column, index in (
+            (Recipe.prep_time_minutes, "ix_recipes_public_prep_time"),
+            (Recipe.total_time_minutes, "ix_recipes_public_total_time"),
+        ):
+            query = select(Recipe.id).where(Recipe.is_public.is_(True), column <= 30)
+            compiled = query.compile(
+                recipe_service.db.bind, compile_kwargs={"literal_binds": True}
+            )
+            result = await recipe_service.db.execute(
+                text(f"EXPLAIN QUERY PLAN {compiled}")
+            )
+            assert any(f"USING INDEX {index}" in row[-1] for row in result)
+    
+    @pytest.mark.asyncio
+    async def test_filters_ordered_by_rank_index(self, recipe_service):
+        """Test that best-rated-first listings read the rank index without sorting."""
+        from sqlalchemy import desc, select, text
+
+        from meal_planner.db.models import Recipe
+        
+        query = (
+            select(Recipe.id)
+            .where(Recipe.is_public.is_(True))
+            .order_by(desc(Recipe.average_rating), desc(Recipe.created_at))
+            .limit(20)
+        )
+        compiled = query.compile(
+            recipe_service.db.bind, compile_kwargs={"literal_binds": True}
+        )
+        result = await recipe_service.db.execute(text(f"EXPLAIN QUERY PLAN {compiled}"))
+        plan = [row[-1] for row in result]
+        
+        assert any("USING INDEX ix_recipes_public_rank" in step for step in plan)
+        assert not any("TEMP B-TREE" in step for step in plan)
+    
+    @pytest.mark.asyncio
+    async def test_rating_aggregates(
+        self, recipe_service, user_service, test_user, test_recipe
+    ):
+        """Test that ratings keep the recipe's average and count current."""
+        from meal_planner.db.services import RecipeRatingService
+        
+        rating_service = RecipeRatingService(recipe_service.db)
+        other_user = await user_service.create_user(
+            email="other@example.com", full_name="Other"
+        )
+        await rating_service.create_rating(test_user.id, test_recipe.id, 5)
+        await rating_service.create_rating(other_user.id, test_recipe.id, 2)
+        
+        recipe = await recipe_service.get_recipe_by_id(test_recipe.id)
+        assert recipe.average_rating == 3.5
+        assert recipe.rating_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_ratings_keyset_pagination(
+        self, recipe_service, user_service, test_recipe
+    ):
+        """Test paging through a recipe's ratings with the (created_at, id) keyset."""
+        from meal_planner.db.services import RecipeRatingService
+        
+        rating_service = RecipeRatingService(recipe_service.db)
+        for i in range(5):
+            rater = await user_service.create_user(
+                email=f"rater{i}@example.com", full_name=f"Rater {i}"
+            )
+            await rating_service.create_rating(rater.id, test_recipe.id, i + 1)
+        
+        seen = []
+        after = None
+        for _ in range(10):  # Bounded so a broken cursor can't loop forever
+            page = await rating_service.get_ratings_for_recipe(
+                test_recipe.id, limit=2, after=after
+            )
+            if not page:
+                break
+            seen.extend(rating.id for rating in page)
+            after = (page[-1].created_at, page[-1].id)
+        
+        all_ratings = await rating_service.get_ratings_for_recipe(test_recipe.id)
+        assert seen == [rating.id for rating in all_ratings]
+        assert len(seen) == len(set(seen)) == 5
+        assert {rating.user.full_name for rating in all_ratings} == {
+            f"Rater {i}" for i in range(5)
+        }
+    
+    @pytest.mark.asyncio
+    async def test_update_rating(self, recipe_service, test_user, test_recipe):
+        """Test updating a rating returns the new values and refreshes aggregates."""
+        from meal_planner.db.services import RecipeRatingService
+        
+        rating_service = RecipeRatingService(recipe_service.db)
+        await rating_service.create_rating(test_user.id, test_recipe.id, 2)
+        
+        updated = await rating_service.update_rating(
+            test_user.id, test_recipe.id, rating=4, review="Better"
+        )
+        
+        assert (updated.rating, updated.review) == (4, "Better")
+        assert (
+            await recipe_service.get_recipe_by_id(test_recipe.id)
+        ).average_rating == 4
+        assert (
+            await rating_service.update_rating(test_user.id, uuid.uuid4(), rating=1)
+            is None
+        )
+    
+    @pytest.mark.asyncio
+    async def test_label_filters_follow_updates(self, recipe_service, test_recipe):
+        """Test that label filters match exact values and track updates."""
+        assert await recipe_service.get_recipes_by_filters(appliances=["stove"]) == []
+        
+        await recipe_service.update_recipe(
+            test_recipe.id, {"dietary_restrictions": ["vegan", "gluten_free"]}
+        )
+        
+        vegetarian = await recipe_service.get_recipes_by_filters(
+            dietary_restrictions=["vegetarian"]
+        )
+        assert vegetarian == []
+        candidates = await recipe_service.list_candidate_recipes(
+            ["vegan", "gluten_free"]
+        )
+        assert [r.id for r in candidates] == [test_recipe.id]
+        assert await recipe_service.list_candidate_recipes(["vegan", "keto"]) == []
+    
+    @pytest.mark.asyncio
+    async def test_rebuild_labels(self, recipe_service, test_recipe):
+        """Test rebuilding recipe labels from the JSON fields."""
+        from sqlalchemy import delete
+        
+        from meal_planner.db.models import RecipeLabel
+        
+        await recipe_service.db.execute(delete(RecipeLabel))
+        assert await recipe_service.get_recipes_by_filters(meal_types=["dinner"]) == []
+        
+        assert await recipe_service.rebuild_labels() == 1
+        recipes = await recipe_service.get_recipes_by_filters(meal_types=["dinner"])
+        assert [r.id for r in recipes] == [test_recipe.id]
 
 
 class TestMealPlanService:
@@ -251,6 +498,73 @@ class TestMealPlanService:
         assert len(meal_plans) >= 1
         assert any(mp.id == meal_plan.id for mp in meal_plans)
     
+    @pytest.mark.asyncio
+    async def test_list_meal_plans_keyset_pagination(
+        self, meal_plan_service, test_user, test_meal_plan_data
+    ):
+        """Test paging through a user's meal plans with the (created_at, id) keyset."""
+        for i in range(5):
+            await meal_plan_service.create_meal_plan(
+                user_id=test_user.id,
+                meal_plan_data={**test_meal_plan_data, "name": f"Plan {i}"}
+            )
+        
+        seen = []
+        after = None
+        for _ in range(10):  # Bounded so a broken cursor can't loop forever
+            page = await meal_plan_service.list_meal_plans(
+                user_id=test_user.id, limit=2, after=after
+            )
+            if not page:
+                break
+            seen.extend(mp.id for mp in page)
+            after = (page[-1].created_at, page[-1].id)
+        
+        all_plans = await meal_plan_service.list_meal_plans(
+            user_id=test_user.id, limit=100
+        )
+        assert seen == [mp.id for mp in all_plans]
+        assert len(seen) == len(set(seen)) == 5
+    
+    @pytest.mark.asyncio
+    async def test_create_meal_plan_with_recipes(
+        self, meal_plan_service, test_user, test_recipe, test_meal_plan_data
+    ):
+        """Test creating a meal plan together with its scheduled recipes."""
+        start = datetime.now()
+        recipes = [
+            {
+                "recipe_id": test_recipe.id,
+                "scheduled_date": start + timedelta(days=day),
+                "meal_type": meal,
+            }
+            for day in range(3)
+            for meal in ("lunch", "dinner")
+        ]
+        
+        meal_plan = await meal_plan_service.create_meal_plan(
+            user_id=test_user.id,
+            meal_plan_data=test_meal_plan_data,
+            recipes=recipes
+        )
+        added = await meal_plan_service.add_recipes_to_meal_plan(
+            meal_plan.id,
+            [
+                {
+                    "recipe_id": test_recipe.id,
+                    "scheduled_date": start,
+                    "meal_type": "breakfast",
+                    "servings_multiplier": 2.0,
+                }
+            ],
+        )
+        
+        found_plan = await meal_plan_service.get_meal_plan_by_id(meal_plan.id)
+        assert added == 1
+        assert len(found_plan.recipes) == 7
+        assert len({r.id for r in found_plan.recipes}) == 7
+        assert sorted(r.servings_multiplier for r in found_plan.recipes)[-1] == 2.0
+    
     @pytest.mark.asyncio
     async def test_add_recipe_to_meal_plan(self, meal_plan_service, test_user, test_recipe, test_meal_plan_data):
         """Test adding recipe to meal plan."""
@@ -277,6 +591,78 @@ class TestMealPlanService:
         assert meal_plan_recipe.meal_type == "dinner"
         assert meal_plan_recipe.servings_multiplier == 1.5
     
+    @pytest.mark.asyncio
+    async def test_plan_relationships_load_by_default(
+        self, meal_plan_service, test_user, test_recipe, test_meal_plan_data
+    ):
+        """Test that a plain query loads a plan's user and scheduled recipes."""
+        from sqlalchemy import select
+
+        from meal_planner.db.models import MealPlan
+        
+        meal_plan = await meal_plan_service.create_meal_plan(
+            user_id=test_user.id,
+            meal_plan_data=test_meal_plan_data,
+            recipes=[
+                {
+                    "recipe_id": test_recipe.id,
+                    "scheduled_date": datetime.now(),
+                    "meal_type": "lunch",
+                }
+            ],
+        )
+        await meal_plan_service.add_recipe_to_meal_plan(
+            meal_plan.id, test_recipe.id, datetime.now(), "dinner"
+        )
+        meal_plan_service.db.expunge_all()
+        
+        found_plan = await meal_plan_service.db.scalar(select(MealPlan))
+        
+        assert found_plan.user.email == test_user.email
+        assert {r.meal_type for r in found_plan.recipes} == {"lunch", "dinner"}
+        assert found_plan.recipes[0].recipe.title == test_recipe.title
+    
+    @pytest.mark.asyncio
+    async def test_remove_and_delete_cascade(
+        self, meal_plan_service, test_user, test_recipe, test_meal_plan_data
+    ):
+        """Test removing a scheduled recipe, and deleting a plan along with its rows."""
+        from sqlalchemy import func, select
+
+        from meal_planner.db.models import GroceryList, GroceryListItem, MealPlanRecipe
+        
+        scheduled_date = datetime(2024, 1, 1, 18)
+        meal_plan = await meal_plan_service.create_meal_plan(
+            user_id=test_user.id,
+            meal_plan_data=test_meal_plan_data,
+            recipes=[
+                {
+                    "recipe_id": test_recipe.id,
+                    "scheduled_date": scheduled_date,
+                    "meal_type": meal_type,
+                }
+                for meal_type in ("lunch", "dinner")
+            ],
+        )
+        await meal_plan_service.create_grocery_list(
+            meal_plan.id, test_user.id, items=[{"name": "Salt"}]
+        )
+        
+        assert await meal_plan_service.remove_recipe_from_meal_plan(
+            meal_plan.id, test_recipe.id, scheduled_date, "lunch"
+        )
+        assert not await meal_plan_service.remove_recipe_from_meal_plan(
+            meal_plan.id, test_recipe.id, scheduled_date, "lunch"
+        )
+        
+        assert await meal_plan_service.delete_meal_plan(meal_plan.id)
+        assert not await meal_plan_service.delete_meal_plan(meal_plan.id)
+        for model in (MealPlanRecipe, GroceryList, GroceryListItem):
+            count = await meal_plan_service.db.scalar(
+                select(func.count()).select_from(model)
+            )
+            assert count == 0
+    
     @pytest.mark.asyncio
     async def test_create_grocery_list(self, meal_plan_service, test_user, test_meal_plan_data):
         """Test creating grocery list for meal plan."""
@@ -288,9 +674,14 @@ class TestMealPlanService:
         
         # Create grocery list
         items = [
-            {"name": "Pasta", "quantity": "1 lb"},
-            {"name": "Tomato Sauce", "quantity": "2 cans"},
-            {"name": "Cheese", "quantity": "1 cup"}
+            {"name": "Pasta", "quantity": 1, "unit": "lb"},
+            {
+                "name": "Tomato Sauce",
+                "quantity": 2,
+                "unit": "cans",
+                "category": "Pantry",
+            },
+            {"name": "Cheese", "quantity": 1, "unit": "cup", "notes": "ignored"},
         ]
         
         grocery_list = await meal_plan_service.create_grocery_list(
@@ -303,8 +694,19 @@ class TestMealPlanService:
         
         assert grocery_list.id is not None
         assert grocery_list.meal_plan_id == meal_plan.id
-        assert grocery_list.items == items
+        assert [item.name for item in grocery_list.items] == [
+            "Pasta",
+            "Tomato Sauce",
+            "Cheese",
+        ]
+        assert [item.ordinal for item in grocery_list.items] == [0, 1, 2]
+        assert grocery_list.items[1].category == "Pantry"
+        assert grocery_list.items[2].unit == "cup"
+        assert grocery_list.items[0].purchased is False
         assert grocery_list.total_estimated_cost == 45.50
+        
+        found = await meal_plan_service.get_grocery_list_by_meal_plan(meal_plan.id)
+        assert [item.quantity for item in found.items] == [1, 2, 1]
     
     @pytest.mark.asyncio
     async def test_delete_meal_plan(self, meal_plan_service, test_user, test_meal_plan_data):
@@ -321,4 +723,361 @@ class TestMealPlanService:
         
         # Verify meal plan is deleted
         deleted_plan = await meal_plan_service.get_meal_plan_by_id(meal_plan.id)
-        assert deleted_plan is None
\ No newline at end of file
+        assert deleted_plan is None
+    
+    @pytest.mark.asyncio
+    async def test_update_meal_plan(
+        self, meal_plan_service, test_user, test_meal_plan_data
+    ):
+        """Test updating a meal plan in place and updating one that doesn't exist."""
+        meal_plan = await meal_plan_service.create_meal_plan(
+            user_id=test_user.id,
+            meal_plan_data=test_meal_plan_data
+        )
+        
+        updated = await meal_plan_service.update_meal_plan(
+            meal_plan.id, {"name": "Renamed"}
+        )
+        
+        assert updated is meal_plan
+        assert meal_plan.name == "Renamed"
+        assert (
+            await meal_plan_service.update_meal_plan(uuid.uuid4(), {"name": "Missing"})
+            is None
+        )
+
+
+class TestGUID:
+    """Test GUID column conversions."""
+
+    def test_round_trip(self):
+        """Test that IDs bind as bytes on SQLite, else as strings, and load as UUIDs."""
+        from types import SimpleNamespace
+
+        from meal_planner.db.models import GUID
+
+        guid = GUID()
+        sqlite = SimpleNamespace(name="sqlite")
+        mysql = SimpleNamespace(name="mysql")
+        value = uuid.uuid4()
+
+        assert guid.process_bind_param(value, sqlite) == value.bytes
+        assert guid.process_bind_param(value.hex.upper(), sqlite) == value.bytes
+        assert guid.process_bind_param(value.hex.upper(), mysql) == str(value)
+        assert guid.process_bind_param(None, sqlite) is None
+        assert guid.process_result_value(value.bytes, sqlite) == value
+        assert guid.process_result_value(str(value), sqlite) == value
+        assert guid.process_result_value(value, sqlite) is value
+
+    @pytest.mark.asyncio
+    async def test_text_guids_converted(self, tmp_path):
+        """Test GUIDs written as text by earlier versions are converted on startup."""
+        from sqlalchemy import text
+
+        from meal_planner.db.database import Database
+
+        db = Database()
+        db.init(f"sqlite+aiosqlite:///{tmp_path / 'guids.db'}")
+        await db.create_tables()
+
+        try:
+            user_id = uuid.uuid4()
+            async with db.engine.begin() as conn:
+                await conn.execute(
+                    text(
+                        "INSERT INTO users "
+                        "(id, email, full_name, is_active, created_at, updated_at) "
+                        "VALUES (:id, 'legacy@example.com', 'Legacy', 1, "
+                        "'2024-01-01', '2024-01-01')"
+                    ),
+                    {"id": str(user_id)},
+                )
+                await conn.execute(text("PRAGMA user_version = 0"))
+
+            await db.create_tables()
+
+            async with await db.get_session() as session:
+                user = await UserService(session).get_user_by_id(user_id)
+                stored = await session.scalar(text("SELECT typeof(id) FROM users"))
+
+            assert user.email == "legacy@example.com"
+            assert stored == "blob"
+        finally:
+            await db.close()
+
+
+class TestSQLiteMigrations:
+    """Test one-time upgrades of databases written by earlier versions."""
+
+    @pytest.mark.asyncio
+    async def test_missing_indexes_created(self, tmp_path):
+        """Test indexes declared after their table existed are added on startup."""
+        from sqlalchemy import text
+
+        from meal_planner.db.database import Database
+
+        db = Database()
+        db.init(f"sqlite+aiosqlite:///{tmp_path / 'indexes.db'}")
+        await db.create_tables()
+
+        list_indexes = text(
+            "SELECT name FROM sqlite_master "
+            "WHERE type = 'index' AND name LIKE 'ix_%' ORDER BY name"
+        )
+        try:
+            async with db.engine.begin() as conn:
+                expected = (await conn.scalars(list_indexes)).all()
+                for name in expected:
+                    await conn.execute(text(f"DROP INDEX {name}"))
+
+            await db.create_tables()
+
+            async with db.engine.connect() as conn:
+                assert (await conn.scalars(list_indexes)).all() == expected
+            assert "ix_recipes_created_at_id" in expected
+            assert "ix_recipes_search_vector" not in expected  # PostgreSQL only
+        finally:
+            await db.close()
+
+    @pytest.mark.asyncio
+    async def test_legacy_timestamps_page(self, tmp_path):
+        """Test recipes timestamped by CURRENT_TIMESTAMP page after migrating."""
+        from sqlalchemy import text
+
+        from meal_planner.db.database import Database
+
+        db = Database()
+        db.init(f"sqlite+aiosqlite:///{tmp_path / 'timestamps.db'}")
+        await db.create_tables()
+
+        try:
+            async with await db.get_session() as session, session.begin():
+                user = await UserService(session).create_user(
+                    "legacy@example.com", "Legacy"
+                )
+                for i in range(4):
+                    await RecipeService(session).create_recipe(
+                        user.id,
+                        {"title": f"R{i}", "ingredients": ["x"], "instructions": ["y"]},
+                    )
+
+            # As SQLite's CURRENT_TIMESTAMP wrote them: seconds only
+            async with db.engine.begin() as conn:
+                await conn.execute(
+                    text(
+                        "UPDATE recipes SET created_at = "
+                        "strftime('%Y-%m-%d %H:%M:%S', '2024-01-01', "
+                        "'+' || rowid || ' minutes')"
+                    )
+                )
+                await conn.execute(text("PRAGMA user_version = 1"))
+
+            await db.create_tables()
+
+            titles = []
+            after = None
+            async with await db.get_session() as session:
+                service = RecipeService(session)
+                for _ in range(5):  # Bounded so a broken cursor can't loop forever
+                    page = await service.list_recipes(limit=2, after=after)
+                    if not page:
+                        break
+                    titles.extend(r.title for r in page)
+                    after = (page[-1].created_at, page[-1].id)
+
+            assert titles == ["R3", "R2", "R1", "R0"]
+        finally:
+            await db.close()
+
+    @pytest.mark.asyncio
+    async def test_labels_backfilled(self, tmp_path):
+        """Test recipes from before recipe_labels existed match label filters."""
+        from sqlalchemy import text
+
+        from meal_planner.db.database import Database
+
+        db = Database()
+        db.init(f"sqlite+aiosqlite:///{tmp_path / 'labels.db'}")
+        await db.create_tables()
+
+        try:
+            async with await db.get_session() as session, session.begin():
+                user = await UserService(session).create_user(
+                    "early@example.com", "Early"
+                )
+                recipe = await RecipeService(session).create_recipe(
+                    user.id,
+                    {"title": "Oats", "ingredients": ["oats"], "instructions": ["soak"],
+                     "meal_types": ["breakfast"]},
+                )
+
+            async with db.engine.begin() as conn:
+                await conn.execute(text("DROP TABLE recipe_labels"))
+
+            await db.create_tables()
+
+            async with await db.get_session() as session:
+                found = await RecipeService(session).get_recipes_by_filters(
+                    meal_types=["breakfast"]
+                )
+
+            assert [r.id for r in found] == [recipe.id]
+        finally:
+            await db.close()
+
+    @pytest.mark.asyncio
+    async def test_grocery_items_moved_to_rows(self, tmp_path, test_meal_plan_data):
+        """Test items in the old JSON column become rows and new lists still work."""
+        from sqlalchemy import text
+
+        from meal_planner.db.database import Database
+
+        db = Database()
+        db.init(f"sqlite+aiosqlite:///{tmp_path / 'grocery.db'}")
+        await db.create_tables()
+
+        try:
+            async with await db.get_session() as session, session.begin():
+                user = await UserService(session).create_user(
+                    "shopper@example.com", "Shopper"
+                )
+                meal_plan = await MealPlanService(session).create_meal_plan(
+                    user.id, test_meal_plan_data
+                )
+
+            # The table as earlier versions created it, with one list in it
+            async with db.engine.begin() as conn:
+                await conn.execute(text("DROP TABLE grocery_lists"))
+                await conn.execute(
+                    text(
+                        "CREATE TABLE grocery_lists (id BLOB PRIMARY KEY, "
+                        "meal_plan_id BLOB NOT NULL, user_id BLOB NOT NULL, "
+                        "name VARCHAR(255), items JSON NOT NULL, "
+                        "total_estimated_cost FLOAT, store_preference VARCHAR(255), "
+                        "is_completed BOOLEAN, completed_at DATETIME, "
+                        "created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+                    )
+                )
+                await conn.execute(
+                    text(
+                        "INSERT INTO grocery_lists (id, meal_plan_id, user_id, name, "
+                        "items, created_at, updated_at) VALUES (:id, :meal_plan_id, "
+                        ":user_id, 'Old', :items, '2024-01-01 00:00:00.000000', "
+                        "'2024-01-01 00:00:00.000000')"
+                    ),
+                    {
+                        "id": uuid.uuid4().bytes,
+                        "meal_plan_id": meal_plan.id.bytes,
+                        "user_id": user.id.bytes,
+                        "items": '[{"name": "eggs", "quantity": 12}, {"name": "milk"}]',
+                    },
+                )
+                await conn.execute(text("PRAGMA user_version = 2"))
+
+            await db.create_tables()
+
+            async with await db.get_session() as session, session.begin():
+                service = MealPlanService(session)
+                old = await service.get_grocery_list_by_meal_plan(meal_plan.id)
+                new = await service.create_grocery_list(
+                    meal_plan.id, user.id, [{"name": "bread"}]
+                )
+                columns = await session.execute(
+                    text("PRAGMA table_info(grocery_lists)")
+                )
+                items_ddl = await session.scalar(
+                    text(
+                        "SELECT sql FROM sqlite_master "
+                        "WHERE name = 'grocery_list_items'"
+                    )
+                )
+
+            assert [(item.name, item.quantity) for item in old.items] == [
+                ("eggs", 12),
+                ("milk", None),
+            ]
+            assert [item.name for item in new.items] == ["bread"]
+            assert "items" not in {row.name for row in columns}
+            assert "grocery_lists_old" not in items_ddl
+        finally:
+            await db.close()
+
+
+class TestUnitOfWork:
+    """Test the per-request session dependency."""
+
+    @pytest.mark.asyncio
+    async def test_commits_once_or_rolls_back(self, tmp_path, monkeypatch):
+        """Test writes are committed if the request succeeds and discarded if not."""
+        import importlib
+
+        from meal_planner.db.database import Database, get_db_session
+
+        # meal_planner.db re-exports the instance under the module's name
+        database_module = importlib.import_module("meal_planner.db.database")
+
+        db = Database()
+        db.init(f"sqlite+aiosqlite:///{tmp_path / 'uow.db'}")
+        await db.create_tables()
+        monkeypatch.setattr(database_module, "database", db)
+
+        try:
+            sessions = get_db_session()
+            await UserService(await sessions.__anext__()).create_user(
+                "kept@example.com", "Kept"
+            )
+            with pytest.raises(StopAsyncIteration):
+                await sessions.__anext__()
+
+            sessions = get_db_session()
+            await UserService(await sessions.__anext__()).create_user(
+                "lost@example.com", "Lost"
+            )
+            with pytest.raises(RuntimeError):
+                await sessions.athrow(RuntimeError("request failed"))
+
+            async with await db.get_session() as session:
+                service = UserService(session)
+                assert await service.get_user_by_email("kept@example.com") is not None
+                assert await service.get_user_by_email("lost@example.com") is None
+        finally:
+            await db.close()
+
+
+class TestGatherReads:
+    """Test running independent reads concurrently."""
+
+    @pytest.mark.asyncio
+    async def test_gather_reads(self, tmp_path):
+        """Test independent reads run on their own sessions and keep argument order."""
+        from meal_planner.db.database import Database
+
+        db = Database()
+        db.init(f"sqlite+aiosqlite:///{tmp_path / 'reads.db'}")
+        await db.create_tables()
+
+        try:
+            async with await db.get_session() as session, session.begin():
+                user = await UserService(session).create_user(
+                    "reader@example.com", "Reader"
+                )
+                await RecipeService(session).create_recipe(
+                    user.id,
+                    {
+                        "title": "Toast",
+                        "ingredients": ["bread"],
+                        "instructions": ["Toast"],
+                    },
+                )
+
+            found_user, recipes, missing = await db.gather_reads(
+                lambda s: UserService(s).get_user_by_email("reader@example.com"),
+                lambda s: RecipeService(s).list_recipes(user_id=user.id),
+                lambda s: UserService(s).get_user_by_id(uuid.uuid4()),
+            )
+
+            assert found_user.id == user.id
+            assert [r.title for r in recipes] == ["Toast"]
+            assert missing is None
+        finally:
+            await db.close()
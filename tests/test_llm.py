@@ -0,0 +1,407 @@
+"""Tests for the LLM provider base class."""
+
+import asyncio
+import os
+import time
+
+import pytest
+import pytest_asyncio
+from aiohttp import test_utils
+
+from meal_planner.core.cache import TTLCache
+from meal_planner.core.config import settings
+from meal_planner.core.models import Recipe
+from meal_planner.ml.llm import base as llm_base
+from meal_planner.ml.llm.base import BaseLLMProvider
+from meal_planner.ml.llm.cache import LLMResponseCache, normalize_prompt
+from meal_planner.ml.llm.ollama_provider import OllamaProvider, _extract_json
+
+
+class EchoProvider(BaseLLMProvider):
+    """Provider that echoes prompts back after a delay, tracking overlap."""
+
+    def __init__(self, delay: float = 0.01):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _generate(self, prompt: str) -> str:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+        return prompt.upper()
+
+    async def evaluate_ocr_quality(self, text, confidence):
+        return {}
+
+    async def structure_recipe(self, text, user_notes=None):
+        return Recipe(title=text, ingredients=[], instructions=[])
+
+    async def generate_meal_plan(self, user_preferences, available_recipes,
+                                 nutrition_goal=None, days=7):
+        return {}
+
+    async def analyze_nutrition(self, recipe):
+        return {"title": await self._generate(recipe.title)}
+
+    def get_name(self) -> str:
+        return "Echo"
+
+    def get_model(self) -> str:
+        return "echo"
+
+
+class TestBatching:
+    """Test concurrent batch helpers."""
+
+    @pytest.mark.asyncio
+    async def test_batch_generate(self):
+        """Test results keep prompt order and requests overlap up to the limit."""
+        provider = EchoProvider()
+        prompts = [f"prompt {i}" for i in range(10)]
+
+        results = await provider.batch_generate(prompts)
+
+        assert results == [p.upper() for p in prompts]
+        assert provider.max_in_flight == settings.llm_max_concurrency
+
+    @pytest.mark.asyncio
+    async def test_analyze_nutrition_batch(self):
+        """Test batch nutrition analysis honours an explicit concurrency."""
+        provider = EchoProvider()
+        recipes = [
+            Recipe(title=f"dish {i}", ingredients=[], instructions=[]) for i in range(5)
+        ]
+
+        results = await provider.analyze_nutrition_batch(recipes, concurrency=2)
+
+        assert [r["title"] for r in results] == [f"DISH {i}" for i in range(5)]
+        assert provider.max_in_flight == 2
+
+
+class TestResponseCache:
+    """Test caching of deterministic prompt responses."""
+
+    @pytest.fixture(autouse=True)
+    def responses(self, monkeypatch):
+        responses = TTLCache(maxsize=10, ttl=60)
+        monkeypatch.setattr(llm_base, "_responses", responses)
+        return responses
+
+    @pytest.mark.asyncio
+    async def test_repeat_prompt_is_cached(self):
+        """Test a repeated prompt is answered without calling the model again."""
+        provider = EchoProvider()
+        calls = []
+        generate = provider._generate
+
+        async def counting_generate(prompt):
+            calls.append(prompt)
+            return await generate(prompt)
+
+        provider._generate = counting_generate
+
+        assert await provider._generate_cached("soup") == "SOUP"
+        assert await provider._generate_cached("soup") == "SOUP"
+        assert await provider._generate_cached("stew") == "STEW"
+        assert calls == ["soup", "stew"]
+
+    @pytest.mark.asyncio
+    async def test_keyed_by_model(self, responses):
+        """Test providers on different models don't share responses."""
+        other = EchoProvider()
+        other.get_model = lambda: "echo-large"
+
+        await EchoProvider()._generate_cached("soup")
+        await other._generate_cached("soup")
+
+        assert len(responses) == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_not_cached(self, responses):
+        """Test a failed request is retried on the next call."""
+        provider = EchoProvider()
+
+        async def failing_generate(prompt):
+            raise RuntimeError("unavailable")
+
+        provider._generate = failing_generate
+        with pytest.raises(RuntimeError):
+            await provider._generate_cached("soup")
+
+        assert len(responses) == 0
+
+    @pytest.mark.asyncio
+    async def test_rejected_responses_not_cached(self, tmp_path, responses):
+        """Test a response failing validation is returned but not stored anywhere."""
+        provider = EchoProvider()
+        provider.response_cache = LLMResponseCache(tmp_path)
+
+        assert (
+            await provider._generate_cached("soup", validate=lambda r: False) == "SOUP"
+        )
+        assert len(responses) == 0
+        assert not any(tmp_path.iterdir())
+
+        await provider._generate_cached("soup", validate=lambda r: True)
+        assert len(responses) == 1
+
+    @pytest.mark.asyncio
+    async def test_disk_cache_outlives_memory(self, tmp_path, monkeypatch):
+        """Test a response on disk is reused once the in-memory cache is gone."""
+        provider = EchoProvider()
+        provider.response_cache = LLMResponseCache(tmp_path)
+        await provider._generate_cached("soup")
+
+        monkeypatch.setattr(llm_base, "_responses", TTLCache(maxsize=10, ttl=60))
+        restarted = EchoProvider()
+        restarted.response_cache = LLMResponseCache(tmp_path)
+
+        async def failing_generate(prompt):
+            raise AssertionError("model called")
+
+        restarted._generate = failing_generate
+        assert await restarted._generate_cached("soup") == "SOUP"
+
+    @pytest.mark.asyncio
+    async def test_normalized_prompts_share_response(self, responses):
+        """Test OCR variants of a prompt share a response only when normalizing."""
+        provider = EchoProvider()
+
+        first = await provider._generate_cached("\u00bd cup  flour\n", normalize=True)
+
+        assert await provider._generate_cached("1/2 cup flour", normalize=True) == first
+        assert await provider._generate_cached("1/2  cup flour") == "1/2  CUP FLOUR"
+        assert len(responses) == 2
+
+    @pytest.mark.asyncio
+    async def test_cache_disabled(self, responses):
+        """Test providers created without caching always call the model."""
+        provider = EchoProvider()
+        provider.use_cache = False
+
+        await provider._generate_cached("soup")
+
+        assert len(responses) == 0
+
+
+class TestLLMResponseCache:
+    """Test the on-disk response store."""
+
+    def test_round_trip(self, tmp_path):
+        """Test responses are stored under their key's hex prefix."""
+        cache = LLMResponseCache(tmp_path)
+        key = LLMResponseCache.key("Ollama", "llama3", "soup")
+
+        assert cache.get(key) is None
+        cache.set(key, "SOUP", "llama3")
+
+        assert cache.get(key) == "SOUP"
+        assert (tmp_path / key[:2] / f"{key}.json").exists()
+        assert LLMResponseCache(tmp_path).get(key) == "SOUP"
+
+    def test_normalize_prompt(self):
+        """Test Unicode fractions, ligatures and whitespace are canonicalized."""
+        assert (
+            normalize_prompt(" \u00bd cup\n\n\ufb01ne  flour ") == "1/2 cup fine flour"
+        )
+
+    def test_key_covers_model(self):
+        """Test the same prompt to another model gets a different key."""
+        assert LLMResponseCache.key("Ollama", "llama3", "soup") != LLMResponseCache.key(
+            "Ollama", "mistral", "soup"
+        )
+
+    def test_expiry_and_corruption(self, tmp_path):
+        """Test expired and unreadable entries read as misses."""
+        key = LLMResponseCache.key("Ollama", "llama3", "soup")
+        LLMResponseCache(tmp_path).set(key, "SOUP", "llama3")
+
+        assert LLMResponseCache(tmp_path, ttl=0).get(key) is None
+        assert not (tmp_path / key[:2] / f"{key}.json").exists()
+
+        (tmp_path / key[:2] / f"{key}.json").write_text("{")
+        assert LLMResponseCache(tmp_path).get(key) is None
+
+    def test_prune(self, tmp_path):
+        """Test writes sweep out expired responses and all but the newest max_files."""
+        keys = [LLMResponseCache.key("Ollama", "llama3", prompt) for prompt in "abc"]
+        for age, key in zip((30, 20, 10), keys):
+            LLMResponseCache(tmp_path).set(key, "old", "llama3")
+            path = tmp_path / key[:2] / f"{key}.json"
+            os.utime(path, (time.time() - age, time.time() - age))
+
+        cache = LLMResponseCache(tmp_path, ttl=25, max_files=2)
+        cache.set(LLMResponseCache.key("Ollama", "llama3", "d"), "new", "llama3")
+
+        assert sorted(tmp_path.rglob("*.json")) == sorted(
+            tmp_path / key[:2] / f"{key}.json"
+            for key in (keys[2], LLMResponseCache.key("Ollama", "llama3", "d"))
+        )
+
+
+class TestOllamaProvider:
+    """Test the Ollama HTTP client."""
+
+    @pytest_asyncio.fixture
+    async def api_base(self):
+        """Local stand-in for the Ollama API, counting client connections."""
+        from aiohttp import web
+
+        connections = []
+
+        async def generate(request):
+            payload = await request.json()
+            if payload["prompt"] == "fail":
+                return web.Response(status=500, text="model not found")
+            connections.append(request.transport)
+            return web.json_response({"response": payload["prompt"].upper()})
+
+        app = web.Application()
+        app.router.add_post("/api/generate", generate)
+        server = test_utils.TestServer(app)
+        await server.start_server()
+        server.connections = connections
+        yield server
+        await server.close()
+
+    @pytest.mark.asyncio
+    async def test_requests_reuse_connection(self, api_base):
+        """Test consecutive requests go over one kept-alive connection."""
+        provider = OllamaProvider("llama3", str(api_base.make_url("/api")))
+
+        try:
+            assert await provider._generate("soup") == "SOUP"
+            assert await provider._generate("stew") == "STEW"
+            assert len({id(transport) for transport in api_base.connections}) == 1
+        finally:
+            await provider.aclose()
+
+        assert await provider._generate("pie") == "PIE"
+        await provider.aclose()
+
+    @pytest.mark.asyncio
+    async def test_error_status_raises(self, api_base):
+        """Test an error response raises rather than returning text."""
+        provider = OllamaProvider("llama3", str(api_base.make_url("/api")))
+
+        try:
+            with pytest.raises(RuntimeError, match="model not found"):
+                await provider._generate("fail")
+        finally:
+            await provider.aclose()
+
+    def test_extract_json(self):
+        """Test the first JSON object is parsed out of surrounding prose."""
+        assert _extract_json('Sure! {"a": {"b": 1}} Note: {not json}') == {
+            "a": {"b": 1}
+        }
+        assert _extract_json("no json here") is None
+        assert _extract_json('{"a": ') is None
+        assert _extract_json("{[1, 2]}") is None
+
+    @pytest.mark.asyncio
+    async def test_unparseable_response_falls_back(self, monkeypatch):
+        """Test a response without valid JSON gives the method's fallback."""
+        provider = OllamaProvider("llama3", "http://ollama", use_cache=False)
+
+        async def generate(prompt):
+            return "I couldn't analyze that."
+
+        monkeypatch.setattr(provider, "_generate", generate)
+        assessment = await provider.evaluate_ocr_quality("text", 0.4)
+
+        assert assessment["quality_score"] == 0.4
+        assert assessment["detected_issues"] == ["Failed to parse LLM response"]
+
+    @pytest.mark.asyncio
+    async def test_structure_recipe_retries_with_error(self, monkeypatch):
+        """Test an unparseable recipe is re-requested with the parse error."""
+        provider = OllamaProvider("llama3", "http://ollama", use_cache=False)
+        responses = iter(
+            [
+                "Here you go: {\"title\": ",
+                '{"title": "Soup", "servings": "lots"}',
+                '{"title": "Soup", "ingredients": ["water"], "servings": 2}',
+            ]
+        )
+        prompts = []
+
+        async def generate(prompt):
+            prompts.append(prompt)
+            return next(responses)
+
+        monkeypatch.setattr(provider, "_generate", generate)
+        monkeypatch.setattr(settings, "llm_retry_backoff", 0)
+        recipe = await provider.structure_recipe("Soup: water, 2 servings")
+
+        assert recipe.title == "Soup"
+        assert recipe.servings == 2
+        assert len(prompts) == 3
+        assert "Your previous output had an error" in prompts[1]
+        assert "servings" in prompts[2].rsplit("error:", 1)[1]
+
+    @pytest.mark.asyncio
+    async def test_structure_recipe_caches_corrected_answer(
+        self, tmp_path, monkeypatch
+    ):
+        """Test only the corrected answer is cached, under the original prompt."""
+        monkeypatch.setattr(llm_base, "_responses", TTLCache(maxsize=10, ttl=60))
+        monkeypatch.setattr(settings, "llm_cache_dir", tmp_path)
+        monkeypatch.setattr(settings, "llm_retry_backoff", 0)
+        provider = OllamaProvider("llama3", "http://ollama")
+        responses = iter(
+            ["Sorry, no JSON.", '{"title": "Soup", "ingredients": ["water"]}']
+        )
+        prompts = []
+
+        async def generate(prompt):
+            prompts.append(prompt)
+            return next(responses)
+
+        monkeypatch.setattr(provider, "_generate", generate)
+        first = await provider.structure_recipe("Soup: water")
+        second = await provider.structure_recipe("Soup: water")
+
+        assert first.title == second.title == "Soup"
+        assert len(prompts) == 2
+
+    @pytest.mark.asyncio
+    async def test_structure_recipe_falls_back_after_retries(self, monkeypatch):
+        """Test the stub recipe is returned once retries run out."""
+        provider = OllamaProvider("llama3", "http://ollama", use_cache=False)
+        prompts = []
+
+        async def generate(prompt):
+            prompts.append(prompt)
+            return "Sorry, I can't read that."
+
+        monkeypatch.setattr(provider, "_generate", generate)
+        monkeypatch.setattr(settings, "llm_retry_backoff", 0)
+        recipe = await provider.structure_recipe("illegible")
+
+        assert recipe.title == "Extraction Failed"
+        assert len(prompts) == settings.llm_parse_retries + 1
+
+    @pytest.mark.asyncio
+    async def test_meal_plan_prompt_serializes_recipes(self, monkeypatch):
+        """Test recipe summaries, IDs included, are embedded in the prompt as JSON."""
+        provider = OllamaProvider("llama3", "http://ollama", use_cache=False)
+        recipe = Recipe(title="Crêpes", ingredients=["flour"], instructions=["Fry"])
+        prompts = []
+
+        async def generate(prompt):
+            prompts.append(prompt)
+            return '{"days": []}'
+
+        monkeypatch.setattr(provider, "_generate", generate)
+        plan = await provider.generate_meal_plan(
+            {"allergies": ["nuts"]}, [recipe], days=1
+        )
+
+        assert plan == {"days": []}
+        assert f'"id": "{recipe.id}"' in prompts[0]
+        assert '"title": "Crêpes"' in prompts[0]
@@ -0,0 +1,127 @@
+"""Tests for OCR engines."""
+
+import os
+import threading
+
+import fitz
+import pytest
+
+from meal_planner.core.config import settings
+from meal_planner.ml.ocr.cache import OCRTextCache
+from meal_planner.ml.ocr.pymupdf_engine import PyMuPDFEngine
+
+
+def write_pdf(file_path, *lines):
+    """Save a PDF with one page per line of text."""
+    with fitz.open() as doc:
+        for line in lines:
+            doc.new_page().insert_text((72, 72), line)
+        doc.save(file_path)
+
+
+class TestPyMuPDFEngine:
+    """Test PDF text extraction."""
+
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path, monkeypatch):
+        """Keep extracted text out of the real data directory."""
+        monkeypatch.setattr(settings, "ocr_cache_dir", tmp_path / "ocr_cache")
+        return tmp_path / "ocr_cache"
+
+    @pytest.mark.asyncio
+    async def test_extract_text(self, tmp_path):
+        """Test text is extracted from every page in order with the page count."""
+        file_path = tmp_path / "recipe.pdf"
+        write_pdf(file_path, "Pancakes", "2 cups flour", "Fry until golden")
+
+        result = await PyMuPDFEngine().extract_text(file_path)
+
+        assert result.text.split() == [
+            "Pancakes",
+            "2",
+            "cups",
+            "flour",
+            "Fry",
+            "until",
+            "golden",
+        ]
+        assert result.page_count == 3
+        assert result.warnings == []
+
+    @pytest.mark.asyncio
+    async def test_parses_off_event_loop(self, tmp_path):
+        """Test documents are parsed on the engine's own thread."""
+        file_path = tmp_path / "recipe.pdf"
+        write_pdf(file_path, "")
+
+        engine = PyMuPDFEngine()
+        threads = []
+        extract_sync = engine._extract_sync
+
+        def recording_extract_sync(path):
+            threads.append(threading.current_thread().name)
+            return extract_sync(path)
+
+        engine._extract_sync = recording_extract_sync
+        await engine.extract_text(file_path)
+
+        assert threads[0].startswith("pymupdf")
+
+    @pytest.mark.asyncio
+    async def test_missing_file(self, tmp_path):
+        """Test a missing file gives an empty result with a warning."""
+        result = await PyMuPDFEngine().extract_text(tmp_path / "missing.pdf")
+
+        assert result.text == ""
+        assert result.confidence == 0.0
+        assert result.warnings
+
+    @pytest.mark.asyncio
+    async def test_reimport_uses_cache(self, tmp_path):
+        """Test an unchanged file isn't parsed again, and a changed one is."""
+        file_path = tmp_path / "recipe.pdf"
+        write_pdf(file_path, "Pancakes")
+        engine = PyMuPDFEngine()
+        parses = []
+        parse = engine._parse
+
+        def counting_parse(path):
+            parses.append(path)
+            return parse(path)
+
+        engine._parse = counting_parse
+        first = await engine.extract_text(file_path)
+        second = await engine.extract_text(file_path)
+
+        assert second.text == first.text
+        assert second.page_count == 1
+        assert len(parses) == 1
+
+        write_pdf(file_path, "Waffles", "Syrup")
+        stat = file_path.stat()
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        third = await engine.extract_text(file_path)
+
+        assert third.text.split() == ["Waffles", "Syrup"]
+        assert len(parses) == 2
+
+    def test_cache_evicts_other_versions(self, tmp_path, cache_dir):
+        """Test entries from another engine version are discarded."""
+        file_path = tmp_path / "recipe.pdf"
+        write_pdf(file_path, "Pancakes")
+        key = OCRTextCache.key(file_path, file_path.stat())
+        OCRTextCache(cache_dir, "pymupdf", "1.0").set(key, "Pancakes", 1)
+
+        assert OCRTextCache(cache_dir, "pymupdf", "1.0").get(key) == ("Pancakes", 1)
+        assert OCRTextCache(cache_dir, "pymupdf", "2.0").get(key) is None
+        assert not (cache_dir / f"{key}.json").exists()
+
+    def test_cache_keeps_newest_files(self, tmp_path, cache_dir):
+        """Test writes prune the cache to its newest max_files entries."""
+        cache = OCRTextCache(cache_dir, "pymupdf", "1.0", max_files=1)
+        cache.set("old", "Pancakes", 1)
+        os.utime(cache_dir / "old.json", ns=(0, 0))
+
+        OCRTextCache(cache_dir, "pymupdf", "1.0", max_files=1).set("new", "Waffles", 1)
+
+        assert [path.name for path in cache_dir.iterdir()] == ["new.json"]
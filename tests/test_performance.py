@@ -73,7 +73,7 @@ class TestDatabasePerformance:
     async def test_concurrent_recipe_creation(self, test_session_factory, test_user):
         """Test concurrent recipe creation."""
         async def create_recipe(session_factory, user_id, index):
-            async with session_factory() as session:
+            async with session_factory() as session, session.begin():
                 from meal_planner.db.services import RecipeService
                 service = RecipeService(session)
                 
@@ -238,7 +238,7 @@ class TestIntegrationScenarios:
     def test_multiple_user_simulation(self, test_session_factory):
         """Simulate multiple users using the system."""
         async def user_workflow(session_factory, user_index):
-            async with session_factory() as session:
+            async with session_factory() as session, session.begin():
                 from meal_planner.db.services import UserService, RecipeService
                 
                 # Create user
@@ -286,7 +286,7 @@ class TestIntegrationScenarios:
     async def test_data_consistency_under_load(self, test_session_factory, test_user):
         """Test data consistency when multiple operations happen simultaneously."""
         async def update_recipe_rating(session_factory, recipe_id, rating_value):
-            async with session_factory() as session:
+            async with session_factory() as session, session.begin():
                 from meal_planner.db.services import RecipeService
                 service = RecipeService(session)
                 
@@ -300,7 +300,7 @@ class TestIntegrationScenarios:
                 return None
         
         # First create a recipe
-        async with test_session_factory() as session:
+        async with test_session_factory() as session, session.begin():
             from meal_planner.db.services import RecipeService
             service = RecipeService(session)
             
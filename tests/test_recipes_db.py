@@ -0,0 +1,171 @@
+"""Tests for the database-backed recipe router."""
+
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from meal_planner.api.routers import recipes_db
+from meal_planner.api.routers.recipes_db import (
+    RecipeResponse,
+    _decode_cursor,
+    _encode_cursor,
+    _recipe_list_response,
+)
+from meal_planner.db.database import get_db_session
+from meal_planner.db.models import Recipe as DBRecipe
+
+
+@pytest.fixture
+def db_client(test_db_session):
+    """Create a client for an app serving only the database recipe router."""
+    app = FastAPI()
+    app.include_router(recipes_db.router, prefix="/api")
+    app.dependency_overrides[get_db_session] = lambda: test_db_session
+
+    with TestClient(app) as client:
+        yield client
+
+
+def make_db_recipe() -> DBRecipe:
+    """Build an unsaved database recipe row."""
+    now = datetime(2025, 6, 11, 12, 30, tzinfo=timezone.utc)
+    return DBRecipe(
+        id=uuid.uuid4(),
+        title="Row Recipe",
+        description="A recipe loaded from the database",
+        ingredients=["flour", "water"],
+        instructions=["mix", "bake"],
+        meal_types=["dinner"],
+        tags=["bread"],
+        dietary_restrictions=["vegan"],
+        appliances=["oven"],
+        prep_time_minutes=10,
+        cook_time_minutes=40,
+        servings=2,
+        source_url=None,
+        image_url=None,
+        notes=None,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+class TestRecipeResponse:
+    """Test conversion of database rows to responses."""
+
+    def test_from_db_recipe_matches_validated_model(self):
+        """Test the unvalidated fast path matches a validated model."""
+        db_recipe = make_db_recipe()
+
+        response = RecipeResponse.from_db_recipe(db_recipe)
+        validated = RecipeResponse.model_validate(response.model_dump())
+
+        assert response.model_dump() == validated.model_dump()
+        assert response.model_dump_json() == validated.model_dump_json()
+        assert response.id == db_recipe.id
+        assert response.created_at == db_recipe.created_at
+
+    def test_recipe_list_response(self):
+        """Test recipe lists are encoded to the response model's JSON shape."""
+        db_recipes = [make_db_recipe(), make_db_recipe()]
+
+        response = _recipe_list_response(db_recipes)
+
+        assert response.media_type == "application/json"
+        assert json.loads(response.body) == [
+            RecipeResponse.from_db_recipe(recipe).model_dump(mode="json")
+            for recipe in db_recipes
+        ]
+
+
+class TestRecipeCursor:
+    """Test keyset pagination cursors."""
+
+    def test_cursor_round_trip(self):
+        """Test a cursor decodes to the recipe's keyset position."""
+        db_recipe = make_db_recipe()
+
+        cursor = _encode_cursor(db_recipe)
+
+        assert _decode_cursor(cursor) == (db_recipe.created_at, db_recipe.id)
+
+    def test_invalid_cursor(self):
+        """Test a malformed cursor is rejected with a 400."""
+        with pytest.raises(HTTPException) as exc_info:
+            _decode_cursor("not-a-cursor")
+
+        assert exc_info.value.status_code == 400
+
+
+class TestRecipeDbEndpoints:
+    """Test database recipe API endpoints."""
+
+    def test_search_route_not_shadowed_by_recipe_id(self, db_client):
+        """Test /recipes-db/search isn't matched as a recipe ID."""
+        response = db_client.get("/api/recipes-db/search", params={"q": "anything"})
+
+        assert response.status_code == 200
+        assert response.json() == []
+
+    def test_invalid_recipe_id(self, db_client):
+        """Test a malformed recipe ID is rejected by path validation."""
+        assert db_client.get("/api/recipes-db/not-a-uuid").status_code == 422
+        assert db_client.delete("/api/recipes-db/not-a-uuid").status_code == 422
+
+    def test_get_nonexistent_recipe(self, db_client):
+        """Test getting a recipe that doesn't exist."""
+        response = db_client.get(f"/api/recipes-db/{uuid.uuid4()}")
+
+        assert response.status_code == 404
+
+    def test_get_cached_until_deleted(self, db_client, monkeypatch):
+        """Test repeat gets are served from the response cache until a delete."""
+        created = db_client.post(
+            "/api/recipes-db",
+            json={
+                "title": "Cached Soup",
+                "ingredients": ["water"],
+                "instructions": ["boil"],
+            },
+        ).json()
+        url = f"/api/recipes-db/{created['id']}"
+        assert db_client.get(url).json() == created
+
+        async def no_database(self, recipe_id):
+            raise AssertionError("cache miss")
+
+        monkeypatch.setattr(recipes_db.RecipeService, "get_recipe_by_id", no_database)
+        assert db_client.get(url).json() == created
+
+        assert db_client.delete(url).status_code == 200
+        monkeypatch.undo()
+        assert db_client.get(url).status_code == 404
+
+    def test_delete_invalidates_after_commit(self, db_client, test_db_session):
+        """Test a response cached again while a delete is uncommitted is dropped."""
+        created = db_client.post(
+            "/api/recipes-db",
+            json={
+                "title": "Racy Soup",
+                "ingredients": ["water"],
+                "instructions": ["boil"],
+            },
+        ).json()
+        url = f"/api/recipes-db/{created['id']}"
+
+        async def session_with_concurrent_get():
+            yield test_db_session
+            # Where the real dependency commits: the endpoint has returned,
+            # and a concurrent get still sees the row
+            recipes_db._recipe_responses.set(
+                uuid.UUID(created["id"]), json.dumps(created).encode()
+            )
+
+        db_client.app.dependency_overrides[get_db_session] = session_with_concurrent_get
+
+        assert db_client.delete(url).status_code == 200
+        assert db_client.get(url).status_code == 404
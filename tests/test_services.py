@@ -0,0 +1,405 @@
+"""Tests for core services."""
+
+import asyncio
+import os
+import uuid
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+from meal_planner.core.config import settings
+from meal_planner.core.models import Ingredient, OCREngine, OCRResult, Recipe
+from meal_planner.core.services import (
+    MealPlanService,
+    RecipeExtractionService,
+    RecipeStorageService,
+)
+
+
+class FakeOCREngine:
+    """OCR engine returning a fixed confidence after a delay."""
+
+    def __init__(
+        self,
+        name: str,
+        confidence: float,
+        delay: float = 0.0,
+        error: Optional[Exception] = None,
+    ):
+        self.name = name
+        self.confidence = confidence
+        self.delay = delay
+        self.error = error
+        self.started = False
+
+    async def extract_text(self, file_path: Path) -> OCRResult:
+        self.started = True
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return OCRResult(
+            text=f"{self.name} text",
+            confidence=self.confidence,
+            engine_used=OCREngine.PYMUPDF,
+            processing_time=self.delay
+        )
+
+    def get_name(self) -> str:
+        return self.name
+
+
+class FakeLLMProvider:
+    """LLM provider that structures any text into a fixed recipe."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _call(self):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+
+    async def evaluate_ocr_quality(self, text, confidence):
+        await self._call()
+        return {"detected_issues": ["smudged"]}
+
+    async def structure_recipe(self, text, user_notes=None):
+        await self._call()
+        return Recipe(title=text, ingredients=["x"], instructions=["y"])
+
+    async def generate_meal_plan(self, user_preferences, available_recipes,
+                                 nutrition_goal=None, days=7):
+        await self._call()
+        return {"days": days, "recipes": [r.id for r in available_recipes]}
+
+
+class TestRecipeExtractionService:
+    """Test recipe extraction."""
+
+    @pytest.mark.asyncio
+    async def test_fallback_skipped_when_primary_confident(self):
+        """Test the fallback OCR engine doesn't run when the primary result is good."""
+        primary = FakeOCREngine("primary", confidence=0.9)
+        fallback = FakeOCREngine(
+            "fallback", confidence=0.95, error=RuntimeError("fallback failed")
+        )
+        service = RecipeExtractionService(primary, fallback, FakeLLMProvider())
+
+        response = await service.extract_recipe(Path("recipe.pdf"))
+
+        assert response.ocr_result.text == "primary text"
+        assert not fallback.started
+
+    @pytest.mark.asyncio
+    async def test_fallback_used_when_primary_low_confidence(self):
+        """Test the fallback result wins on low primary confidence."""
+        primary = FakeOCREngine("primary", confidence=0.2, delay=0.01)
+        fallback = FakeOCREngine("fallback", confidence=0.8, delay=0.01)
+        service = RecipeExtractionService(primary, fallback, FakeLLMProvider())
+
+        response = await service.extract_recipe(Path("recipe.pdf"))
+
+        assert response.ocr_result.text == "fallback text"
+        assert response.recipe.title == "fallback text"
+
+    @pytest.mark.asyncio
+    async def test_llm_calls_overlap(self):
+        """Test quality assessment and structuring run concurrently."""
+        llm = FakeLLMProvider(delay=0.01)
+        service = RecipeExtractionService(
+            FakeOCREngine("primary", confidence=0.9), None, llm
+        )
+
+        response = await service.extract_recipe(Path("recipe.pdf"))
+
+        assert llm.max_in_flight == 2
+        assert response.warnings == ["smudged"]
+
+    @pytest.mark.asyncio
+    async def test_extract_recipes_batch(self):
+        """Test batch extraction keeps input order and bounds OCR concurrency."""
+        primary = FakeOCREngine("primary", confidence=0.9, delay=0.01)
+        in_flight = 0
+        max_in_flight = 0
+        extract_text = primary.extract_text
+
+        async def counting_extract_text(file_path):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            try:
+                return await extract_text(file_path)
+            finally:
+                in_flight -= 1
+
+        primary.extract_text = counting_extract_text
+        service = RecipeExtractionService(primary, None, FakeLLMProvider())
+        file_paths = [Path(f"recipe{i}.pdf") for i in range(5)]
+
+        responses = await service.extract_recipes_batch(file_paths)
+
+        assert [r.recipe.source_file for r in responses] == [str(p) for p in file_paths]
+        assert max_in_flight == settings.ocr_max_concurrency
+
+
+class TestRecipeStorageService:
+    """Test file-based recipe storage."""
+
+    @pytest.mark.asyncio
+    async def test_list_recipes_pagination(self, tmp_path):
+        """Test listing pages through recipes in file name order."""
+        storage = RecipeStorageService(recipes_dir=tmp_path)
+        recipes = [
+            Recipe(title=f"Recipe {i}", ingredients=["x"], instructions=["y"])
+            for i in range(5)
+        ]
+        for recipe in recipes:
+            await storage.save_recipe(recipe)
+        (tmp_path / "notes.txt").write_text("not a recipe")
+
+        expected_ids = sorted(str(recipe.id) for recipe in recipes)
+        first_page = await storage.list_recipes(limit=2, offset=0)
+        rest = await storage.list_recipes(limit=10, offset=2)
+
+        assert [str(r.id) for r in first_page] == expected_ids[:2]
+        assert [str(r.id) for r in rest] == expected_ids[2:]
+
+    @pytest.mark.asyncio
+    async def test_list_recipes_tracks_directory(self, tmp_path):
+        """Test the cached listing follows saves, deletes and external files."""
+        storage = RecipeStorageService(recipes_dir=tmp_path)
+        first = Recipe(title="First", ingredients=["x"], instructions=["y"])
+        await storage.save_recipe(first)
+        assert [r.id for r in await storage.list_recipes()] == [first.id]
+
+        external = Recipe(title="External", ingredients=["x"], instructions=["y"])
+        external.save_to_file(tmp_path)
+        assert {r.id for r in await storage.list_recipes()} == {first.id, external.id}
+
+        await storage.delete_recipe(first.id)
+        assert [r.id for r in await storage.list_recipes()] == [external.id]
+
+    @pytest.mark.asyncio
+    async def test_search_recipes(self, tmp_path):
+        """Test searching titles, ingredients and tags by substring."""
+        storage = RecipeStorageService(recipes_dir=tmp_path)
+        curry = Recipe(
+            title="Chicken Curry",
+            ingredients=[Ingredient(name="Coconut Milk"), "rice"],
+            instructions=["Simmer"],
+            tags=["spicy"],
+        )
+        salad = Recipe(
+            title="Green Salad",
+            ingredients=["lettuce"],
+            instructions=["Toss"],
+            tags=["chicken-free"],
+        )
+        await storage.save_recipe(curry)
+        await storage.save_recipe(salad)
+
+        assert [r.id for r in storage.search_recipes("CURRY")] == [curry.id]
+        assert [r.id for r in storage.search_recipes("coconut")] == [curry.id]
+        assert [r.id for r in storage.search_recipes("spic")] == [curry.id]
+        assert {r.id for r in storage.search_recipes("chicken")} == {curry.id, salad.id}
+        assert [r.id for r in storage.search_recipes("ri")] == [curry.id]
+        assert storage.search_recipes("instructions") == []
+
+    @pytest.mark.asyncio
+    async def test_search_recipes_without_index(self, tmp_path):
+        """Test the file scan used when the search index is unavailable."""
+        storage = RecipeStorageService(recipes_dir=tmp_path)
+        storage.search_index = None
+        curry = Recipe(
+            title="Chicken Curry",
+            ingredients=[Ingredient(name="Coconut Milk")],
+            instructions=["Simmer"],
+            tags=["spicy"],
+        )
+        await storage.save_recipe(curry)
+
+        assert [r.id for r in storage.search_recipes("COCONUT")] == [curry.id]
+        assert [r.id for r in storage.search_recipes("spicy")] == [curry.id]
+        assert storage.search_recipes("curry coconut") == []
+
+    @pytest.mark.asyncio
+    async def test_search_index_tracks_changes(self, tmp_path):
+        """Test that the index follows deletes and is rebuilt when removed."""
+        storage = RecipeStorageService(recipes_dir=tmp_path)
+        kept = Recipe(title="Tomato Soup", ingredients=["tomato"], instructions=["y"])
+        deleted = Recipe(
+            title="Tomato Tart", ingredients=["tomato"], instructions=["y"]
+        )
+        await storage.save_recipe(kept)
+        await storage.save_recipe(deleted)
+        await storage.delete_recipe(deleted.id)
+
+        assert [r.id for r in storage.search_recipes("tomato")] == [kept.id]
+
+        (tmp_path / "recipes_index.db").unlink()
+
+        assert [r.id for r in storage.search_recipes("soup")] == [kept.id]
+        assert [
+            r.id for r in RecipeStorageService(tmp_path).search_recipes("soup")
+        ] == [kept.id]
+
+    @pytest.mark.asyncio
+    async def test_search_index_syncs_on_open(self, tmp_path):
+        """Test recipe files changed behind the index's back are picked up."""
+        storage = RecipeStorageService(recipes_dir=tmp_path)
+        edited = Recipe(title="Tomato Soup", ingredients=["tomato"], instructions=["y"])
+        removed = Recipe(
+            title="Tomato Tart", ingredients=["tomato"], instructions=["y"]
+        )
+        await storage.save_recipe(edited)
+        await storage.save_recipe(removed)
+        storage.search_index.close()
+
+        added = Recipe(title="Tomato Salad", ingredients=["tomato"], instructions=["y"])
+        added.save_to_file(tmp_path)
+        file_path = edited.model_copy(update={"title": "Leek Soup"}).save_to_file(
+            tmp_path
+        )
+        stat = file_path.stat()
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        (tmp_path / f"{removed.id}.json").unlink()
+
+        reopened = RecipeStorageService(recipes_dir=tmp_path)
+
+        assert {r.id for r in reopened.search_recipes("tomato")} == {
+            added.id,
+            edited.id,
+        }
+        assert [r.id for r in reopened.search_recipes("leek")] == [edited.id]
+
+    @pytest.mark.asyncio
+    async def test_load_recipe_cache(self, tmp_path):
+        """Test that unchanged files are parsed once and edits are picked up."""
+        storage = RecipeStorageService(recipes_dir=tmp_path)
+        recipe = Recipe(title="Pancakes", ingredients=["flour"], instructions=["Fry"])
+        file_path = await storage.save_recipe(recipe)
+
+        first = storage.load_recipe(recipe.id)
+        assert storage.load_recipe(recipe.id) is first
+        assert (await storage.list_recipes())[0] is first
+
+        edited = recipe.model_copy(update={"title": "Crepes"})
+        edited.save_to_file(tmp_path)
+        stat = file_path.stat()
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert storage.load_recipe(recipe.id).title == "Crepes"
+
+        await storage.save_recipe(recipe)
+        assert storage.load_recipe(recipe.id).title == "Pancakes"
+
+    @pytest.mark.asyncio
+    async def test_list_candidate_recipes(self, tmp_path):
+        """Test filtering and ranking recipes by user preferences."""
+        storage = RecipeStorageService(recipes_dir=tmp_path)
+        pasta = Recipe(
+            title="Pasta", ingredients=["pasta", "tomato"], instructions=["Boil"],
+            dietary_restrictions=["vegetarian"], tags=["italian"],
+        )
+        stir_fry = Recipe(
+            title="Stir Fry", ingredients=["tofu", "rice"], instructions=["Fry"],
+            dietary_restrictions=["vegetarian", "vegan"], tags=["chinese"],
+        )
+        satay = Recipe(
+            title="Satay",
+            ingredients=["tofu", "Peanut Butter"],
+            instructions=["Grill"],
+            dietary_restrictions=["vegetarian"],
+            tags=["thai"],
+        )
+        steak = Recipe(title="Steak", ingredients=["beef"], instructions=["Sear"])
+        for recipe in (pasta, stir_fry, satay, steak):
+            await storage.save_recipe(recipe)
+
+        candidates = await storage.list_candidate_recipes({
+            "dietary_restrictions": ["Vegetarian"],
+            "allergies": ["peanut"],
+            "favorite_cuisines": ["Chinese"],
+        })
+
+        assert [r.id for r in candidates][0] == stir_fry.id
+        assert {r.id for r in candidates} == {pasta.id, stir_fry.id}
+        assert len(await storage.list_candidate_recipes({}, k=3)) == 3
+
+    @pytest.mark.asyncio
+    async def test_list_candidate_recipes_matches_whole_words(self, tmp_path):
+        """Test avoided ingredients don't exclude recipes using longer words."""
+        storage = RecipeStorageService(recipes_dir=tmp_path)
+        omelette = Recipe(
+            title="Omelette", ingredients=["3 Eggs", "chives"], instructions=["Whisk"]
+        )
+        moussaka = Recipe(
+            title="Moussaka", ingredients=["eggplant"], instructions=["Bake"]
+        )
+        salad = Recipe(
+            title="Salad", ingredients=["peach", "peanuts"], instructions=["Toss"]
+        )
+        for recipe in (omelette, moussaka, salad):
+            await storage.save_recipe(recipe)
+
+        candidates = await storage.list_candidate_recipes({
+            "disliked_ingredients": ["egg"],
+            "allergies": ["pea"],
+        })
+
+        assert {r.id for r in candidates} == {moussaka.id, salad.id}
+
+    @pytest.mark.asyncio
+    async def test_list_candidate_recipes_scans_every_batch(
+        self, tmp_path, monkeypatch
+    ):
+        """Test recipes past the first batch can still be candidates."""
+        monkeypatch.setattr(RecipeStorageService, "candidate_batch_size", 2)
+        storage = RecipeStorageService(recipes_dir=tmp_path)
+        recipes = [
+            Recipe(title=f"Recipe {i}", ingredients=["rice"], instructions=["Cook"])
+            for i in range(7)
+        ]
+        for recipe in recipes:
+            await storage.save_recipe(recipe)
+
+        # The favorite is listed last, after every other batch
+        listed = await storage.list_recipes(limit=10)
+        favorite = listed[-1].model_copy(update={"tags": ["thai"]})
+        await storage.save_recipe(favorite)
+
+        candidates = await storage.list_candidate_recipes(
+            {"favorite_cuisines": ["thai"]}, k=3
+        )
+
+        assert [r.id for r in candidates] == [
+            favorite.id, listed[0].id, listed[1].id
+        ]
+        assert len(await storage.list_candidate_recipes({}, k=10)) == 7
+
+
+class TestMealPlanService:
+    """Test meal plan generation."""
+
+    @pytest.mark.asyncio
+    async def test_generate_meal_plan_accepts_date_strings(self, tmp_path):
+        """Test that ISO date strings and dates give the same day count."""
+        storage = RecipeStorageService(recipes_dir=tmp_path)
+        await storage.save_recipe(
+            Recipe(title="Soup", ingredients=["x"], instructions=["y"])
+        )
+        service = MealPlanService(storage, FakeLLMProvider())
+
+        from_strings = await service.generate_meal_plan(
+            uuid.uuid4(), "2024-01-01", "2024-01-07", preferences={}
+        )
+        from_dates = await service.generate_meal_plan(
+            uuid.uuid4(), date(2024, 1, 1), date(2024, 1, 7), preferences={}
+        )
+
+        assert from_strings["days"] == from_dates["days"] == 7